@@ -0,0 +1,55 @@
+import argparse
+import sys
+
+from wordle_solver.benchmarks import (
+    BENCHMARKS,
+    DEFAULT_TOLERANCE,
+    compare_to_baseline,
+    format_results,
+    load_baseline,
+    run_benchmarks,
+    save_baseline,
+)
+
+BASELINE_PATH = "static/benchmark_baseline.json"
+WORD_LENGTH = 5
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks the hot paths of the solver against the word lists.")
+    parser.add_argument("--languages", nargs="+", default=["en", "es"], choices=["en", "es"])
+    parser.add_argument("--benchmarks", nargs="+", default=BENCHMARKS, choices=BENCHMARKS)
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs, of which the fastest is kept.")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Fraction by which a benchmark can be slower, or use more memory, than the baseline.",
+    )
+    parser.add_argument(
+        "--update-baseline", action="store_true", help="Save the results as the new baseline instead of comparing."
+    )
+    args = parser.parse_args()
+
+    baseline = load_baseline(args.baseline)
+    results = []
+    for language in args.languages:
+        results += run_benchmarks(language, word_length=WORD_LENGTH, benchmarks=args.benchmarks, repeat=args.repeat)
+    print(format_results(results, baseline))
+
+    if args.update_baseline:
+        save_baseline(args.baseline, results, baseline)
+        print(f"Saved the baseline to {args.baseline}")
+        return
+    regressions = compare_to_baseline(results, baseline, args.tolerance)
+    if regressions:
+        print("Regressions:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print("No regressions.")
+
+
+if __name__ == "__main__":
+    main()
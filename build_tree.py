@@ -0,0 +1,52 @@
+import argparse
+import os
+import time
+from functools import partial
+
+from wordle_solver.simulation import load_optimal_start, load_solver
+from wordle_solver.strategy_tree import build_strategy_tree, save_second_guesses
+
+WORD_LENGTH = 5
+
+
+def _create_solver(language: str):
+    solver, _ = load_solver(language, word_length=WORD_LENGTH, precomputed=False)
+    return solver
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Builds the strategy tree of the solver from the optimal start.")
+    parser.add_argument("--language", default="es", choices=["en", "es"])
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes.")
+    parser.add_argument("--max-depth", type=int, default=20, help="Maximum number of guesses in a game.")
+    parser.add_argument(
+        "--second-guesses",
+        action="store_true",
+        help="Only compute the second guess for each feedback to the optimal start, and save it to "
+        "static/second_guesses.json.",
+    )
+    args = parser.parse_args()
+
+    with open(f"static/wordlist_{args.language}.txt", "r") as file:
+        words = file.read().splitlines()
+    start_time = time.perf_counter()
+    tree = build_strategy_tree(
+        partial(_create_solver, args.language),
+        words,
+        WORD_LENGTH,
+        first_guess=load_optimal_start(args.language),
+        max_depth=2 if args.second_guesses else args.max_depth,
+        n_workers=args.workers or os.cpu_count() or 1,
+    )
+    if args.second_guesses:
+        save_second_guesses("static/second_guesses.json", args.language, tree)
+        print(f"Saved {len(tree) - 1} second guesses in {time.perf_counter() - start_time:.1f}s")
+        return
+
+    path = f"static/tree_{args.language}.json.gz"
+    tree.save(path)
+    print(f"Saved {len(tree)} nodes to {path} in {time.perf_counter() - start_time:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
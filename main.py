@@ -1,13 +1,19 @@
+# The start time is measured before the rest of the imports, so that the reported start-up time includes them
+# ruff: noqa: E402
+import time
+
+START_TIME = time.perf_counter()
+
 import json
 import os
 import pickle as pkl
 
+from wordle_solver.bundle import get_file_key, is_bundle_stale, load_bundle, save_bundle
 from wordle_solver.cache import WordleCache
-from wordle_solver.clue import Clue
-from wordle_solver.filters import group_by_overlapping_characters
-from wordle_solver.search_space import SearchSpace
+from wordle_solver.clue import parse_feedback
+from wordle_solver.pattern_store import PatternStore
 from wordle_solver.solver import WordleSolver
-from wordle_solver.wordle_index import WordleIndex
+from wordle_solver.strategy_tree import load_precomputed_strategies
 
 LANGUAGE = "es"
 MAX_GROUPS = 100
@@ -17,20 +23,39 @@ WORD_LENGTH = 5
 def main():
     with open("static/optimal_starts.json", "r") as file:
         optimal_start = json.load(file)[LANGUAGE]
+    # The groups and index are loaded from a single memory-mapped bundle, which is rebuilt from the word list and the
+    # groups whenever they change
+    bundle_path = f"static/bundle_{LANGUAGE}.bin"
+    groups_path = f"static/groups_{LANGUAGE}.pickle"
     with open(f"static/wordlist_{LANGUAGE}.txt", "r") as file:
         words = file.read().splitlines()
-    if os.path.exists(f"static/groups_{LANGUAGE}.pickle"):
-        with open(f"static/groups_{LANGUAGE}.pickle", "rb") as file:
-            groups = pkl.load(file)
-    else:
-        groups = group_by_overlapping_characters(words, max_groups=MAX_GROUPS)
-        with open(f"static/groups_{LANGUAGE}.pickle", "wb") as file:
-            pkl.dump(groups, file)
-    search_space = SearchSpace(all_words=set(words), groups=groups)
+    if is_bundle_stale(bundle_path, words, WORD_LENGTH, groups_path):
+        if os.path.exists(groups_path):
+            with open(groups_path, "rb") as file:
+                groups = pkl.load(file)
+        else:
+            from wordle_solver.filters import group_by_overlapping_characters
+
+            groups = group_by_overlapping_characters(words, max_groups=MAX_GROUPS)
+            with open(groups_path, "wb") as file:
+                pkl.dump(groups, file)
+        save_bundle(bundle_path, words, WORD_LENGTH, groups, groups_key=get_file_key(groups_path))
+    bundle = load_bundle(bundle_path)
+    search_space = bundle.get_search_space()
     wordle_cache = WordleCache()
-    wordle_index = WordleIndex(words=words, word_length=WORD_LENGTH, cache=wordle_cache)
-    wordle_solver = WordleSolver(candidate_lister=wordle_index, search_space=search_space)
+    wordle_index = bundle.get_wordle_index(wordle_cache)
+    # The pattern matrix is only loaded (or rebuilt if the word list changed) when the first guess is computed
+    pattern_matrix = PatternStore(directory="static", name=LANGUAGE).get_pattern_matrix(words, word_length=WORD_LENGTH)
+    # The strategy tree and the second guesses (built with `build_tree.py`) answer the next word instantly for the
+    # games on them, and the searched positions are remembered across sessions
+    wordle_solver = WordleSolver(
+        candidate_lister=wordle_index,
+        search_space=search_space,
+        pattern_matrix=pattern_matrix,
+        **load_precomputed_strategies(LANGUAGE, words, search_space, WORD_LENGTH),
+    )
 
+    print(f"Loaded the solver in {time.perf_counter() - START_TIME:.3f} seconds.")
     print(f'Start by guessing the following word: "{optimal_start}" or any other word you like.')
     while True:
         print("=====================================")
@@ -51,16 +76,7 @@ def main():
             raise ValueError(f"The clue must have {WORD_LENGTH} characters.")
 
         # Parse the clue
-        clues = [
-            Clue(
-                position=index,
-                character=character,
-                in_word=clue_character in ["y", "c"],
-                correct_position=clue_character in ["c"],
-            )
-            for index, (character, clue_character) in enumerate(zip(word, clue))
-        ]
-        wordle_solver.add_clues(clues)
+        wordle_solver.add_feedback(word, parse_feedback(clue))
         possible_words = wordle_solver.get_possible_words()
         if len(possible_words) == 1:
             print("Congratulations! You solved the wordle puzzle.")
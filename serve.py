@@ -0,0 +1,48 @@
+import argparse
+import asyncio
+from functools import partial
+
+from wordle_solver.service import SolverService
+from wordle_solver.simulation import load_optimal_start, load_solver
+
+WORD_LENGTH = 5
+
+
+def _create_solver(language: str):
+    solver, _ = load_solver(language, word_length=WORD_LENGTH)
+    return solver
+
+
+async def serve(service: SolverService, host: str, port: int):
+    async with service:
+        port = await service.start(host, port)
+        print(f"Serving the solver for {sorted(service.solver_factories)} on http://{host}:{port}")
+        await service.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serves the solver as a local HTTP/JSON service.")
+    parser.add_argument("--languages", nargs="+", default=["en", "es"], choices=["en", "es"])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=2, help="Number of worker processes that run the searches.")
+    parser.add_argument(
+        "--time-budget", type=float, default=None, help="Default number of seconds given to each search."
+    )
+    args = parser.parse_args()
+
+    service = SolverService(
+        solver_factories={language: partial(_create_solver, language) for language in args.languages},
+        optimal_starts={language: load_optimal_start(language) for language in args.languages},
+        word_length=WORD_LENGTH,
+        n_workers=args.workers,
+        time_budget=args.time_budget,
+    )
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
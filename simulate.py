@@ -0,0 +1,87 @@
+import argparse
+import sys
+from functools import partial
+from typing import Optional
+
+from tqdm import tqdm
+
+from wordle_solver.profiling import SolverProfiler
+from wordle_solver.simulation import load_optimal_start, load_solver, run_simulation
+
+WORD_LENGTH = 5
+
+
+def _create_solver(
+    language: str,
+    cost_target: Optional[int] = None,
+    profile_path: Optional[str] = None,
+    constraint_filter: bool = False,
+):
+    profiler = SolverProfiler(output_path=profile_path, session=language) if profile_path is not None else None
+    solver, _ = load_solver(
+        language,
+        word_length=WORD_LENGTH,
+        cost_target=cost_target,
+        precomputed=False,
+        constraint_filter=constraint_filter,
+        profiler=profiler,
+    )
+    return solver
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plays every word of a word list as the hidden target.")
+    parser.add_argument("--language", default="es", choices=["en", "es"])
+    parser.add_argument(
+        "--output", default=None, help="JSONL file with the results. Existing results of the same run are resumed."
+    )
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes.")
+    parser.add_argument("--limit", type=int, default=None, help="Only play the first LIMIT words of the list.")
+    parser.add_argument("--max-guesses", type=int, default=6)
+    parser.add_argument(
+        "--cost-target",
+        type=int,
+        default=None,
+        help="Rank all the words and evaluate the top ones within this number of guess/target evaluations per search, "
+        "instead of using the groups.",
+    )
+    parser.add_argument(
+        "--profile", default=None, help="JSONL file where the report of every search is appended (see SolverProfiler)."
+    )
+    parser.add_argument(
+        "--constraint-filter",
+        action="store_true",
+        help="Filter the words with a ConstraintIndex instead of a WordleIndex.",
+    )
+    args = parser.parse_args()
+
+    with open(f"static/wordlist_{args.language}.txt", "r") as file:
+        targets = file.read().splitlines()[: args.limit]
+    optimal_start = load_optimal_start(args.language)
+    output_path = args.output or f"simulation_{args.language}.jsonl"
+
+    with tqdm(total=len(targets)) as progress_bar:
+        report = run_simulation(
+            targets,
+            output_path,
+            solver_factory=partial(
+                _create_solver, args.language, args.cost_target, args.profile, args.constraint_filter
+            ),
+            first_guess=optimal_start,
+            max_guesses=args.max_guesses,
+            n_workers=args.workers,
+            progress=progress_bar.update,
+            config={
+                "language": args.language,
+                "cost_target": args.cost_target,
+                "constraint_filter": args.constraint_filter,
+            },
+        )
+    print(report)
+    # A stalled game means that the solver would never find the target, which is a bug rather than a hard word
+    if report.stalled:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
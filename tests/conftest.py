@@ -1,11 +1,15 @@
+import json
+from functools import partial
 from typing import Callable
 
 import pytest
 
 from wordle_solver.cache import WordleCache
 from wordle_solver.clue import Clue
-from wordle_solver.inverted_index import InvertedIndex
+from wordle_solver.inverted_index import BitsetInvertedIndex, InvertedIndex
+from wordle_solver.patterns import PatternMatrix
 from wordle_solver.search_space import SearchSpace
+from wordle_solver.simulation import load_solver
 from wordle_solver.solver import WordleSolver
 from wordle_solver.wordle_index import WordleIndex
 
@@ -45,10 +49,10 @@ def valid_words_per_clue() -> list[set[str]]:
     ]
 
 
-@pytest.fixture
-def inverted_index_factory() -> Callable[[list[str], list[str]], InvertedIndex[str, str]]:
+@pytest.fixture(params=[InvertedIndex, BitsetInvertedIndex])
+def inverted_index_factory(request: pytest.FixtureRequest) -> Callable[[list[str], list[str]], InvertedIndex[str, str]]:
     def _inverted_index_factory(letters: list[str], words: list[str]) -> InvertedIndex[str, str]:
-        index = InvertedIndex[str, str]()
+        index = request.param[str, str]()
         for letter, word in zip(letters, words):
             index.add(letter, word)
         return index
@@ -102,3 +106,37 @@ def wordle_solver(
 ) -> WordleSolver:
     wordle_index = wordle_index_factory(list(all_words), word_length)
     return WordleSolver(candidate_lister=wordle_index, search_space=search_space)
+
+
+@pytest.fixture
+def pattern_matrix(all_words: set[str], word_length: int) -> PatternMatrix:
+    return PatternMatrix.from_words(sorted(all_words), word_length)
+
+
+@pytest.fixture
+def pattern_wordle_solver(
+    search_space: SearchSpace,
+    wordle_index_factory: Callable[[list[str], int], WordleIndex],
+    pattern_matrix: PatternMatrix,
+    word_length: int,
+) -> WordleSolver:
+    wordle_index = wordle_index_factory(pattern_matrix.words, word_length)
+    return WordleSolver(candidate_lister=wordle_index, search_space=search_space, pattern_matrix=pattern_matrix)
+
+
+@pytest.fixture
+def static_directory(tmp_path, all_words: set[str]) -> str:
+    (tmp_path / "wordlist_en.txt").write_text("\n".join(sorted(all_words)))
+    (tmp_path / "optimal_starts.json").write_text(json.dumps({"en": "arise"}))
+    return str(tmp_path)
+
+
+def _create_solver(static_directory: str) -> WordleSolver:
+    # Defined at the module level so that it can be pickled and sent to worker processes
+    solver, _ = load_solver("en", static_directory=static_directory, precomputed=False)
+    return solver
+
+
+@pytest.fixture
+def solver_factory(static_directory: str) -> Callable[[], WordleSolver]:
+    return partial(_create_solver, static_directory)
@@ -0,0 +1,71 @@
+import pytest
+
+from wordle_solver.benchmarks import (
+    BENCHMARKS,
+    BenchmarkResult,
+    compare_to_baseline,
+    format_results,
+    load_baseline,
+    run_benchmarks,
+    save_baseline,
+)
+
+
+def test_run_benchmarks(static_directory: str):
+    results = run_benchmarks("en", static_directory=static_directory, number_of_clues=10, number_of_games=5, repeat=1)
+    names = [result.name for result in results]
+    assert names[:2] == ["index_build", "single_clue_filter"]
+    assert names[-1] == "group_build"
+    assert names[2:-1] == ["next_word_turn_1", "next_word_turn_2", "next_word_turn_3"]
+    # The first guess is searched without clues, once for every game
+    assert results[2].operations == 1
+    for result in results:
+        assert result.key == f"en/{result.name}"
+        assert result.operations > 0
+        assert result.seconds > 0
+        assert result.peak_memory_bytes > 0
+
+
+def test_run_some_benchmarks(static_directory: str):
+    results = run_benchmarks("en", static_directory=static_directory, benchmarks=["index_build"], repeat=1)
+    assert [result.name for result in results] == ["index_build"]
+    assert "next_word" in BENCHMARKS
+
+
+def test_save_and_load_baseline(tmp_path):
+    path = str(tmp_path / "baseline.json")
+    assert load_baseline(path) == {}
+    results = [BenchmarkResult("index_build", "en", 1, 0.5, 1000)]
+    save_baseline(path, results, {"es/index_build": {"operations_per_second": 1.0, "peak_memory_bytes": 1}})
+    baseline = load_baseline(path)
+    assert set(baseline) == {"en/index_build", "es/index_build"}
+    assert baseline["en/index_build"]["operations_per_second"] == 2.0
+    assert compare_to_baseline(results, baseline) == []
+    assert "en/index_build" in format_results(results, baseline)
+
+
+@pytest.mark.parametrize(
+    "seconds,peak_memory_bytes,expected_metrics",
+    [
+        (1.0, 100 << 20, []),
+        (1.2, 100 << 20, []),
+        (1.5, 100 << 20, ["operations_per_second"]),
+        (1.0, 130 << 20, ["peak_memory_bytes"]),
+        (2.0, 200 << 20, ["operations_per_second", "peak_memory_bytes"]),
+    ],
+)
+def test_compare_to_baseline(seconds: float, peak_memory_bytes: int, expected_metrics: list[str]):
+    baseline = {"en/next_word_turn_1": {"operations_per_second": 10.0, "peak_memory_bytes": 100 << 20}}
+    results = [
+        BenchmarkResult("next_word_turn_1", "en", 10, seconds, peak_memory_bytes),
+        BenchmarkResult("next_word_turn_2", "en", 10, 100.0, 1 << 30),
+    ]
+    regressions = compare_to_baseline(results, baseline, tolerance=0.25)
+    assert [regression.metric for regression in regressions] == expected_metrics
+    assert all(regression.key == "en/next_word_turn_1" for regression in regressions)
+
+
+def test_small_memory_differences_are_not_flagged():
+    baseline = {"en/index_build": {"operations_per_second": 1.0, "peak_memory_bytes": 1000}}
+    results = [BenchmarkResult("index_build", "en", 1, 1.0, 5000)]
+    assert compare_to_baseline(results, baseline) == []
@@ -0,0 +1,108 @@
+import json
+import os
+import pickle as pkl
+from typing import Callable, Optional
+
+import pytest
+
+from wordle_solver.bundle import BUNDLE_MAGIC, get_file_key, is_bundle_stale, load_bundle, save_bundle
+from wordle_solver.cache import WordleCache
+from wordle_solver.clue import get_feedback
+from wordle_solver.wordle_index import WordleIndex
+
+
+@pytest.fixture
+def words(all_words: set[str]) -> list[str]:
+    return sorted(all_words)
+
+
+@pytest.mark.parametrize(
+    "groups",
+    [
+        None,
+        {"apple": {"apple", "grape", "happy"}, "melon": {"melon", "hello", "world"}},
+        {"arise": {"alive", "arise", "awake", "other", "peach", "green"}},
+    ],
+)
+def test_save_and_load_bundle(tmp_path, words: list[str], word_length: int, groups: Optional[dict[str, set[str]]]):
+    path = str(tmp_path / "bundle_en.bin")
+    save_bundle(path, words, word_length, groups)
+    bundle = load_bundle(path)
+    assert bundle.words == words
+    assert bundle.word_length == word_length
+    assert bundle.groups == groups
+    assert bundle.get_search_space().groups == groups
+    assert bundle.get_search_space().all_words == set(words)
+    if groups is not None:
+        assert list(bundle.groups) == list(groups)
+
+
+@pytest.mark.parametrize("guess,target", [("arise", "melon"), ("peach", "apple"), ("hello", "world")])
+def test_bundle_index_matches_wordle_index(
+    tmp_path,
+    words: list[str],
+    word_length: int,
+    guess: str,
+    target: str,
+    wordle_index_factory: Callable[[list[str], int], WordleIndex],
+):
+    path = str(tmp_path / "bundle_en.bin")
+    save_bundle(path, words, word_length)
+    bundle_index = load_bundle(path).get_wordle_index(WordleCache())
+    wordle_index = wordle_index_factory(words, word_length)
+    for index in [bundle_index, wordle_index]:
+        index.add_feedback(guess, get_feedback(guess, target))
+    assert bundle_index.get_possible_words() == wordle_index.get_possible_words()
+    assert bundle_index.get_all_words() == wordle_index.get_all_words()
+
+
+def test_save_bundle_with_unknown_group_words(tmp_path, words: list[str], word_length: int):
+    with pytest.raises(ValueError):
+        save_bundle(str(tmp_path / "bundle_en.bin"), words, word_length, {"apple": {"zebra"}})
+
+
+def test_load_invalid_bundle(tmp_path, words: list[str], word_length: int):
+    path = str(tmp_path / "bundle_en.bin")
+    with open(path, "wb") as file:
+        file.write(b"not a bundle")
+    with pytest.raises(ValueError):
+        load_bundle(path)
+
+    header = json.dumps({"version": 0, "word_length": word_length, "arrays": {}}).encode()
+    with open(path, "wb") as file:
+        file.write(BUNDLE_MAGIC + len(header).to_bytes(8, "little") + header)
+    with pytest.raises(ValueError):
+        load_bundle(path)
+
+
+def test_is_bundle_stale(tmp_path, words: list[str], word_length: int):
+    path = str(tmp_path / "bundle_en.bin")
+    groups_path = str(tmp_path / "groups_en.pickle")
+    assert is_bundle_stale(path, words, word_length, groups_path)
+
+    save_bundle(path, words, word_length)
+    assert not is_bundle_stale(path, words, word_length, groups_path)
+    # The bundle is compared by the contents of its sources, so a newer file with the same words is not stale
+    os.utime(path, (0, 0))
+    assert not is_bundle_stale(path, words, word_length, groups_path)
+    assert is_bundle_stale(path, words[1:], word_length, groups_path)
+
+    groups = {"apple": {"apple", "grape"}}
+    with open(groups_path, "wb") as file:
+        pkl.dump(groups, file)
+    assert is_bundle_stale(path, words, word_length, groups_path)
+    save_bundle(path, words, word_length, groups, groups_key=get_file_key(groups_path))
+    assert not is_bundle_stale(path, words, word_length, groups_path)
+
+    with open(path, "wb") as file:
+        file.write(b"not a bundle")
+    assert is_bundle_stale(path, words, word_length, groups_path)
+
+
+def test_bundle_postings_are_loaded_lazily(tmp_path, words: list[str], word_length: int):
+    path = str(tmp_path / "bundle_en.bin")
+    save_bundle(path, words, word_length)
+    postings = load_bundle(path).postings[0]
+    assert postings._bitsets == {}
+    assert postings["a"] == sum(1 << index for index, word in enumerate(words) if word[0] == "a")
+    assert list(postings._bitsets) == ["a"]
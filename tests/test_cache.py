@@ -2,7 +2,7 @@ from typing import Optional
 
 import pytest
 
-from wordle_solver.cache import WordleCache
+from wordle_solver.cache import LayeredCache, SQLiteCache, TranspositionCache, WordleCache
 from wordle_solver.clue import Clue
 
 
@@ -24,3 +24,118 @@ def test_wordle_cache(
     for clue, valid_words in zip(clues, valid_words_per_clue):
         cache.set(clue, valid_words)
     assert cache.get(key) == expected_value
+
+
+def test_wordle_cache_evicts_least_recently_used(clues: list[Clue], valid_words_per_clue: list[set[str]]):
+    cache = WordleCache(max_entries=2)
+    cache.set(clues[0], valid_words_per_clue[0])
+    cache.set(clues[1], valid_words_per_clue[1])
+    assert cache.get(clues[0]) == valid_words_per_clue[0]
+    cache.set(clues[2], valid_words_per_clue[2])
+
+    assert len(cache) == 2
+    assert cache.get(clues[1]) is None
+    assert cache.get(clues[0]) == valid_words_per_clue[0]
+    assert cache.get(clues[2]) == valid_words_per_clue[2]
+
+
+def test_wordle_cache_statistics(clues: list[Clue], valid_words_per_clue: list[set[str]]):
+    cache = WordleCache(max_entries=1, time_encoding=True)
+    cache.set(clues[0], valid_words_per_clue[0])
+    cache.get(clues[0])
+    cache.get(clues[1])
+    cache.set(clues[1], valid_words_per_clue[1])
+
+    statistics = cache.get_statistics()
+    assert (statistics.hits, statistics.misses, statistics.evictions, statistics.entries) == (1, 1, 1, 1)
+    assert statistics.hit_rate == 0.5
+    assert statistics.encoding_seconds > 0
+
+    cache.reset_statistics()
+    assert cache.get_statistics().hits == 0
+
+    # The encoding is not timed by default
+    cache = WordleCache()
+    cache.get(clues[0])
+    assert cache.get_statistics().encoding_seconds == 0
+
+
+def test_wordle_cache_invalid_max_entries():
+    with pytest.raises(ValueError):
+        WordleCache(max_entries=0)
+
+
+def test_wordle_cache_evicts_within_byte_budget():
+    # Each bitset of 80 words takes 10 bytes
+    cache = WordleCache(max_bytes=25)
+    cache.set((0, "a", 2), 1 << 79)
+    cache.set((1, "b", 2), (1 << 80) - 1)
+    cache.get((0, "a", 2))
+    cache.set((2, "c", 2), 1 << 75)
+
+    statistics = cache.get_statistics()
+    assert (statistics.entries, statistics.bytes, statistics.evictions) == (2, 20, 1)
+    assert cache.get((1, "b", 2)) is None
+    assert cache.get((0, "a", 2)) == 1 << 79
+
+    # Replacing a value only counts its new size
+    cache.set((0, "a", 2), 1)
+    assert cache.get_statistics().bytes == 11
+
+    # A value larger than the budget is not kept
+    cache.set((3, "d", 2), 1 << 400)
+    assert cache.get((3, "d", 2)) is None
+    assert cache.get_statistics().bytes <= 25
+
+    cache.clear()
+    assert cache.get_statistics().bytes == 0
+
+
+def test_wordle_cache_invalid_max_bytes():
+    with pytest.raises(ValueError):
+        WordleCache(max_bytes=0)
+
+
+def test_sqlite_cache_persists_across_connections(tmp_path):
+    path = str(tmp_path / "positions.sqlite")
+    cache = SQLiteCache(path)
+    cache.set("position", "arise")
+    cache.set("other position", "melon")
+    cache.set("position", "apple")
+    cache.close()
+
+    cache = SQLiteCache(path)
+    assert cache.get("position") == "apple"
+    assert cache.get("other position") == "melon"
+    assert cache.get("unknown position") is None
+    assert len(cache) == 2
+    cache.close()
+
+
+def test_sqlite_cache_evicts_least_recently_used(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "positions.sqlite"), max_entries=2)
+    cache.set("first", "arise")
+    cache.set("second", "melon")
+    assert cache.get("first") == "arise"
+    cache.set("third", "apple")
+
+    assert len(cache) == 2
+    assert cache.get("second") is None
+    assert cache.get("first") == "arise"
+    assert cache.get("third") == "apple"
+    cache.close()
+
+
+def test_layered_cache(tmp_path):
+    memory_cache = TranspositionCache(max_entries=1)
+    sqlite_cache = SQLiteCache(str(tmp_path / "positions.sqlite"))
+    cache = LayeredCache([memory_cache, sqlite_cache])
+    cache.set("first", "arise")
+    cache.set("second", "melon")
+    assert memory_cache.get("first") is None
+    assert sqlite_cache.get("first") == "arise"
+
+    assert cache.get("first") == "arise"
+    assert memory_cache.get("first") == "arise"
+    assert cache.get("third") is None
+    sqlite_cache.close()
@@ -0,0 +1,56 @@
+import pytest
+
+from wordle_solver.clue import (
+    Clue,
+    decode_feedback,
+    encode_feedback,
+    format_feedback,
+    get_clues,
+    get_distinct_guesses,
+    get_feedback,
+    parse_feedback,
+)
+
+
+@pytest.mark.parametrize(
+    "guess,target,expected_feedback",
+    [
+        ("hello", "world", "ggycy"),
+        ("apple", "apple", "ccccc"),
+        ("arise", "melon", "ggggy"),
+        ("green", "other", "gyycg"),
+    ],
+)
+def test_feedback(guess: str, target: str, expected_feedback: str):
+    clues = get_clues(guess, target)
+    assert [clue.character for clue in clues] == list(guess)
+    assert format_feedback(encode_feedback(clues), len(guess)) == expected_feedback
+    assert parse_feedback(expected_feedback) == encode_feedback(clues)
+    assert get_feedback(guess, target) == encode_feedback(clues)
+    assert decode_feedback(guess, get_feedback(guess, target)) == clues
+
+
+def test_get_clues():
+    assert get_clues("ab", "ba") == [
+        Clue(position=0, character="a", in_word=True, correct_position=False),
+        Clue(position=1, character="b", in_word=True, correct_position=False),
+    ]
+
+
+def test_parse_invalid_feedback():
+    with pytest.raises(ValueError):
+        parse_feedback("ggxgg")
+
+
+@pytest.mark.parametrize(
+    "guesses,targets,expected_guesses",
+    [
+        # "xyz" and "wvu" only get grey clues, and "abd" gets the same clues as "abc" from every target
+        (["abc", "abd", "wvu", "xyz"], {"abc", "bca"}, ["abc", "abd", "wvu"]),
+        (["abd", "abe", "wvu", "xyz"], {"abc", "bca"}, ["abd", "wvu"]),
+        (["cab", "acb", "bac"], {"abc"}, ["cab", "acb", "bac"]),
+        (["abc", "abd"], set(), ["abc"]),
+    ],
+)
+def test_get_distinct_guesses(guesses: list[str], targets: set[str], expected_guesses: list[str]):
+    assert get_distinct_guesses(guesses, targets) == expected_guesses
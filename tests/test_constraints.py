@@ -0,0 +1,100 @@
+from typing import Callable
+
+import numpy as np
+import pytest
+
+from wordle_solver.clue import Clue
+from wordle_solver.constraints import ConstraintIndex, compile_clues
+
+
+@pytest.fixture
+def constraint_index(all_words: set[str], word_length: int) -> ConstraintIndex:
+    return ConstraintIndex(sorted(all_words), word_length)
+
+
+def test_compile_clues(clue_factory: Callable[[int, str, bool, bool], Clue]):
+    clues = [
+        clue_factory(0, "a", True, True),
+        clue_factory(1, "b", True, False),
+        clue_factory(2, "c", False, False),
+        clue_factory(2, "a", False, False),
+    ]
+    constraints = compile_clues(clues, ["a", "b", "c", "d"], 3)
+    assert constraints.green.tolist() == [0, -1, -1]
+    assert constraints.allowed.tolist() == [
+        [True, False, False, False],
+        [True, False, True, True],
+        [False, True, True, True],
+    ]
+    assert constraints.min_counts.tolist() == [1, 1, 0, 0]
+    assert constraints.max_counts.tolist() == [3, 3, 0, 3]
+    assert not constraints.impossible
+
+
+@pytest.mark.parametrize(
+    "clue_positions,clue_characters,clue_in_words,clue_correct_positions,expected_valid_words",
+    [
+        ([0], ["a"], [True], [True], {"apple", "awake", "alive", "arise"}),
+        ([0], ["a"], [True], [False], {"happy", "grape", "peach"}),
+        ([4], ["o"], [True], [True], {"hello"}),
+        ([0], ["z"], [True], [True], set()),
+        ([0], ["a"], [False], [False], {"hello", "world", "melon", "other", "green"}),
+        ([0, 0], ["a", "e"], [True, True], [True, False], {"apple", "awake", "alive", "arise"}),
+        ([0, 1, 2], ["h", "a", "p"], [True, True, True], [True, True, True], {"happy"}),
+        ([0, 0, 3], ["z", "g", "e"], [False, True, True], [False, True, False], {"grape"}),
+        ([0, 0, 4], ["z", "g", "e"], [False, True, False], [False, True, False], set()),
+        ([2, 3], ["l", "l"], [True, True], [True, True], {"hello"}),
+        ([4, 0], ["e", "e"], [False, True], [False, False], {"hello", "melon", "peach", "other", "green"}),
+    ],
+)
+def test_constraint_index(
+    clue_positions: list[int],
+    clue_characters: list[str],
+    clue_in_words: list[bool],
+    clue_correct_positions: list[bool],
+    expected_valid_words: set[str],
+    all_words: set[str],
+    clue_factory: Callable[[int, str, bool, bool], Clue],
+    constraint_index: ConstraintIndex,
+):
+    clues = []
+    for clue_position, clue_character, in_word, correct_position in zip(
+        clue_positions, clue_characters, clue_in_words, clue_correct_positions
+    ):
+        clues.append(clue_factory(clue_position, clue_character, in_word, correct_position))
+    constraint_index.add_clues(clues)
+    assert constraint_index.get_possible_words() == expected_valid_words
+    assert constraint_index.get_all_words() == all_words
+    constraint_index.reset_clues()
+    assert constraint_index.get_possible_words() == all_words
+
+
+def test_constraint_index_matches_patterns(pattern_wordle_solver, constraint_index: ConstraintIndex):
+    words = sorted(constraint_index.get_all_words())
+    for guess in words:
+        for target in words:
+            constraint_index.push_state()
+            constraint_index.add_feedback(guess, pattern_wordle_solver._get_feedback(guess, target))
+            expected_words = {
+                word
+                for word in words
+                if pattern_wordle_solver._get_feedback(guess, word)
+                == pattern_wordle_solver._get_feedback(guess, target)
+            }
+            assert constraint_index.get_possible_words() == expected_words
+            constraint_index.pop_state()
+    assert constraint_index.get_possible_words() == set(words)
+
+
+def test_constraint_index_query(constraint_index: ConstraintIndex, clues: list[Clue]):
+    constraint_index.add_clues(clues[3:])
+    query = constraint_index.query(clues[:1])
+    assert query.get_possible_words() == {"apple", "awake", "alive", "arise"}
+    assert constraint_index.get_possible_words() == constraint_index.get_all_words() - {"world"}
+    assert constraint_index.query().get_possible_words() == constraint_index.get_all_words()
+
+
+def test_constraint_mask_counts(clue_factory: Callable[[int, str, bool, bool], Clue]):
+    letters = np.array([[0, 0, 1], [0, 1, 1], [1, 1, 1]], dtype=np.uint8)
+    constraints = compile_clues([clue_factory(0, "a", True, True), clue_factory(1, "a", True, True)], ["a", "b"], 3)
+    assert constraints.get_mask(letters).tolist() == [True, False, False]
@@ -1,5 +1,6 @@
 import pytest
 
+from wordle_solver import filters
 from wordle_solver.filters import filter_repeated_characters, group_by_overlapping_characters
 
 
@@ -34,3 +35,10 @@ def test_group_by_overlapping_characters(
     words: list[str], max_groups: int, iou_threshold: float, expected_groups: dict[str, set[str]]
 ):
     assert group_by_overlapping_characters(words, max_groups, iou_threshold) == expected_groups
+
+
+def test_group_by_overlapping_characters_in_blocks(monkeypatch: pytest.MonkeyPatch):
+    words = ["abc", "bcd", "fgh", "afg", "ghi", "fhi", "axy", "bcx", "fgi", "cde"]
+    expected_groups = group_by_overlapping_characters(words, 3, 0.5)
+    monkeypatch.setattr(filters, "BLOCK_ELEMENTS", 3)
+    assert group_by_overlapping_characters(words, 3, 0.5) == expected_groups
@@ -0,0 +1,22 @@
+import pytest
+
+from wordle_solver.heuristics import get_letter_scores, rank_candidates
+
+
+@pytest.mark.parametrize(
+    "candidates,possible_words,expected_ranking",
+    [
+        (["aaaa", "abcd", "bcde"], {"abce", "abdf", "bcef", "cdeg"}, ["abcd", "bcde", "aaaa"]),
+        (["xyzw", "abcd"], {"abcd", "abce"}, ["abcd", "xyzw"]),
+        (["bbbb", "aaaa"], {"cccc", "dddd"}, ["aaaa", "bbbb"]),
+    ],
+)
+def test_rank_candidates(candidates: list[str], possible_words: set[str], expected_ranking: list[str]):
+    assert rank_candidates(candidates, possible_words) == expected_ranking
+
+
+def test_get_letter_scores():
+    scores = get_letter_scores(["ab", "ba", "cc"], {"ab", "ac"})
+    # "a" is in every word, so it only scores for its position, while "b" splits the words evenly
+    assert scores == {"ab": pytest.approx(1 + 1.5), "ba": pytest.approx(1), "cc": pytest.approx(1 + 0.5)}
+    assert get_letter_scores(["ab"], set()) == {"ab": 0.0}
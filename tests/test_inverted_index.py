@@ -2,7 +2,7 @@ from typing import Callable
 
 import pytest
 
-from wordle_solver.inverted_index import InvertedIndex
+from wordle_solver.inverted_index import BitsetInvertedIndex, DocumentIds, InvertedIndex
 
 
 @pytest.mark.parametrize(
@@ -161,3 +161,64 @@ def test_get_possible_words_inverted_index(
 ):
     inverted_index = inverted_index_factory(letters, words)
     assert inverted_index.get_possible_words() == expected_values
+
+
+@pytest.mark.parametrize(
+    "documents,query_documents,expected_bitset",
+    [
+        (["abc", "abd", "bcd"], ["abc"], 0b001),
+        (["abc", "abd", "bcd"], ["abd", "bcd"], 0b110),
+        (["abc", "abd", "bcd"], [], 0),
+        (["abc", "abd", "bcd"], ["bde"], 0b1000),
+    ],
+)
+def test_document_ids(documents: list[str], query_documents: list[str], expected_bitset: int):
+    document_ids = DocumentIds[str]()
+    for document in documents:
+        document_ids.get_id(document)
+    bitset = document_ids.encode(query_documents)
+    assert bitset == expected_bitset
+    assert document_ids.decode(bitset) == set(query_documents)
+    assert document_ids.get_ids(bitset).tolist() == sorted(
+        document_ids.get_id(document) for document in query_documents
+    )
+
+
+def test_add_documents():
+    document_ids = DocumentIds[str]()
+    document_ids.get_id("abc")
+    document_ids.add_documents(["abd", "bcd"])
+    assert [document_ids.get_id(document) for document in ["abc", "abd", "bcd"]] == [0, 1, 2]
+    with pytest.raises(ValueError):
+        document_ids.add_documents(["bde", "abc"])
+
+
+def test_bitset_inverted_index_from_postings():
+    document_ids = DocumentIds[str]()
+    document_ids.add_documents(["abc", "abd", "bcd"])
+    index = BitsetInvertedIndex[str, str].from_postings({"a": 0b011, "b": 0b100}, document_ids)
+    assert index.get("a") == {"abc", "abd"}
+    assert index.get_does_not_contain(["a"]) == {"bcd"}
+
+
+def test_bitset_inverted_index_shared_document_ids():
+    document_ids = DocumentIds[str]()
+    first_index = BitsetInvertedIndex[str, str](document_ids)
+    second_index = BitsetInvertedIndex[str, str](document_ids)
+    for word in ["abc", "abd", "bcd"]:
+        first_index.add(word[0], word)
+        second_index.add(word[1], word)
+    bitset = first_index.get_bitset("a") & second_index.get_bitset("b")
+    assert document_ids.decode(bitset) == {"abc", "abd"}
+    assert document_ids.get_all() == 0b111
+
+
+def test_get_does_not_contain_is_updated_after_add(
+    inverted_index_factory: Callable[[list[str], list[str]], InvertedIndex[str, str]],
+):
+    inverted_index = inverted_index_factory(["a", "b"], ["abc", "bcd"])
+    assert inverted_index.get_does_not_contain(["a"]) == {"bcd"}
+    assert inverted_index.get_does_not_contain(["a"]) == {"bcd"}
+    inverted_index.add("c", "cde")
+    assert inverted_index.get_does_not_contain(["a"]) == {"bcd", "cde"}
+    assert inverted_index.get_does_not_contain(["b", "a"]) == {"cde"}
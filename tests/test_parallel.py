@@ -0,0 +1,58 @@
+from typing import Callable
+
+import numpy as np
+import pytest
+
+from wordle_solver.clue import Clue
+from wordle_solver.parallel import ParallelScorer
+from wordle_solver.pattern_store import PatternStore
+from wordle_solver.patterns import PatternMatrix
+from wordle_solver.search_space import SearchSpace
+from wordle_solver.solver import WordleSolver
+from wordle_solver.wordle_index import WordleIndex
+
+
+@pytest.mark.parametrize("stored", [False, True])
+def test_parallel_scorer(tmp_path, pattern_matrix: PatternMatrix, word_length: int, stored: bool):
+    if stored:
+        pattern_matrix = PatternStore(str(tmp_path), "en", n_workers=1).get_pattern_matrix(
+            pattern_matrix.words, word_length
+        )
+    guess_indices = pattern_matrix.get_indices(pattern_matrix.words)
+    target_indices = pattern_matrix.get_indices(["melon", "hello", "green", "arise", "apple", "peach"])
+    scorer = ParallelScorer(pattern_matrix, n_workers=2, chunk_size=5)
+    try:
+        np.testing.assert_array_equal(
+            scorer.score_candidates(guess_indices, target_indices),
+            pattern_matrix.score_candidates(guess_indices, target_indices),
+        )
+        assert scorer.score_candidates(guess_indices[:0], target_indices).shape == (0,)
+    finally:
+        scorer.close()
+
+
+def test_parallel_solver_matches_serial(
+    search_space: SearchSpace,
+    wordle_index_factory: Callable[[list[str], int], WordleIndex],
+    pattern_matrix: PatternMatrix,
+    pattern_wordle_solver: WordleSolver,
+    clue_factory: Callable[[int, str, bool, bool], Clue],
+    word_length: int,
+):
+    wordle_index = wordle_index_factory(pattern_matrix.words, word_length)
+    parallel_solver = WordleSolver(
+        candidate_lister=wordle_index, search_space=search_space, pattern_matrix=pattern_matrix, n_workers=2
+    )
+    try:
+        assert parallel_solver.get_next_word() == pattern_wordle_solver.get_next_word()
+        clues = [clue_factory(4, "e", True, True)]
+        parallel_solver.add_clues(clues)
+        pattern_wordle_solver.add_clues(clues)
+        assert parallel_solver.get_next_word() == pattern_wordle_solver.get_next_word()
+    finally:
+        parallel_solver.close()
+
+
+def test_parallel_solver_requires_pattern_matrix(search_space: SearchSpace, wordle_solver: WordleSolver):
+    with pytest.raises(ValueError):
+        WordleSolver(candidate_lister=wordle_solver.candidate_lister, search_space=search_space, n_workers=2)
@@ -0,0 +1,65 @@
+import os
+
+import numpy as np
+import pytest
+
+from wordle_solver.pattern_store import PatternStore, get_wordlist_key
+from wordle_solver.patterns import PatternMatrix
+
+
+@pytest.fixture
+def words(all_words: set[str]) -> list[str]:
+    return sorted(all_words)
+
+
+def test_get_wordlist_key(words: list[str]):
+    assert get_wordlist_key(words, 5) == get_wordlist_key(list(words), 5)
+    assert get_wordlist_key(words, 5) != get_wordlist_key(words[1:], 5)
+    assert get_wordlist_key(words, 5) != get_wordlist_key(words, 6)
+
+
+@pytest.mark.parametrize("n_workers,chunk_size", [(1, 512), (2, 3)])
+def test_build_pattern_matrix(tmp_path, words: list[str], word_length: int, n_workers: int, chunk_size: int):
+    store = PatternStore(directory=str(tmp_path), name="en", n_workers=n_workers, chunk_size=chunk_size)
+    pattern_matrix = store.get_pattern_matrix(words, word_length)
+    assert not os.path.exists(pattern_matrix.path)
+
+    expected_patterns = PatternMatrix.from_words(words, word_length).patterns
+    np.testing.assert_array_equal(pattern_matrix.patterns, expected_patterns)
+    assert isinstance(pattern_matrix.patterns, np.memmap)
+    assert not pattern_matrix.patterns.flags.writeable
+    assert os.listdir(tmp_path) == [os.path.basename(pattern_matrix.path)]
+
+
+def test_reuse_stored_pattern_matrix(tmp_path, words: list[str], word_length: int):
+    store = PatternStore(directory=str(tmp_path), name="en", n_workers=1)
+    path = store.build(words, word_length)
+    modified_time = os.path.getmtime(path)
+    pattern_matrix = store.get_pattern_matrix(words, word_length)
+    assert pattern_matrix.path == path
+    assert pattern_matrix.get_pattern("apple", "apple") == 242
+    assert os.path.getmtime(path) == modified_time
+
+
+def test_rebuild_when_wordlist_changes(tmp_path, words: list[str], word_length: int):
+    store = PatternStore(directory=str(tmp_path), name="en", n_workers=1)
+    old_path = store.build(words, word_length)
+    other_store = PatternStore(directory=str(tmp_path), name="es", n_workers=1)
+    other_path = other_store.build(words, word_length)
+
+    pattern_matrix = store.get_pattern_matrix(words[1:], word_length)
+    np.testing.assert_array_equal(pattern_matrix.patterns, PatternMatrix.from_words(words[1:], word_length).patterns)
+    assert pattern_matrix.path != old_path
+    assert sorted(os.listdir(tmp_path)) == sorted([os.path.basename(pattern_matrix.path), os.path.basename(other_path)])
+
+
+def test_keep_matrices_of_other_word_lengths(tmp_path, words: list[str], word_length: int):
+    store = PatternStore(directory=str(tmp_path), name="en", n_workers=1)
+    short_words = sorted({word[:4] for word in words})
+    short_path = store.build(short_words, 4)
+    path = store.build(words, word_length)
+    assert sorted(os.listdir(tmp_path)) == sorted([os.path.basename(short_path), os.path.basename(path)])
+
+    # Only the stale matrix of the same word length is removed
+    new_path = store.build(words[1:], word_length)
+    assert sorted(os.listdir(tmp_path)) == sorted([os.path.basename(short_path), os.path.basename(new_path)])
@@ -0,0 +1,114 @@
+import numpy as np
+import pytest
+
+from wordle_solver.clue import get_clues
+from wordle_solver.patterns import PatternMatrix, encode_letters, get_pattern_dtype
+
+
+@pytest.mark.parametrize(
+    "word_length,expected_dtype",
+    [(3, np.uint8), (5, np.uint8), (6, np.uint16), (10, np.uint16), (11, np.uint32)],
+)
+def test_get_pattern_dtype(word_length: int, expected_dtype: np.dtype):
+    assert get_pattern_dtype(word_length) == expected_dtype
+
+
+def test_encode_letters():
+    letters, alphabet = encode_letters(["abc", "cab", "ñaa"], 3)
+    assert alphabet == ["a", "b", "c", "ñ"]
+    assert letters.tolist() == [[0, 1, 2], [2, 0, 1], [3, 0, 0]]
+
+
+def test_encode_letters_wrong_length():
+    with pytest.raises(ValueError):
+        encode_letters(["abc", "abcd"], 3)
+
+
+@pytest.mark.parametrize(
+    "guess,target,expected_pattern",
+    [
+        ("hello", "world", 9 + 2 * 27 + 81),
+        ("apple", "apple", 242),
+        ("arise", "melon", 81),
+        ("peach", "happy", 1 + 9 + 81),
+        ("green", "other", 3 + 9 + 2 * 27),
+    ],
+)
+def test_get_pattern(pattern_matrix: PatternMatrix, guess: str, target: str, expected_pattern: int):
+    assert pattern_matrix.get_pattern(guess, target) == expected_pattern
+
+
+def test_patterns_match_solver_clues(pattern_matrix: PatternMatrix, pattern_wordle_solver):
+    for guess in pattern_matrix.words:
+        for target in pattern_matrix.words:
+            clues = get_clues(guess, target)
+            expected_pattern = sum(
+                (2 if clue.correct_position else 1 if clue.in_word else 0) * 3**clue.position for clue in clues
+            )
+            assert pattern_matrix.get_pattern(guess, target) == expected_pattern
+            assert pattern_wordle_solver._get_feedback(guess, target) == expected_pattern
+
+
+@pytest.mark.parametrize(
+    "guess,targets,expected_entropy",
+    [
+        ("hello", ["hello"], -0.01),
+        ("hello", ["world"], 0.0),
+        ("arise", ["melon", "hello", "green"], 2 / 3),
+        ("arise", ["melon", "hello", "green", "arise"], (2 - 0.01) / 4),
+        ("peach", ["hello", "world", "happy", "apple"], 0.0),
+    ],
+)
+def test_calculate_entropy(pattern_matrix: PatternMatrix, guess: str, targets: list[str], expected_entropy: float):
+    entropy = pattern_matrix.calculate_entropy(pattern_matrix.get_index(guess), pattern_matrix.get_indices(targets))
+    assert entropy == pytest.approx(expected_entropy)
+
+
+def test_score_candidates(pattern_matrix: PatternMatrix):
+    guess_indices = pattern_matrix.get_indices(pattern_matrix.words)
+    target_indices = pattern_matrix.get_indices(["melon", "hello", "green", "arise", "apple"])
+    scores = pattern_matrix.score_candidates(guess_indices, target_indices)
+    assert scores.shape == (len(guess_indices),)
+    for guess_index, score in zip(guess_indices, scores):
+        assert score == pytest.approx(pattern_matrix.calculate_entropy(guess_index, target_indices))
+
+
+def test_score_candidates_in_blocks(monkeypatch: pytest.MonkeyPatch, pattern_matrix: PatternMatrix):
+    guess_indices = pattern_matrix.get_indices(pattern_matrix.words)
+    target_indices = pattern_matrix.get_indices(pattern_matrix.words)
+    expected_scores = pattern_matrix.score_candidates(guess_indices, target_indices)
+    monkeypatch.setattr("wordle_solver.patterns.MAX_BLOCK_ELEMENTS", len(target_indices) * 5)
+    np.testing.assert_array_equal(pattern_matrix.score_candidates(guess_indices, target_indices), expected_scores)
+
+
+@pytest.mark.parametrize("max_block_elements", [1, 1 << 18])
+@pytest.mark.parametrize("seed", range(3))
+def test_score_candidates_for_target_sets(
+    monkeypatch: pytest.MonkeyPatch, pattern_matrix: PatternMatrix, max_block_elements: int, seed: int
+):
+    random = np.random.default_rng(seed)
+    guess_indices = random.permutation(pattern_matrix.get_indices(pattern_matrix.words))
+    target_index_sets = [
+        random.choice(guess_indices, size=random.integers(1, len(guess_indices)), replace=False) for _ in range(6)
+    ]
+    monkeypatch.setattr("wordle_solver.patterns.MAX_BLOCK_ELEMENTS", max_block_elements)
+    scores = pattern_matrix.score_candidates_for_target_sets(guess_indices, target_index_sets)
+    assert scores.shape == (len(target_index_sets), len(guess_indices))
+    for set_scores, target_indices in zip(scores, target_index_sets):
+        np.testing.assert_array_equal(set_scores, pattern_matrix.score_candidates(guess_indices, target_indices))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_lower_bounds_and_bounded_scores(pattern_matrix: PatternMatrix, seed: int):
+    random = np.random.default_rng(seed)
+    guess_indices = pattern_matrix.get_indices(pattern_matrix.words)
+    target_indices = random.choice(guess_indices, size=random.integers(1, len(guess_indices)), replace=False)
+    scores = pattern_matrix.score_candidates(guess_indices, target_indices)
+    assert np.all(pattern_matrix.get_lower_bounds(guess_indices, target_indices) <= scores + 1e-12)
+
+    bound = float(np.median(scores))
+    bounded_scores = pattern_matrix.score_candidates_with_bound(guess_indices, target_indices, bound, 3)
+    kept = np.isfinite(bounded_scores)
+    np.testing.assert_array_equal(bounded_scores[kept], scores[kept])
+    assert np.all(scores[~kept] > bound)
+    assert np.all(kept[scores <= bound])
@@ -0,0 +1,132 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from wordle_solver.cache import TranspositionCache
+from wordle_solver.clue import get_clues, parse_feedback
+from wordle_solver.profiling import SolverProfiler, TurnReport
+from wordle_solver.solver import PHASES, WordleSolver
+
+
+@pytest.fixture
+def profiled_solver(pattern_wordle_solver: WordleSolver) -> WordleSolver:
+    pattern_wordle_solver.verbose = False
+    pattern_wordle_solver.profiler = SolverProfiler(session="test")
+    pattern_wordle_solver.transposition_cache = TranspositionCache()
+    pattern_wordle_solver.reset()
+    return pattern_wordle_solver
+
+
+def test_turn_reports(profiled_solver: WordleSolver):
+    first_result = profiled_solver.search()
+    profiled_solver.add_feedback("arise", parse_feedback("ggggy"))
+    second_result = profiled_solver.search()
+    profiled_solver.add_clues(get_clues("melon", "melon"))
+    profiled_solver.search()
+
+    first_report, second_report, third_report = profiled_solver.profiler.reports
+    assert [report.turn for report in profiled_solver.profiler.reports] == [1, 2, 3]
+    assert all(report.session == "test" for report in profiled_solver.profiler.reports)
+
+    all_words = profiled_solver.search_space.all_words
+    assert (first_report.word, first_report.source) == (first_result.word, "search")
+    assert first_report.number_of_possible_words == len(all_words)
+    assert first_report.number_of_initial_candidates == len(all_words)
+    assert first_report.number_of_entropy_evaluations == first_result.number_of_scored_candidates
+    assert list(first_report.phase_seconds) == ["filter", *PHASES]
+    assert first_report.phase_seconds["filter"] == 0
+    assert first_report.seconds == first_result.seconds
+
+    assert (second_report.word, second_report.number_of_possible_words) == (second_result.word, 2)
+    # The feedback is filtered before the search, so its cache lookups are reported with the second turn
+    assert second_report.cache_misses > 0
+    assert second_report.phase_seconds["filter"] > 0
+
+    assert (third_report.source, third_report.number_of_possible_words) == ("solved", 1)
+    assert third_report.number_of_entropy_evaluations == 0
+    assert list(third_report.phase_seconds) == ["filter", "possible_words"]
+
+
+def test_turn_reports_from_transposition_cache(profiled_solver: WordleSolver):
+    profiled_solver.add_feedback("arise", parse_feedback("ggggy"))
+    profiled_solver.search()
+    profiled_solver.reset()
+    profiled_solver.add_feedback("grape", parse_feedback("ggggy"))
+    profiled_solver.search()
+
+    first_report, second_report = profiled_solver.profiler.reports
+    assert (first_report.turn, first_report.source) == (1, "search")
+    assert (second_report.turn, second_report.source) == (1, "transposition_cache")
+    assert (second_report.number_of_initial_candidates, second_report.number_of_entropy_evaluations) == (0, 0)
+    assert list(second_report.phase_seconds) == ["filter", "possible_words", "lookup"]
+
+
+def test_turn_reports_as_json_lines(profiled_solver: WordleSolver, tmp_path):
+    path = tmp_path / "profile.jsonl"
+    profiled_solver.profiler.output_path = str(path)
+    targets = ["hello", "melon", "apple", "grape"]
+
+    def _play(target: str):
+        solver = profiled_solver.query(get_clues("arise", target))
+        solver.search()
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(_play, targets))
+
+    with open(path, "r") as file:
+        reports = [TurnReport(**json.loads(line)) for line in file]
+    assert sorted(reports, key=lambda report: report.word) == sorted(
+        profiled_solver.profiler.reports, key=lambda report: report.word
+    )
+    assert all(report.turn == 1 for report in reports)
+    # The clues of each query are filtered, and reported, before its first search
+    assert all(report.phase_seconds["filter"] > 0 for report in reports)
+    assert sum(report.cache_hits + report.cache_misses for report in reports) > 0
+
+
+def test_solver_without_profiler(wordle_solver: WordleSolver):
+    wordle_solver.verbose = False
+    wordle_solver.add_clues(get_clues("arise", "melon"))
+    assert wordle_solver.profiler is None
+    assert wordle_solver.search().word in {"hello", "melon"}
+
+
+def test_turn_reports_of_batch(profiled_solver: WordleSolver):
+    histories = [get_clues("arise", "melon"), get_clues("world", "happy"), get_clues("arise", "melon"), []]
+    histories.append(get_clues("melon", "melon"))
+    next_words = profiled_solver.get_next_words(histories)
+
+    reports = list(profiled_solver.profiler.reports)
+    assert [report.word for report in reports] == next_words
+    assert [report.source for report in reports] == ["search", "search", "search", "search", "solved"]
+    assert all(report.turn == 1 for report in reports)
+    # The games with the same possible words share a single search
+    assert reports[0].number_of_entropy_evaluations == reports[2].number_of_entropy_evaluations > 0
+    assert [report.batch_size for report in reports] == [3, 3, 3, 3, 1]
+    assert reports[3].number_of_initial_candidates == len(profiled_solver.search_space.all_words)
+    assert list(reports[0].phase_seconds) == ["filter", *PHASES]
+    assert reports[0].phase_seconds["filter"] > 0
+    assert reports[0].seconds == pytest.approx(
+        sum(seconds for seconds in reports[0].phase_seconds.values()) - reports[0].phase_seconds["filter"]
+    )
+    assert reports[0].cache_misses > 0
+
+    profiled_solver.profiler.clear()
+    assert profiled_solver.get_next_words(histories) == next_words
+    reports = list(profiled_solver.profiler.reports)
+    assert [report.source for report in reports][:4] == ["transposition_cache"] * 4
+    assert all(report.number_of_entropy_evaluations == 0 for report in reports)
+
+
+def test_attach_profiler(pattern_wordle_solver: WordleSolver):
+    pattern_wordle_solver.verbose = False
+    pattern_wordle_solver.add_feedback("arise", parse_feedback("ggggy"))
+    pattern_wordle_solver.search()
+    pattern_wordle_solver.profiler = SolverProfiler()
+    pattern_wordle_solver.search()
+
+    # The clues filtered before the profiler was attached are not counted
+    (report,) = pattern_wordle_solver.profiler.reports
+    assert report.turn == 1
+    assert (report.cache_hits, report.cache_misses) == (0, 0)
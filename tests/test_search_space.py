@@ -48,3 +48,53 @@ def test_search_space(
     )
     assert initial_candidates == expected_initial_candidates
     assert follow_up_candidates == expected_follow_up_candidates
+
+
+def test_get_key(words: set[str], groups: dict[str, set[str]]):
+    key = SearchSpace(all_words=words, groups=groups).get_key()
+    assert key == SearchSpace(all_words=set(words), groups=dict(groups)).get_key()
+    assert key != SearchSpace(all_words=words, groups=None).get_key()
+    assert key != SearchSpace(all_words=words, groups=dict()).get_key()
+    assert key != SearchSpace(all_words=words, groups=groups, max_search_size=5).get_key()
+    assert key != SearchSpace(all_words=words | {"mno"}, groups=groups).get_key()
+
+
+@pytest.mark.parametrize(
+    "current_search_size,use_groups,expected", [(1, True, False), (10, True, True), (10, False, False)]
+)
+def test_has_follow_up(
+    words: set[str], groups: dict[str, set[str]], current_search_size: int, use_groups: bool, expected: bool
+):
+    search_space = SearchSpace(all_words=words, groups=groups if use_groups else None, max_search_size=5)
+    assert search_space.has_follow_up(current_search_size) == expected
+
+
+@pytest.mark.parametrize(
+    "current_search_size,cost_target,expected_initial_candidates",
+    [
+        (4, 4, {"abc", "def", "ghi", "jkl"}),
+        (10, 10, {"ghi"}),
+        (10, 20, {"abc", "ghi"}),
+        (10, 40, {"abc", "def", "ghi", "jkl"}),
+    ],
+)
+def test_cost_target(
+    words: set[str],
+    groups: dict[str, set[str]],
+    current_search_size: int,
+    cost_target: int,
+    expected_initial_candidates: set[str],
+):
+    search_space = SearchSpace(
+        all_words=words, groups=groups, max_search_size=5, cost_target=cost_target, min_candidates=1
+    )
+    possible_words = {"abd", "agh", "abi"}
+    assert search_space.get_initial_candidates(current_search_size, possible_words) == expected_initial_candidates
+    assert search_space.get_follow_up_candidates("ghi", current_search_size) == {"ghi"}
+    assert not search_space.has_follow_up(current_search_size)
+
+
+def test_cost_target_requires_possible_words(words: set[str]):
+    search_space = SearchSpace(all_words=words, groups=None, max_search_size=5, cost_target=10, min_candidates=1)
+    with pytest.raises(ValueError):
+        search_space.get_initial_candidates(10)
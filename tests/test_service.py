@@ -0,0 +1,180 @@
+import asyncio
+import json
+import urllib.error
+import urllib.request
+from functools import partial
+from typing import Callable, Optional
+
+import pytest
+
+from wordle_solver.clue import format_feedback, get_feedback
+from wordle_solver.service import SolverService
+from wordle_solver.solver import WordleSolver
+
+
+def _request(port: int, method: str, path: str, payload: Optional[dict] = None) -> tuple[int, dict]:
+    data = None if payload is None else json.dumps(payload).encode()
+    request = urllib.request.Request(f"http://127.0.0.1:{port}{path}", data=data, method=method)
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as error:
+        return error.code, json.loads(error.read())
+
+
+def _run(service: SolverService, scenario) -> list[tuple[int, dict]]:
+    """Starts the service on a free port of localhost and plays the scenario against it."""
+
+    async def _main():
+        async with service:
+            port = await service.start()
+            return await scenario(partial(asyncio.to_thread, _request, port))
+
+    return asyncio.run(_main())
+
+
+async def _play(request, target: str) -> list[str]:
+    status, response = await request("POST", "/sessions", {"language": "en"})
+    assert status == 201
+    session_id, guess = response["session_id"], response["next_word"]
+    guesses = [guess]
+    while guess != target and len(guesses) < 10:
+        feedback = format_feedback(get_feedback(guess, target), len(target))
+        status, response = await request(
+            "POST", f"/sessions/{session_id}/feedback", {"guess": guess, "feedback": feedback}
+        )
+        assert status == 200
+        assert target in response["possible_words"]
+        guess = response["next_word"]
+        guesses.append(guess)
+    return guesses
+
+
+@pytest.mark.parametrize("n_workers, n_threads", [(None, 1), (None, 4), (2, 1)])
+def test_concurrent_sessions(
+    solver_factory: Callable[[], WordleSolver], all_words: set[str], n_workers: Optional[int], n_threads: int
+):
+    service = SolverService(
+        solver_factories={"en": solver_factory},
+        optimal_starts={"en": "arise"},
+        n_workers=n_workers,
+        n_threads=n_threads,
+    )
+    targets = sorted(all_words)
+
+    async def _scenario(request):
+        return await asyncio.gather(*[_play(request, target) for target in targets])
+
+    games = _run(service, _scenario)
+    for target, guesses in zip(targets, games):
+        assert guesses[0] == "arise"
+        assert guesses[-1] == target
+
+    # The games are the same as the ones played by a solver that is not shared with other sessions
+    solver = solver_factory()
+    for target, guesses in zip(targets, games):
+        solver.reset()
+        for guess in guesses[:-1]:
+            solver.add_feedback(guess, get_feedback(guess, target))
+        if len(guesses) > 1:
+            assert solver.get_next_word() == guesses[-1]
+
+
+def test_session_history(solver_factory: Callable[[], WordleSolver]):
+    service = SolverService(solver_factories={"en": solver_factory})
+
+    async def _scenario(request):
+        status, response = await request("POST", "/sessions", {"language": "en"})
+        session_id = response["session_id"]
+        # Without a precomputed start, the first word is searched
+        assert response["next_word"] == solver_factory().get_next_word()
+        await request("POST", f"/sessions/{session_id}/feedback", {"guess": "arise", "feedback": "gggcc"})
+        responses = [await request("GET", f"/sessions/{session_id}")]
+        responses.append(await request("DELETE", f"/sessions/{session_id}"))
+        responses.append(await request("GET", f"/sessions/{session_id}"))
+        return responses
+
+    (status, history), (delete_status, _), (missing_status, _) = _run(service, _scenario)
+    assert status == 200
+    assert history["language"] == "en"
+    assert history["history"] == [{"guess": "arise", "feedback": "gggcc"}]
+    assert delete_status == 200
+    assert missing_status == 404
+
+
+def test_next_words(solver_factory: Callable[[], WordleSolver], all_words: set[str]):
+    service = SolverService(solver_factories={"en": solver_factory}, optimal_starts={"en": "arise"})
+    histories = [[]] + [[("arise", get_feedback("arise", target))] for target in sorted(all_words)]
+
+    async def _scenario(request):
+        payload = {
+            "language": "en",
+            "histories": [
+                [{"guess": guess, "feedback": format_feedback(feedback, 5)} for guess, feedback in turns]
+                for turns in histories
+            ],
+        }
+        return await request("POST", "/next-words", payload)
+
+    status, response = _run(service, _scenario)
+    assert status == 200
+    solver = solver_factory()
+    expected_words = []
+    for turns in histories:
+        solver.reset()
+        for guess, feedback in turns:
+            solver.add_feedback(guess, feedback)
+        expected_words.append(solver.get_next_word())
+    assert response["next_words"] == expected_words
+
+
+@pytest.mark.parametrize(
+    "method, path, payload, expected_status",
+    [
+        ("POST", "/sessions", {"language": "fr"}, 400),
+        ("POST", "/sessions/unknown/feedback", {"guess": "arise", "feedback": "ggggg"}, 404),
+        ("POST", "/session", {"language": "en"}, 404),
+        ("PUT", "/sessions", {"language": "en"}, 405),
+        ("POST", "/feedback", {"guess": "arise", "feedback": "ggggg"}, 404),
+        ("POST", "{session}/feedback", {"guess": "arise"}, 400),
+        ("POST", "{session}/feedback", {"guess": "arise", "feedback": "gggg"}, 400),
+        ("POST", "{session}/feedback", {"guess": "arise", "feedback": "ggxgg"}, 400),
+        ("POST", "{session}/feedback", {"guess": "arise", "feedback": "ggggg", "time_budget": -1}, 400),
+        ("POST", "{session}/feedback", {"guess": "arise", "feedback": "ggggg", "time_budget": True}, 400),
+        ("POST", "/next-words", {"language": "en", "histories": [[{"guess": "arise"}]]}, 400),
+        ("POST", "/next-words", {"language": "en", "histories": [["arise"]]}, 400),
+        ("POST", "/next-words", {"language": "en", "histories": "arise"}, 400),
+        ("POST", "/next-words", {"language": "en", "histories": [[{"guess": "zzzzz", "feedback": "ccccc"}]]}, 400),
+        ("GET", "/next-words", {}, 405),
+    ],
+)
+def test_invalid_requests(
+    solver_factory: Callable[[], WordleSolver], method: str, path: str, payload: dict, expected_status: int
+):
+    service = SolverService(solver_factories={"en": solver_factory}, optimal_starts={"en": "arise"})
+
+    async def _scenario(request):
+        _, response = await request("POST", "/sessions", {"language": "en"})
+        status, error = await request(method, path.format(session=f"/sessions/{response['session_id']}"), payload)
+        _, history = await request("GET", f"/sessions/{response['session_id']}")
+        return status, error, history
+
+    status, error, history = _run(service, _scenario)
+    assert status == expected_status
+    assert "error" in error
+    # A rejected guess is not added to the history
+    assert history["history"] == []
+
+
+def test_max_sessions(solver_factory: Callable[[], WordleSolver]):
+    service = SolverService(
+        solver_factories={"en": solver_factory},
+        optimal_starts={"en": "arise"},
+        max_sessions=2,
+    )
+
+    async def _scenario(request):
+        session_ids = [(await request("POST", "/sessions", {"language": "en"}))[1]["session_id"] for _ in range(3)]
+        return [(await request("GET", f"/sessions/{session_id}"))[0] for session_id in session_ids]
+
+    assert _run(service, _scenario) == [404, 200, 200]
@@ -0,0 +1,155 @@
+import json
+import os
+from typing import Callable
+
+import pytest
+
+from wordle_solver.cache import POSITION_KEY_VERSION
+from wordle_solver.clue import parse_feedback
+from wordle_solver.constraints import ConstraintIndex
+from wordle_solver.simulation import GameResult, load_solver, play_game, read_results, run_simulation, summarize
+from wordle_solver.pattern_store import get_wordlist_key
+from wordle_solver.solver import WordleSolver
+from wordle_solver.strategy_tree import StrategyNode, StrategyTree, save_second_guesses
+
+
+def test_load_solver(static_directory: str, all_words: set[str]):
+    solver, optimal_start = load_solver("en", static_directory=static_directory)
+    assert optimal_start == "arise"
+    assert solver.get_possible_words() == all_words
+
+
+def _save_second_guesses(static_directory: str, **header):
+    solver, _ = load_solver("en", static_directory=static_directory, precomputed=False)
+    words = sorted(solver.search_space.all_words)
+    tree = StrategyTree(
+        StrategyNode("arise", {parse_feedback("ggggy"): StrategyNode("melon")}),
+        5,
+        get_wordlist_key(words, 5),
+        solver.search_space.get_key(),
+    )
+    save_second_guesses(os.path.join(static_directory, "second_guesses.json"), "en", tree)
+    with open(os.path.join(static_directory, "second_guesses.json"), "r") as file:
+        data = json.load(file)
+    data["en"].update(header)
+    with open(os.path.join(static_directory, "second_guesses.json"), "w") as file:
+        json.dump(data, file)
+
+
+def test_load_solver_with_precomputed_strategies(static_directory: str):
+    _save_second_guesses(static_directory)
+    solver, _ = load_solver("en", static_directory=static_directory)
+    assert solver.second_guesses == {"arise": {"ggggy": "melon"}}
+    solver.add_feedback("arise", parse_feedback("ggggy"))
+    assert solver.get_next_word() == "melon"
+    solver.reset()
+    solver.add_feedback("alive", parse_feedback("gyggy"))
+    solver.get_next_word()
+    assert len(solver.transposition_cache.caches[-1]) == 1
+
+    solver, _ = load_solver("en", static_directory=static_directory, precomputed=False)
+    assert (solver.strategy_tree, solver.second_guesses, solver.transposition_cache) == (None, None, None)
+
+
+@pytest.mark.parametrize(
+    "header",
+    [{"position_key_version": POSITION_KEY_VERSION - 1}, {"wordlist_key": "other"}, {"search_space_key": "other"}],
+)
+def test_load_solver_with_stale_second_guesses(static_directory: str, header: dict):
+    _save_second_guesses(static_directory, **header)
+    with pytest.warns(UserWarning):
+        solver, _ = load_solver("en", static_directory=static_directory)
+    assert solver.second_guesses is None
+
+
+@pytest.mark.parametrize("target", ["arise", "apple", "green", "world"])
+def test_play_game(static_directory: str, target: str):
+    solver, optimal_start = load_solver("en", static_directory=static_directory)
+    result = play_game(solver, target, optimal_start)
+    assert result.guesses[0] == "arise"
+    assert result.guesses[-1] == target
+    assert result.solved
+    assert not result.stalled
+
+
+def test_play_game_with_constraint_filter(static_directory: str):
+    solver, optimal_start = load_solver("en", static_directory=static_directory, constraint_filter=True)
+    assert isinstance(solver.candidate_lister, ConstraintIndex)
+    for target in ["apple", "green", "melon"]:
+        result = play_game(solver, target, optimal_start)
+        assert result.guesses[-1] == target
+        assert not result.stalled
+
+
+def test_play_game_stalled(static_directory: str):
+    solver, optimal_start = load_solver("en", static_directory=static_directory)
+    solver.get_next_word = lambda: "world"
+    result = play_game(solver, "melon", optimal_start)
+    # The game stops as soon as the guess is repeated, instead of playing until the guess limit
+    assert result.guesses == ["arise", "world"]
+    assert result.stalled
+    assert not result.solved
+    assert summarize([result]).stalled == ["melon"]
+
+
+class _Interrupted(Exception):
+    pass
+
+
+def _interrupt(number_of_games: int):
+    raise _Interrupted()
+
+
+@pytest.mark.parametrize("n_workers", [1, 2])
+def test_run_simulation(tmp_path, solver_factory: Callable[[], WordleSolver], all_words: set[str], n_workers: int):
+    output_path = str(tmp_path / "results.jsonl")
+    targets = sorted(all_words)
+    # The run is interrupted after its first chunk of games
+    with pytest.raises(_Interrupted):
+        run_simulation(
+            targets, output_path, solver_factory, "arise", n_workers=n_workers, chunk_size=2, progress=_interrupt
+        )
+    resumed_targets = sorted(result.target for result in read_results(output_path))
+    assert len(resumed_targets) == 2
+
+    finished = []
+    report = run_simulation(
+        targets, output_path, solver_factory, "arise", n_workers=n_workers, progress=finished.append
+    )
+    assert report.number_of_games == len(targets)
+    assert report.games_played == len(targets) - 2
+    assert sum(finished) == len(targets)
+    assert sum(report.guess_distribution.values()) == len(targets)
+    assert report.failures == []
+    assert sorted(result.target for result in read_results(output_path)) == targets
+
+
+@pytest.mark.parametrize(
+    "run_kwargs",
+    [{"targets_slice": slice(1, None)}, {"first_guess": "melon"}, {"max_guesses": 5}, {"config": {"cost_target": 10}}],
+)
+def test_run_simulation_refuses_to_resume_a_different_run(
+    tmp_path, solver_factory: Callable[[], WordleSolver], all_words: set[str], run_kwargs: dict
+):
+    output_path = str(tmp_path / "results.jsonl")
+    targets = sorted(all_words)[:3]
+    run_simulation(targets, output_path, solver_factory, "arise", n_workers=1, config={"cost_target": None})
+    kwargs = {"first_guess": "arise", "max_guesses": 6, "config": {"cost_target": None}}
+    targets = targets[run_kwargs.pop("targets_slice", slice(None))]
+    with pytest.raises(ValueError):
+        run_simulation(targets, output_path, solver_factory, n_workers=1, **{**kwargs, **run_kwargs})
+    # The results of the first run are kept
+    assert len(read_results(output_path)) == 3
+
+
+def test_summarize():
+    results = [
+        GameResult(target="apple", guesses=["arise", "apple"], solved=True, seconds=0.1),
+        GameResult(target="awake", guesses=["arise", "alive", "awake"], solved=True, seconds=0.1),
+        GameResult(target="melon", guesses=["arise", "green", "hello"], solved=False, seconds=0.1),
+    ]
+    report = summarize(results)
+    assert report.number_of_games == 3
+    assert report.guess_distribution == {2: 1, 3: 1}
+    assert report.failures == ["melon"]
+    assert report.average_guesses == 2.5
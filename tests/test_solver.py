@@ -1,8 +1,13 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import Callable
 import pytest
 
-from wordle_solver.clue import Clue
+from wordle_solver.cache import TranspositionCache, WordleCache
+from wordle_solver.clue import Clue, get_clues, get_distinct_guesses, get_feedback, parse_feedback
+from wordle_solver.patterns import PatternMatrix
+from wordle_solver.search_space import SearchSpace
 from wordle_solver.solver import WordleSolver
+from wordle_solver.wordle_index import WordleIndex
 
 
 @pytest.mark.parametrize(
@@ -34,8 +39,7 @@ from wordle_solver.solver import WordleSolver
             ["z", "g", "e"],
             [False, True, True],
             [False, True, False],
-            # TODO: Fix this so that "green" is not included in the set.
-            {"grape", "green"},
+            {"grape"},
         ),
         (
             [0, 0, 4],
@@ -99,3 +103,236 @@ def test_get_next_word(
             wordle_solver.get_next_word()
     else:
         assert wordle_solver.get_next_word() in possible_words
+
+
+@pytest.mark.parametrize(
+    "clue_positions,clue_characters,clue_in_words,clue_correct_positions,possible_words",
+    [
+        (
+            [0, 1, 2],
+            ["h", "a", "p"],
+            [True, True, True],
+            [True, True, True],
+            ["happy"],
+        ),
+        ([0], ["z"], [True], [True], []),
+        ([0], ["h"], [True], [True], ["happy", "hello"]),
+        ([4], ["a"], [True], [False], ["grape", "alive"]),
+    ],
+)
+def test_get_next_word_with_pattern_matrix(
+    clue_positions: list[int],
+    clue_characters: list[str],
+    clue_in_words: list[bool],
+    clue_correct_positions: list[bool],
+    possible_words: list[str],
+    clue_factory: Callable[[int, str, bool, bool], Clue],
+    pattern_wordle_solver: WordleSolver,
+):
+    clues = []
+    for clue_position, clue_character, in_word, correct_position in zip(
+        clue_positions, clue_characters, clue_in_words, clue_correct_positions
+    ):
+        clues.append(clue_factory(clue_position, clue_character, in_word, correct_position))
+    pattern_wordle_solver.add_clues(clues)
+    if len(possible_words) == 0:
+        with pytest.raises(ValueError):
+            pattern_wordle_solver.get_next_word()
+    else:
+        assert pattern_wordle_solver.get_next_word() in possible_words
+
+
+def test_pattern_matrix_matches_candidate_lister(wordle_solver: WordleSolver, pattern_wordle_solver: WordleSolver):
+    possible_words = wordle_solver.get_possible_words()
+    candidates = wordle_solver.search_space.get_initial_candidates(len(possible_words))
+    assert pattern_wordle_solver._get_best_candidate(candidates, possible_words) == wordle_solver._get_best_candidate(
+        candidates, possible_words
+    )
+
+
+@pytest.mark.parametrize(
+    "clue_positions,clue_characters,clue_in_words,clue_correct_positions",
+    [
+        ([], [], [], []),
+        ([0], ["h"], [True], [True]),
+        ([4], ["a"], [True], [False]),
+        ([4, 0], ["e", "z"], [True, False], [True, False]),
+    ],
+)
+def test_pruned_search_matches_exhaustive(
+    clue_positions: list[int],
+    clue_characters: list[str],
+    clue_in_words: list[bool],
+    clue_correct_positions: list[bool],
+    clue_factory: Callable[[int, str, bool, bool], Clue],
+    pattern_wordle_solver: WordleSolver,
+):
+    clues = []
+    for clue_position, clue_character, in_word, correct_position in zip(
+        clue_positions, clue_characters, clue_in_words, clue_correct_positions
+    ):
+        clues.append(clue_factory(clue_position, clue_character, in_word, correct_position))
+    pattern_wordle_solver.add_clues(clues)
+    possible_words = pattern_wordle_solver.get_possible_words()
+    candidates = pattern_wordle_solver.candidate_lister.get_all_words()
+    expected_word = pattern_wordle_solver._get_best_candidate(candidates, possible_words)
+    pattern_wordle_solver.prune = True
+    assert pattern_wordle_solver._get_best_candidate(candidates, possible_words) == expected_word
+
+
+def test_add_feedback(wordle_solver: WordleSolver):
+    wordle_solver.add_feedback("arise", parse_feedback("ggggy"))
+    assert wordle_solver.get_possible_words() == {"hello", "melon"}
+    assert wordle_solver._clues == get_clues("arise", "melon")
+
+
+def test_transposition_cache(pattern_matrix: PatternMatrix, wordle_solver: WordleSolver):
+    cache = TranspositionCache()
+    cached_solver = WordleSolver(
+        candidate_lister=wordle_solver.candidate_lister,
+        search_space=wordle_solver.search_space,
+        verbose=False,
+        pattern_matrix=pattern_matrix,
+        transposition_cache=cache,
+    )
+    # Both histories leave the same possible words: "hello" and "melon"
+    cached_solver.add_feedback("arise", parse_feedback("ggggy"))
+    expected_word = cached_solver.get_next_word()
+    assert cache.get_statistics().misses == 1
+
+    cached_solver.reset()
+    cached_solver.add_feedback("grape", parse_feedback("ggggy"))
+    assert cached_solver.get_possible_words() == {"hello", "melon"}
+    assert cached_solver.get_next_word() == expected_word
+    assert cache.get_statistics().hits == 1
+
+    wordle_solver.add_feedback("arise", parse_feedback("ggggy"))
+    assert wordle_solver.get_next_word() == expected_word
+
+
+@pytest.mark.parametrize("first_guess,target", [("arise", "melon"), ("alive", "hello"), ("green", "hello")])
+def test_search_with_time_budget(
+    first_guess: str, target: str, wordle_solver: WordleSolver, pattern_wordle_solver: WordleSolver
+):
+    for solver in [wordle_solver, pattern_wordle_solver]:
+        solver.verbose = False
+        solver.add_clues(get_clues(first_guess, target))
+        expected_word = solver.get_next_word()
+        result = solver.search(time_budget=60)
+        assert result.completed
+        assert result.word == expected_word
+        possible_words = solver.get_possible_words()
+        distinct_candidates = get_distinct_guesses(sorted(solver.search_space.all_words), possible_words)
+        assert result.number_of_scored_candidates == len(distinct_candidates) + 1
+        assert solver.search().number_of_scored_candidates == len(distinct_candidates) + 1
+        assert solver.get_next_word(time_budget=60) == expected_word
+
+
+def test_search_with_expired_time_budget(wordle_solver: WordleSolver):
+    wordle_solver.verbose = False
+    result = wordle_solver.search(time_budget=0)
+    assert not result.completed
+    assert result.number_of_scored_candidates == 2
+    assert result.word in wordle_solver.search_space.all_words
+
+
+def test_search_without_scoring(wordle_solver: WordleSolver):
+    wordle_solver.add_clues(get_clues("hello", "hello"))
+    result = wordle_solver.search(time_budget=0)
+    assert (result.word, result.completed, result.number_of_scored_candidates) == ("hello", True, 0)
+
+
+@pytest.mark.parametrize("solver_name", ["wordle_solver", "pattern_wordle_solver"])
+def test_concurrent_queries(solver_name: str, all_words: set[str], request: pytest.FixtureRequest):
+    solver = request.getfixturevalue(solver_name)
+    solver.verbose = False
+    solver.add_feedback("arise", parse_feedback("ggggy"))
+    histories = [get_clues(guess, target) for guess in ["arise", "world"] for target in sorted(all_words)]
+    expected_words = []
+    for clues in histories:
+        expected_solver = solver.query(clues)
+        expected_words.append(expected_solver.get_next_word())
+
+    def _get_next_word(clues: list[Clue]) -> str:
+        return solver.query(clues).get_next_word()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert list(executor.map(_get_next_word, histories * 4)) == expected_words * 4
+    # The clues of the queries are not added to the solver they were created from
+    assert solver.get_possible_words() == {"hello", "melon"}
+    assert solver.query()._clues == []
+
+
+@pytest.mark.parametrize("solver_name", ["wordle_solver", "pattern_wordle_solver"])
+def test_get_next_words(
+    solver_name: str, all_words: set[str], pattern_matrix: PatternMatrix, request: pytest.FixtureRequest
+):
+    solver = request.getfixturevalue(solver_name)
+    solver.verbose = False
+    solver.transposition_cache = TranspositionCache()
+    histories = [[]] + [get_clues(guess, target) for guess in ["arise", "world"] for target in sorted(all_words)]
+    histories.append(get_clues("arise", "melon") + get_clues("hello", "melon"))
+    expected_words = [solver.query(clues).get_next_word() for clues in histories]
+    solver.transposition_cache = TranspositionCache()
+    assert solver.get_next_words(histories) == expected_words
+    # Each distinct set of possible words with more than one word is searched once
+    possible_sets = {frozenset(solver.query(clues).get_possible_words()) for clues in histories}
+    assert len(solver.transposition_cache) == sum(len(possible_words) > 1 for possible_words in possible_sets)
+    assert solver.get_next_words(histories) == expected_words
+    assert solver.get_next_words([]) == []
+
+
+def test_get_next_words_without_possible_words(pattern_wordle_solver: WordleSolver):
+    with pytest.raises(ValueError):
+        pattern_wordle_solver.get_next_words([get_clues("arise", "arise"), get_clues("arise", "zzzzz")])
+
+
+def _play_until_solved(solver: WordleSolver, first_guess: str, target: str) -> list[str]:
+    """Plays a game until the target is guessed, checking that every guess is new and narrows down the possible
+    words."""
+    solver.reset()
+    guesses = [first_guess]
+    possible_words = solver.get_possible_words()
+    while guesses[-1] != target:
+        solver.add_feedback(guesses[-1], get_feedback(guesses[-1], target))
+        assert len(solver.get_possible_words()) < len(possible_words), guesses
+        possible_words = solver.get_possible_words()
+        guesses.append(solver.get_next_word())
+        assert guesses[-1] not in guesses[:-1], guesses
+    return guesses
+
+
+@pytest.mark.parametrize("solver_name", ["wordle_solver", "pattern_wordle_solver"])
+def test_play_until_solved(solver_name: str, all_words: set[str], request: pytest.FixtureRequest):
+    solver = request.getfixturevalue(solver_name)
+    solver.verbose = False
+    # Most of the words have a repeated letter, whose yellow clues must be filtered as the patterns score them
+    for target in sorted(all_words):
+        assert len(_play_until_solved(solver, "arise", target)) <= len(all_words)
+
+
+def test_play_until_solved_with_repeated_letters(word_length: int):
+    # The last guesses of a game of the Spanish word list that used to repeat "aboba" forever
+    words = ["aboba", "abofa", "aireo", "asaba", "clico", "rugby", "zonto"]
+    pattern_matrix = PatternMatrix.from_words(words, word_length)
+    solver = WordleSolver(
+        candidate_lister=WordleIndex(words=words, word_length=word_length, cache=WordleCache()),
+        search_space=SearchSpace(all_words=set(words), groups=None),
+        verbose=False,
+        pattern_matrix=pattern_matrix,
+    )
+    for guess in ["aireo", "clico", "zonto", "asaba", "rugby"]:
+        solver.add_feedback(guess, get_feedback(guess, "abofa"))
+    # The yellow "b" of "asaba" rules out "aboba", which has a "b" in the same position
+    assert solver.get_possible_words() == {"abofa"}
+    for target in ["aboba", "abofa"]:
+        assert _play_until_solved(solver, "aireo", target)[-1] == target
+
+
+def test_position_key_version(monkeypatch: pytest.MonkeyPatch, wordle_solver: WordleSolver):
+    possible_words = {"hello", "melon"}
+    key = wordle_solver.get_position_key(possible_words)
+    assert wordle_solver.get_position_key(set(possible_words)) == key
+    # The results stored by a previous version of the scoring are never looked up
+    monkeypatch.setattr("wordle_solver.solver.POSITION_KEY_VERSION", 1)
+    assert wordle_solver.get_position_key(possible_words) != key
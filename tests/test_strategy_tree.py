@@ -0,0 +1,125 @@
+import gzip
+import json
+from typing import Callable
+
+import pytest
+
+from wordle_solver.cache import POSITION_KEY_VERSION
+from wordle_solver.clue import encode_feedback, format_feedback, get_clues
+from wordle_solver.simulation import play_game
+from wordle_solver.solver import WordleSolver
+from wordle_solver.strategy_tree import (
+    TREE_VERSION,
+    StrategyNode,
+    StrategyTree,
+    build_strategy_tree,
+    split_guesses,
+)
+
+
+@pytest.fixture
+def strategy_tree(solver_factory: Callable[[], WordleSolver], all_words: set[str], word_length: int) -> StrategyTree:
+    return build_strategy_tree(solver_factory, sorted(all_words), word_length, "arise")
+
+
+def test_split_guesses():
+    clues = get_clues("arise", "apple") + get_clues("apple", "apple")
+    assert split_guesses(clues, 5) == [("arise", 2 + 2 * 81), ("apple", 242)]
+    assert split_guesses(clues[:4], 5) is None
+    assert split_guesses(clues[1:] + clues[:1], 5) is None
+
+
+def test_strategy_tree_matches_live_search(
+    solver_factory: Callable[[], WordleSolver], all_words: set[str], strategy_tree: StrategyTree
+):
+    solver = solver_factory()
+    tree_solver = solver_factory()
+    tree_solver.strategy_tree = strategy_tree
+    for target in sorted(all_words):
+        result = play_game(solver, target, "arise")
+        assert play_game(tree_solver, target, "arise").guesses == result.guesses
+        clues = []
+        for guess, next_guess in zip(result.guesses, result.guesses[1:]):
+            clues += get_clues(guess, target)
+            assert strategy_tree.get_next_word(clues) == next_guess
+
+
+def test_strategy_tree_off_tree(strategy_tree: StrategyTree, clue_factory):
+    assert strategy_tree.get_next_word([]) == "arise"
+    assert strategy_tree.get_next_word(get_clues("hello", "apple")) is None
+    assert strategy_tree.get_next_word([clue_factory(0, "a", True, True)]) is None
+
+
+def test_build_strategy_tree_without_progress(
+    solver_factory: Callable[[], WordleSolver], all_words: set[str], word_length: int
+):
+    def _create_stuck_solver():
+        # A filter that ignores the clues never narrows down the possible words to the targets of a feedback
+        solver = solver_factory()
+        solver.get_possible_words = lambda: set(all_words)
+        return solver
+
+    with pytest.raises(ValueError):
+        build_strategy_tree(_create_stuck_solver, sorted(all_words), word_length, "arise")
+
+
+def test_save_and_load_strategy_tree(tmp_path, all_words: set[str], strategy_tree: StrategyTree):
+    path = str(tmp_path / "tree.json.gz")
+    strategy_tree.save(path)
+    loaded_tree = StrategyTree.load(path, sorted(all_words), strategy_tree.search_space_key)
+    assert loaded_tree.root == strategy_tree.root
+    assert len(loaded_tree) == len(strategy_tree)
+    with pytest.raises(ValueError):
+        StrategyTree.load(path, sorted(all_words)[1:], strategy_tree.search_space_key)
+    with pytest.raises(ValueError):
+        StrategyTree.load(path, sorted(all_words), "other search space")
+
+
+@pytest.mark.parametrize("header", [{"version": TREE_VERSION - 1}, {"position_key_version": POSITION_KEY_VERSION - 1}])
+def test_load_strategy_tree_with_stale_header(tmp_path, all_words: set[str], strategy_tree: StrategyTree, header: dict):
+    path = str(tmp_path / "tree.json.gz")
+    strategy_tree.save(path)
+    with gzip.open(path, "rt") as file:
+        data = json.load(file)
+    with gzip.open(path, "wt") as file:
+        json.dump({**data, **header}, file)
+    # A tree built before a change to the solver must not answer for the current one
+    with pytest.raises(ValueError):
+        StrategyTree.load(path, sorted(all_words), strategy_tree.search_space_key)
+
+
+def test_build_strategy_tree_in_parallel(
+    solver_factory: Callable[[], WordleSolver], all_words: set[str], word_length: int, strategy_tree: StrategyTree
+):
+    tree = build_strategy_tree(solver_factory, sorted(all_words), word_length, "arise", n_workers=2)
+    assert tree.root == strategy_tree.root
+
+
+def test_strategy_node_to_list():
+    node = StrategyNode("arise", {81: StrategyNode("hello"), 3: StrategyNode("green", {0: StrategyNode("other")})})
+    assert node.to_list() == ["arise", [[3, ["green", [[0, ["other", []]]]]], [81, ["hello", []]]]]
+    assert StrategyNode.from_list(node.to_list()) == node
+    assert len(node) == 4
+
+
+def test_second_guesses_match_live_search(
+    solver_factory: Callable[[], WordleSolver], all_words: set[str], word_length: int, strategy_tree: StrategyTree
+):
+    second_guesses = {"arise": strategy_tree.get_second_guesses()}
+    solver = solver_factory()
+    lookup_solver = solver_factory()
+    lookup_solver.second_guesses = second_guesses
+    for target in sorted(all_words - {"arise"}):
+        clues = get_clues("arise", target)
+        solver.reset()
+        solver.add_clues(clues)
+        lookup_solver.reset()
+        lookup_solver.add_clues(clues)
+        assert format_feedback(encode_feedback(clues), word_length) in second_guesses["arise"]
+        assert lookup_solver.get_next_word() == solver.get_next_word()
+
+    lookup_solver.second_guesses = {"arise": {}}
+    for current_solver in [solver, lookup_solver]:
+        current_solver.reset()
+        current_solver.add_clues(get_clues("arise", "melon"))
+    assert lookup_solver.get_next_word() == solver.get_next_word()
@@ -1,8 +1,12 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import Callable
 
 import pytest
 
-from wordle_solver.clue import Clue
+from wordle_solver.cache import WordleCache
+from wordle_solver.clue import Clue, get_clues, get_feedback
+from wordle_solver.constraints import ConstraintIndex
+from wordle_solver.patterns import PatternMatrix
 from wordle_solver.wordle_index import WordleIndex
 
 
@@ -10,8 +14,7 @@ from wordle_solver.wordle_index import WordleIndex
     "clue_position,clue_character,in_word,correct_position,expected_valid_words",
     [
         (0, "a", True, True, {"apple", "awake", "alive", "arise"}),
-        # TODO: Fix the expected value so that "awake" is not included in the set.
-        (0, "a", True, False, {"awake", "happy", "grape", "peach"}),
+        (0, "a", True, False, {"happy", "grape", "peach"}),
         (4, "o", True, True, {"hello"}),
         (0, "z", True, True, set()),
         (0, "a", False, False, {"hello", "world", "melon", "other", "green"}),
@@ -86,8 +89,7 @@ def test_add_clue(
             ["z", "g", "e"],
             [False, True, True],
             [False, True, False],
-            # TODO: Fix this so that "green" is not included in the set.
-            {"grape", "green"},
+            {"grape"},
         ),
         (
             [0, 0, 4],
@@ -120,3 +122,125 @@ def test_add_clues(
     assert wordle_index.get_all_words() == all_words
     wordle_index.reset_clues()
     assert wordle_index.get_possible_words() == all_words
+
+
+def test_push_and_pop_state(
+    all_words: set[str],
+    word_length: int,
+    clue_factory: Callable[[int, str, bool, bool], Clue],
+    wordle_index_factory: Callable[[list[str], int], WordleIndex],
+):
+    wordle_index = wordle_index_factory(list(all_words), word_length)
+    wordle_index.add_clue(clue_factory(0, "a", True, True))
+    committed_words = {"apple", "awake", "alive", "arise"}
+
+    wordle_index.push_state()
+    wordle_index.add_clue(clue_factory(4, "e", True, True))
+    wordle_index.add_clue(clue_factory(1, "p", True, True))
+    assert wordle_index.get_possible_words() == {"apple"}
+
+    wordle_index.push_state()
+    wordle_index.add_clue(clue_factory(2, "z", False, False))
+    assert wordle_index.get_possible_words() == {"apple"}
+    wordle_index.pop_state()
+    wordle_index.pop_state()
+    assert wordle_index.get_possible_words() == committed_words
+
+    # A grey clue for an observed character only excludes its position, so the observed characters must be restored
+    wordle_index.push_state()
+    wordle_index.add_clue(clue_factory(1, "r", True, False))
+    wordle_index.pop_state()
+    wordle_index.add_clue(clue_factory(0, "r", False, False))
+    assert wordle_index.get_possible_words() == {"apple", "awake", "alive"}
+
+
+def test_pop_state_without_push(
+    all_words: set[str], word_length: int, wordle_index_factory: Callable[[list[str], int], WordleIndex]
+):
+    wordle_index = wordle_index_factory(list(all_words), word_length)
+    with pytest.raises(ValueError):
+        wordle_index.pop_state()
+
+
+@pytest.mark.parametrize(
+    "guess,target", [("arise", "melon"), ("peach", "apple"), ("hello", "world"), ("green", "other")]
+)
+def test_add_feedback_matches_add_clues(
+    guess: str,
+    target: str,
+    all_words: set[str],
+    word_length: int,
+    wordle_index_factory: Callable[[list[str], int], WordleIndex],
+):
+    wordle_index = wordle_index_factory(sorted(all_words), word_length)
+    wordle_index.add_clues(get_clues(guess, target))
+    expected_valid_words = wordle_index.get_possible_words()
+    wordle_index.reset_clues()
+    wordle_index.add_feedback(guess, get_feedback(guess, target))
+    assert wordle_index.get_possible_words() == expected_valid_words
+
+
+@pytest.mark.parametrize("constraint_filter", [False, True])
+def test_feedback_filter_matches_patterns(
+    all_words: set[str],
+    word_length: int,
+    wordle_index_factory: Callable[[list[str], int], WordleIndex],
+    constraint_filter: bool,
+):
+    # The possible words after each feedback must be the targets that give the same pattern, which the solver scores
+    if constraint_filter:
+        wordle_index = ConstraintIndex(sorted(all_words), word_length)
+    else:
+        wordle_index = wordle_index_factory(sorted(all_words), word_length)
+    pattern_matrix = PatternMatrix.from_words(sorted(all_words), word_length)
+    for first_guess in sorted(all_words):
+        for target in sorted(all_words):
+            history = [first_guess, "other", target]
+            query = wordle_index.query()
+            expected_valid_words = set(all_words)
+            for guess in history:
+                feedback = pattern_matrix.get_pattern(guess, target)
+                query.add_feedback(guess, feedback)
+                expected_valid_words = {
+                    word for word in expected_valid_words if pattern_matrix.get_pattern(guess, word) == feedback
+                }
+                assert query.get_possible_words() == expected_valid_words, (history, target)
+
+
+def test_wordle_index_with_invalid_postings(all_words: set[str], word_length: int):
+    with pytest.raises(ValueError):
+        WordleIndex(words=sorted(all_words), word_length=word_length, cache=WordleCache(), postings=[{}])
+
+
+def test_query(all_words: set[str], word_length: int, wordle_index_factory: Callable[[list[str], int], WordleIndex]):
+    wordle_index = wordle_index_factory(sorted(all_words), word_length)
+    wordle_index.add_clues(get_clues("arise", "melon"))
+    query = wordle_index.query(get_clues("peach", "apple"))
+    # The queries and the default clues of the index do not see each other's clues
+    assert wordle_index.get_possible_words() == {"hello", "melon"}
+    assert wordle_index.query().get_possible_words() == all_words
+    query.add_feedback("hello", get_feedback("hello", "apple"))
+    expected_index = wordle_index_factory(sorted(all_words), word_length)
+    expected_index.add_clues(get_clues("peach", "apple") + get_clues("hello", "apple"))
+    assert query.get_possible_words() == expected_index.get_possible_words()
+    assert wordle_index.get_possible_words() == {"hello", "melon"}
+    assert query.query().get_possible_words() == all_words
+
+
+def test_concurrent_queries(
+    all_words: set[str], word_length: int, wordle_index_factory: Callable[[list[str], int], WordleIndex]
+):
+    wordle_index = wordle_index_factory(sorted(all_words), word_length)
+    pairs = [(guess, target) for guess in sorted(all_words) for target in sorted(all_words)]
+
+    def _filter(pair: tuple[str, str]) -> set[str]:
+        guess, target = pair
+        return wordle_index.query(get_clues(guess, target)).get_possible_words()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(_filter, pairs * 4))
+    expected_index = wordle_index_factory(sorted(all_words), word_length)
+    for (guess, target), possible_words in zip(pairs * 4, results):
+        expected_index.reset_clues()
+        expected_index.add_clues(get_clues(guess, target))
+        assert possible_words == expected_index.get_possible_words()
@@ -0,0 +1,262 @@
+import contextlib
+import io
+import json
+import os
+import random
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Callable, Optional
+
+from wordle_solver.cache import WordleCache
+from wordle_solver.clue import Clue, get_clues
+from wordle_solver.simulation import load_solver
+from wordle_solver.solver import WordleSolver
+from wordle_solver.wordle_index import WordleIndex
+
+BENCHMARKS = ["index_build", "single_clue_filter", "next_word", "group_build"]
+# Fraction by which a benchmark can be slower, or use more memory, than its baseline before it is flagged
+DEFAULT_TOLERANCE = 0.25
+# Differences in peak memory below this number of bytes are never flagged, since they are mostly noise
+MIN_MEMORY_DIFFERENCE = 1 << 20
+MAX_GROUPS = 100
+
+
+@dataclass
+class BenchmarkResult:
+    """The measurements of a single benchmark.
+
+    Attributes:
+        name: The name of the benchmark.
+        language: The language of the word list used in the benchmark.
+        operations: The number of operations done in each run of the benchmark.
+        seconds: The wall time of the fastest run.
+        peak_memory_bytes: The peak memory allocated during a run, as traced by `tracemalloc`.
+    """
+
+    name: str
+    language: str
+    operations: int
+    seconds: float
+    peak_memory_bytes: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.language}/{self.name}"
+
+    @property
+    def operations_per_second(self) -> float:
+        return self.operations / self.seconds if self.seconds > 0 else float("inf")
+
+
+@dataclass
+class Regression:
+    """A metric of a benchmark that is worse than its baseline by more than the tolerance."""
+
+    key: str
+    metric: str
+    baseline: float
+    current: float
+
+    def __str__(self) -> str:
+        change = (self.current - self.baseline) / self.baseline if self.baseline else float("inf")
+        return f"{self.key}: {self.metric} went from {self.baseline:.4g} to {self.current:.4g} ({change:+.1%})"
+
+
+def measure(
+    name: str, language: str, function: Callable[[], None], operations: int, repeat: int = 3
+) -> BenchmarkResult:
+    """Runs the function `repeat` times and keeps the fastest run, then runs it once more to trace its peak memory.
+
+    The memory is traced in a separate run, since `tracemalloc` slows down every allocation.
+    """
+    seconds = float("inf")
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        function()
+        seconds = min(seconds, time.perf_counter() - start_time)
+
+    tracemalloc.start()
+    try:
+        function()
+        _, peak_memory_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return BenchmarkResult(name, language, operations, seconds, peak_memory_bytes)
+
+
+def _get_histories(
+    solver: WordleSolver, targets: list[str], first_guess: str, number_of_turns: int
+) -> list[list[list[Clue]]]:
+    """Plays the games against the targets, and returns the clues of the unsolved games before each turn.
+
+    Every game starts without clues, so the history of the first turn is a single empty one.
+    """
+    histories = [[[]]]
+    clues = [get_clues(first_guess, target) for target in targets if target != first_guess]
+    targets = [target for target in targets if target != first_guess]
+    for _ in range(number_of_turns - 1):
+        histories.append(clues)
+        guesses = solver.get_next_words(clues)
+        unsolved = [index for index, (guess, target) in enumerate(zip(guesses, targets)) if guess != target]
+        clues = [clues[index] + get_clues(guesses[index], targets[index]) for index in unsolved]
+        targets = [targets[index] for index in unsolved]
+    return histories
+
+
+def run_benchmarks(
+    language: str,
+    static_directory: str = "static",
+    word_length: int = 5,
+    benchmarks: Optional[list[str]] = None,
+    number_of_clues: int = 1000,
+    number_of_games: int = 20,
+    number_of_turns: int = 3,
+    repeat: int = 3,
+    seed: int = 0,
+) -> list[BenchmarkResult]:
+    """Runs the benchmarks of the hot paths of the solver against the word list of a language.
+
+    - `index_build` builds a `WordleIndex` from the word list.
+    - `single_clue_filter` lists the possible words for each of `number_of_clues` random single clues, starting
+      from an empty cache.
+    - `next_word_turn_<n>` searches for the `n`-th guess (without any precomputed strategy or transposition cache) in
+      `number_of_games` random games, after `n - 1` guesses that start with the optimal start and follow the solver.
+      The first guess is searched without clues, which is the same search for every game, so it is measured once.
+    - `group_build` builds the groups of the `SearchSpace` with `group_by_overlapping_characters`.
+
+    Args:
+        language:
+            The language of the word list in `static_directory`.
+        benchmarks:
+            The names of the benchmarks to run, out of `BENCHMARKS`. All of them are run by default.
+        repeat:
+            The number of timed runs of each benchmark, of which the fastest is reported.
+        seed:
+            The seed used to sample the clues and the targets, so that every run does the same work.
+
+    Returns:
+        The result of each benchmark.
+    """
+    benchmarks = BENCHMARKS if benchmarks is None else benchmarks
+    with open(os.path.join(static_directory, f"wordlist_{language}.txt"), "r") as file:
+        words = file.read().splitlines()
+    generator = random.Random(seed)
+    results = []
+
+    if "index_build" in benchmarks:
+        results.append(
+            measure(
+                "index_build",
+                language,
+                lambda: WordleIndex(words=words, word_length=word_length, cache=WordleCache()),
+                operations=1,
+                repeat=repeat,
+            )
+        )
+
+    if "single_clue_filter" in benchmarks:
+        wordle_index = WordleIndex(words=words, word_length=word_length, cache=WordleCache())
+        clues = []
+        for _ in range(number_of_clues):
+            word = generator.choice(words)
+            position = generator.randrange(word_length)
+            digit = generator.randrange(3)
+            clues.append(Clue(position, word[position], in_word=digit > 0, correct_position=digit == 2))
+
+        def _filter():
+            wordle_index.cache.clear()
+            for clue in clues:
+                wordle_index.query([clue]).get_possible_words()
+
+        results.append(measure("single_clue_filter", language, _filter, operations=len(clues), repeat=repeat))
+
+    if "next_word" in benchmarks:
+        solver, optimal_start = load_solver(
+            language, static_directory=static_directory, word_length=word_length, precomputed=False
+        )
+        targets = generator.sample(words, number_of_games)
+        # The games are played with `get_next_words`, which also loads the pattern matrix before it is measured
+        for turn, histories in enumerate(_get_histories(solver, targets, optimal_start, number_of_turns), start=1):
+            if not histories:
+                break
+
+            def _search(histories: list[list[Clue]] = histories):
+                for clues in histories:
+                    solver.query(clues).get_next_word()
+
+            results.append(
+                measure(f"next_word_turn_{turn}", language, _search, operations=len(histories), repeat=repeat)
+            )
+
+    if "group_build" in benchmarks:
+        # Imported here, as in `main.py`, since the groups are usually loaded from disk
+        from wordle_solver.filters import group_by_overlapping_characters
+
+        def _group():
+            # The progress of the grouping is not shown, so that it does not mix with the report
+            with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+                group_by_overlapping_characters(words, max_groups=MAX_GROUPS)
+
+        results.append(measure("group_build", language, _group, operations=1, repeat=repeat))
+    return results
+
+
+def load_baseline(path: str) -> dict[str, dict]:
+    """Loads the baseline results saved with `save_baseline`, or an empty baseline if the file does not exist."""
+    if not os.path.exists(path):
+        return dict()
+    with open(path, "r") as file:
+        return json.load(file)
+
+
+def save_baseline(path: str, results: list[BenchmarkResult], baseline: Optional[dict[str, dict]] = None):
+    """Saves the results as the new baseline, keeping the entries of `baseline` for the benchmarks that were not run."""
+    baseline = dict(baseline or dict())
+    for result in results:
+        baseline[result.key] = {**asdict(result), "operations_per_second": result.operations_per_second}
+    with open(path, "w") as file:
+        json.dump(dict(sorted(baseline.items())), file, indent=2)
+        file.write("\n")
+
+
+def compare_to_baseline(
+    results: list[BenchmarkResult], baseline: dict[str, dict], tolerance: float = DEFAULT_TOLERANCE
+) -> list[Regression]:
+    """Returns the benchmarks that are slower, or use more memory, than their baseline by more than the tolerance.
+
+    The benchmarks without a baseline are never flagged.
+    """
+    regressions = []
+    for result in results:
+        expected = baseline.get(result.key)
+        if expected is None:
+            continue
+        if result.operations_per_second < expected["operations_per_second"] * (1 - tolerance):
+            regressions.append(
+                Regression(
+                    result.key, "operations_per_second", expected["operations_per_second"], result.operations_per_second
+                )
+            )
+        memory_difference = result.peak_memory_bytes - expected["peak_memory_bytes"]
+        if memory_difference > max(MIN_MEMORY_DIFFERENCE, expected["peak_memory_bytes"] * tolerance):
+            regressions.append(
+                Regression(result.key, "peak_memory_bytes", expected["peak_memory_bytes"], result.peak_memory_bytes)
+            )
+    return regressions
+
+
+def format_results(results: list[BenchmarkResult], baseline: Optional[dict[str, dict]] = None) -> str:
+    """Formats the results as a table, with the change of the operations per second with respect to the baseline."""
+    baseline = baseline or dict()
+    lines = [f"{'benchmark':<28} {'ops/sec':>12} {'peak memory':>14} {'vs baseline':>12}"]
+    for result in results:
+        expected = baseline.get(result.key)
+        change = ""
+        if expected is not None:
+            change = f"{result.operations_per_second / expected['operations_per_second'] - 1:+.1%}"
+        lines.append(
+            f"{result.key:<28} {result.operations_per_second:>12.2f} "
+            f"{result.peak_memory_bytes / (1 << 20):>11.1f} MiB {change:>12}"
+        )
+    return "\n".join(lines)
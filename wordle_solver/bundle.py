@@ -0,0 +1,219 @@
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from typing import Iterator, Mapping, Optional
+
+import numpy as np
+
+from wordle_solver.cache import Cache
+from wordle_solver.pattern_store import get_wordlist_key
+from wordle_solver.patterns import encode_letters
+from wordle_solver.search_space import SearchSpace
+from wordle_solver.wordle_index import WordleIndex
+
+BUNDLE_MAGIC = b"WORDLEBUNDLE"
+BUNDLE_VERSION = 2
+# Offset alignment of the arrays in the bundle, so that they can be memory-mapped with any dtype
+BUNDLE_ALIGNMENT = 64
+
+
+class BundlePostings(Mapping[str, int]):
+    """The postings of one position of a bundle, as a read-only mapping from each character to the bitset of the words
+    with that character at the position.
+
+    The bitsets stay in the memory-mapped file until they are requested, and each one is converted to a Python integer
+    the first time it is used, so loading a bundle does not read its postings.
+    """
+
+    def __init__(self, alphabet: list[str], packed_bitsets: np.ndarray):
+        self._rows = {character: row for row, character in enumerate(alphabet)}
+        self._packed_bitsets = packed_bitsets
+        self._bitsets: dict[str, int] = dict()
+
+    def __getitem__(self, character: str) -> int:
+        bitset = self._bitsets.get(character)
+        if bitset is None:
+            bitset = int.from_bytes(self._packed_bitsets[self._rows[character]].tobytes(), "little")
+            self._bitsets[character] = bitset
+        return bitset
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+
+@dataclass
+class WordlistBundle:
+    """Everything needed to start the solver for a word list, loaded from a single binary file.
+
+    Attributes:
+        words: The list of valid words for the game, in the order used for the document IDs of the index.
+        word_length: The length of the words in the list.
+        groups: The groups of similar words used by the `SearchSpace`, if any.
+        postings: For each position, the bitset of the words that have each character at that position.
+    """
+
+    words: list[str]
+    word_length: int
+    groups: Optional[dict[str, set[str]]]
+    postings: list[Mapping[str, int]]
+
+    def get_wordle_index(self, cache: Cache) -> WordleIndex:
+        """Creates a `WordleIndex` from the precomputed postings, without indexing the words one by one."""
+        return WordleIndex(words=self.words, word_length=self.word_length, cache=cache, postings=self.postings)
+
+    def get_search_space(self) -> SearchSpace:
+        """Creates the `SearchSpace` for the words and groups of the bundle."""
+        return SearchSpace(all_words=set(self.words), groups=self.groups)
+
+
+def _get_arrays(words: list[str], word_length: int, groups: Optional[dict[str, set[str]]]) -> dict[str, np.ndarray]:
+    """Packs the words, groups and postings into the arrays stored in a bundle."""
+    # Repeated words only get a document ID the first time they are seen, so they are not stored
+    words = list(dict.fromkeys(words))
+    letters, alphabet = encode_letters(words, word_length)
+    # The postings are stored as the bitsets used by `DocumentIds`, i.e. little-endian bits packed in bytes
+    postings = np.packbits(letters.T[:, None, :] == np.arange(len(alphabet))[None, :, None], axis=2, bitorder="little")
+    arrays = {
+        "words": np.array(words, dtype=f"<U{word_length}"),
+        "alphabet": np.array(alphabet, dtype="<U1"),
+        "postings": postings,
+    }
+    if groups is not None:
+        word_ids = {word: index for index, word in enumerate(words)}
+        if any(word not in word_ids for key, group in groups.items() for word in [key, *group]):
+            raise ValueError("The groups can only contain words from the word list.")
+        members = [[word_ids[word] for word in sorted(group)] for group in groups.values()]
+        arrays["group_keys"] = np.array([word_ids[key] for key in groups], dtype=np.int32)
+        arrays["group_offsets"] = np.cumsum([0] + [len(group) for group in members], dtype=np.int64)
+        arrays["group_members"] = np.array([index for group in members for index in group], dtype=np.int32)
+    return arrays
+
+
+def get_file_key(path: str) -> Optional[str]:
+    """Returns a short hash of the contents of a file, or `None` if it does not exist."""
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()[:16]
+
+
+def save_bundle(
+    path: str,
+    words: list[str],
+    word_length: int,
+    groups: Optional[dict[str, set[str]]] = None,
+    groups_key: Optional[str] = None,
+):
+    """Saves the words, the groups and the index postings of a word list to a binary bundle.
+
+    The file starts with `BUNDLE_MAGIC`, the length of a JSON header and the header itself, which contains the version
+    of the format, the keys of the words and the groups (see `is_bundle_stale`) and the offset, dtype and shape of each
+    of the arrays that follow it. The file is written to a temporary path first, so that a partially written bundle is
+    never loaded.
+
+    Args:
+        groups_key:
+            The key of the file the groups were loaded from (see `get_file_key`), if any.
+    """
+    arrays = _get_arrays(words, word_length, groups)
+    layout = dict()
+    offset = 0
+    for name, array in arrays.items():
+        layout[name] = {"offset": offset, "dtype": array.dtype.str, "shape": list(array.shape)}
+        offset += -(-array.nbytes // BUNDLE_ALIGNMENT) * BUNDLE_ALIGNMENT
+    header = json.dumps(
+        {
+            "version": BUNDLE_VERSION,
+            "word_length": word_length,
+            "wordlist_key": get_wordlist_key(words, word_length),
+            "groups_key": groups_key,
+            "arrays": layout,
+        }
+    ).encode()
+    prefix_size = len(BUNDLE_MAGIC) + 8 + len(header)
+    data_offset = -(-prefix_size // BUNDLE_ALIGNMENT) * BUNDLE_ALIGNMENT
+
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(BUNDLE_MAGIC)
+        file.write(len(header).to_bytes(8, "little"))
+        file.write(header)
+        for name, array in arrays.items():
+            file.seek(data_offset + layout[name]["offset"])
+            file.write(np.ascontiguousarray(array).tobytes())
+    os.replace(temporary_path, path)
+
+
+def _read_header(path: str) -> tuple[dict, int]:
+    """Reads the header of a bundle, and returns it with the offset of the arrays.
+
+    Raises:
+        ValueError: If the file is not a bundle or was saved with another version of the format.
+    """
+    with open(path, "rb") as file:
+        if file.read(len(BUNDLE_MAGIC)) != BUNDLE_MAGIC:
+            raise ValueError(f"The file {path} is not a word list bundle.")
+        header_size = int.from_bytes(file.read(8), "little")
+        header = json.loads(file.read(header_size))
+    if header["version"] != BUNDLE_VERSION:
+        raise ValueError(
+            f"The bundle {path} has version {header['version']}, but version {BUNDLE_VERSION} is required."
+        )
+    return header, -(-(len(BUNDLE_MAGIC) + 8 + header_size) // BUNDLE_ALIGNMENT) * BUNDLE_ALIGNMENT
+
+
+def load_bundle(path: str) -> WordlistBundle:
+    """Loads a bundle saved with `save_bundle` by memory-mapping its arrays.
+
+    Only the words and the groups are converted to Python objects, and the postings are read when they are first used
+    (see `BundlePostings`).
+
+    Raises:
+        ValueError: If the file is not a bundle or was saved with another version of the format.
+    """
+    header, data_offset = _read_header(path)
+
+    arrays = dict()
+    for name, layout in header["arrays"].items():
+        shape = tuple(layout["shape"])
+        if 0 in shape:
+            arrays[name] = np.empty(shape, dtype=layout["dtype"])
+        else:
+            arrays[name] = np.memmap(
+                path, dtype=layout["dtype"], mode="r", offset=data_offset + layout["offset"], shape=shape
+            )
+
+    words = arrays["words"].tolist()
+    alphabet = arrays["alphabet"].tolist()
+    postings = [BundlePostings(alphabet, position_postings) for position_postings in arrays["postings"]]
+    groups = None
+    if "group_keys" in arrays:
+        offsets = arrays["group_offsets"].tolist()
+        members = arrays["group_members"].tolist()
+        groups = {
+            words[key]: {words[index] for index in members[start:end]}
+            for key, start, end in zip(arrays["group_keys"].tolist(), offsets, offsets[1:])
+        }
+    return WordlistBundle(words=words, word_length=header["word_length"], groups=groups, postings=postings)
+
+
+def is_bundle_stale(path: str, words: list[str], word_length: int, groups_path: Optional[str] = None) -> bool:
+    """Returns whether the bundle must be rebuilt, because it is missing, it was saved with another version of the
+    format, or it was built from other words or groups.
+
+    The words are compared by their `get_wordlist_key`, and the groups by the key of the file at `groups_path` (see
+    `get_file_key`), so a bundle is never reused for a different word list, whatever the modification times of the
+    files are.
+    """
+    if not os.path.exists(path):
+        return True
+    try:
+        header, _ = _read_header(path)
+    except ValueError:
+        return True
+    groups_key = get_file_key(groups_path) if groups_path is not None else None
+    return header["wordlist_key"] != get_wordlist_key(words, word_length) or header["groups_key"] != groups_key
@@ -1,11 +1,24 @@
+import sqlite3
+import sys
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Generic, Optional, Protocol, TypeVar
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Generic, Hashable, Optional, Protocol, TypeVar, Union
 
 from wordle_solver.clue import Clue
 
 KT = TypeVar("KT", contravariant=True)
 VT = TypeVar("VT")
 
+# A clue as `(position, character, digit)`, where the digit is the one used by `encode_feedback`
+ClueKey = tuple[int, str, int]
+# Version of the searches stored in the transposition cache, which is part of their key. It must be increased whenever
+# a change to the scoring or the filtering of the words can change the next word of a position, so that the results of
+# the previous versions (e.g. in a persistent cache) are never reused.
+POSITION_KEY_VERSION = 2
+
 
 class Cache(Protocol[KT, VT]):
     """Interface for a generic cache."""
@@ -19,30 +32,235 @@ class Cache(Protocol[KT, VT]):
         ...
 
 
+@dataclass
+class CacheStatistics:
+    """Counters describing how a cache has been used.
+
+    Attributes:
+        hits: Number of `get` calls that found a value.
+        misses: Number of `get` calls that did not find a value.
+        evictions: Number of values removed to keep the cache within its budget.
+        entries: Number of values currently stored.
+        bytes: Estimated size of the values currently stored, in bytes (see `InMemoryCache._get_size`).
+        encoding_seconds: Total time spent encoding keys, which is only measured if the cache was created with
+            `time_encoding`.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    bytes: int = 0
+    encoding_seconds: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of the `get` calls that found a value."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
 class InMemoryCache(ABC, Generic[KT, VT]):
-    """Implementation for a cache that stored the values in memory."""
+    """Implementation for a cache that stored the values in memory.
+
+    When `max_entries` or `max_bytes` is set, the least recently used values are evicted once the cache grows beyond
+    either of them, so the cache can be kept in long-running processes. The cache can be shared between threads, since
+    every access holds a lock.
+
+    Args:
+        max_entries: Maximum number of values to keep, or `None` to keep every value.
+        max_bytes: Maximum total size of the values to keep, as estimated by `_get_size`, or `None` for no limit. A
+            value larger than the budget is not kept.
+        time_encoding: Whether the time spent encoding the keys is added to the statistics. It is off by default, since
+            timing every access costs about as much as encoding a key.
+    """
 
-    def __init__(self):
-        self._cache = dict()
+    def __init__(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None, time_encoding: bool = False):
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("The maximum number of entries must be at least 1.")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError("The maximum number of bytes must be at least 1.")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.time_encoding = time_encoding
+        self._cache: OrderedDict[Hashable, VT] = OrderedDict()
+        self._bytes = 0
+        self._statistics = CacheStatistics()
+        self._lock = threading.Lock()
 
     @abstractmethod
-    def _encode(self, key: KT) -> str:
-        """Encodes the key to a string that will be used to store in the cache."""
+    def _encode(self, key: KT) -> Hashable:
+        """Encodes the key to a hashable value that will be used to store in the cache."""
         raise NotImplementedError("The `_encode` method must be implemented in the cache.")
 
+    def _get_size(self, value: VT) -> int:
+        """Estimates the size of a value in bytes, which is counted towards `max_bytes`."""
+        return sys.getsizeof(value)
+
+    def _timed_encode(self, key: KT) -> Hashable:
+        """Encodes the key, adding the time spent to the statistics if `time_encoding` is set."""
+        if not self.time_encoding:
+            return self._encode(key)
+        start = time.perf_counter()
+        encoded_key = self._encode(key)
+        self._statistics.encoding_seconds += time.perf_counter() - start
+        return encoded_key
+
+    def set(self, key: KT, value: VT):
+        """Sets a value in the cache."""
+        with self._lock:
+            encoded_key = self._timed_encode(key)
+            previous_value = self._cache.get(encoded_key)
+            if previous_value is not None:
+                self._bytes -= self._get_size(previous_value)
+            self._cache[encoded_key] = value
+            self._cache.move_to_end(encoded_key)
+            self._bytes += self._get_size(value)
+            while (self.max_entries is not None and len(self._cache) > self.max_entries) or (
+                self.max_bytes is not None and self._bytes > self.max_bytes
+            ):
+                _, evicted_value = self._cache.popitem(last=False)
+                self._bytes -= self._get_size(evicted_value)
+                self._statistics.evictions += 1
+
+    def get(self, key: KT) -> Optional[VT]:
+        """Gets a value from the cache."""
+        with self._lock:
+            encoded_key = self._timed_encode(key)
+            value = self._cache.get(encoded_key)
+            if value is None:
+                self._statistics.misses += 1
+                return None
+            self._statistics.hits += 1
+            self._cache.move_to_end(encoded_key)
+            return value
+
+    def clear(self):
+        """Removes every value from the cache, keeping the statistics."""
+        with self._lock:
+            self._cache.clear()
+            self._bytes = 0
+
+    def get_statistics(self) -> CacheStatistics:
+        """Gets a snapshot of the usage statistics of the cache."""
+        with self._lock:
+            return replace(self._statistics, entries=len(self._cache), bytes=self._bytes)
+
+    def reset_statistics(self):
+        """Resets the usage statistics of the cache."""
+        with self._lock:
+            self._statistics = CacheStatistics()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+class TranspositionCache(InMemoryCache[str, str]):
+    """Cache implementation to store the next word for a position of the game, keyed by `WordleSolver` position keys."""
+
+    def _encode(self, key: str) -> str:
+        """The position keys are already compact strings, so they are used as they are."""
+        return key
+
+
+class SQLiteCache:
+    """Cache implementation that stores string values in a SQLite database, so that they persist across processes.
+
+    Each process opens its own connection to the database, which uses write-ahead logging so that several processes
+    can read and write it at the same time. The connection is shared by the threads of the process under a lock. When
+    `max_entries` is set, the least recently used values are evicted once the database grows beyond it.
+
+    Args:
+        path: The path of the database file.
+        max_entries: Maximum number of values to keep, or `None` to keep every value.
+    """
+
+    def __init__(self, path: str, max_entries: Optional[int] = None):
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("The maximum number of entries must be at least 1.")
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS cache_last_used ON cache (last_used)")
+
+    def set(self, key: str, value: str):
+        """Sets a value in the cache."""
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO cache (key, value, last_used) VALUES (?, ?, ?)", (key, value, time.time())
+            )
+            if self.max_entries is not None:
+                self._connection.execute(
+                    "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+
+    def get(self, key: str) -> Optional[str]:
+        """Gets a value from the cache."""
+        with self._lock:
+            row = self._connection.execute("SELECT value FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if self.max_entries is not None:
+                self._connection.execute("UPDATE cache SET last_used = ? WHERE key = ?", (time.time(), key))
+            return row[0]
+
+    def close(self):
+        """Closes the connection to the database."""
+        with self._lock:
+            self._connection.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+
+class LayeredCache(Generic[KT, VT]):
+    """Cache implementation that checks a list of caches in order, e.g. a small in-memory cache in front of a
+    `SQLiteCache`. The values found in a later cache are copied to the earlier ones, and new values are set in all of
+    them.
+
+    Args:
+        caches: The caches to use, from the fastest to the slowest.
+    """
+
+    def __init__(self, caches: list[Cache[KT, VT]]):
+        self.caches = caches
+
     def set(self, key: KT, value: VT):
         """Sets a value in the cache."""
-        self._cache[self._encode(key)] = value
+        for cache in self.caches:
+            cache.set(key, value)
 
     def get(self, key: KT) -> Optional[VT]:
         """Gets a value from the cache."""
-        return self._cache.get(self._encode(key), None)
+        for index, cache in enumerate(self.caches):
+            value = cache.get(key)
+            if value is not None:
+                for faster_cache in self.caches[:index]:
+                    faster_cache.set(key, value)
+                return value
+        return None
+
+
+class WordleCache(InMemoryCache[Union[Clue, ClueKey], int]):
+    """Cache implementation to store results from the Wordle clues, as bitsets of valid words.
 
+    The clues can be given either as `Clue` objects or directly as `ClueKey` tuples, which are stored as they are."""
 
-class WordleCache(InMemoryCache[Clue, set[str]]):
-    """Cache implementation to store results from the Wordle clues."""
+    def _encode(self, key: Union[Clue, ClueKey]) -> ClueKey:
+        """Encodes the clue to the tuple that will be used to store in the cache."""
+        if isinstance(key, tuple):
+            return key
+        return key.position, key.character, 2 if key.correct_position else 1 if key.in_word else 0
 
-    def _encode(self, key: Clue) -> str:
-        """Encodes the clue to a string that will be used to store in the cache."""
-        color = "G" if key.correct_position else "Y" if key.in_word else "R"
-        return f"{key.position}{key.character}{color}"
+    def _get_size(self, value: int) -> int:
+        """The size of a bitset is the number of bytes of its bits, which grows with the number of words."""
+        if not isinstance(value, int):
+            return super()._get_size(value)
+        return (value.bit_length() + 7) // 8
@@ -1,4 +1,4 @@
-from typing import Protocol
+from typing import Iterable, Protocol
 
 from wordle_solver.clue import Clue
 
@@ -14,6 +14,15 @@ class CandidateLister(Protocol):
         """Adds a set of clues to the list of clues."""
         ...
 
+    def add_feedback(self, guess: str, feedback: int):
+        """Adds the feedback of a guess, encoded as in `encode_feedback`."""
+        ...
+
+    def query(self, clues: Iterable[Clue] = ()) -> "CandidateLister":
+        """Returns a new candidate lister with only the given clues, which shares the words with this one, so that
+        several games can be filtered at the same time (e.g. one per thread) without copying the words."""
+        ...
+
     def get_possible_words(self) -> set[str]:
         """Returns the set of possible words given the current set of clues."""
         ...
@@ -25,3 +34,11 @@ class CandidateLister(Protocol):
     def reset_clues(self):
         """Reset the clues that were received by the index."""
         ...
+
+    def push_state(self):
+        """Saves a snapshot of the current clues, so that they can be restored with `pop_state`."""
+        ...
+
+    def pop_state(self):
+        """Restores the clues to the last snapshot saved with `push_state`."""
+        ...
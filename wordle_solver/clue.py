@@ -1,11 +1,106 @@
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Clue:
-    """Represents a single clue for a wordle puzzle."""
+    """Represents a single clue for a wordle puzzle.
+
+    Clues are only built at the edges (e.g. to show them or to walk a strategy tree): the solver and the indices work on
+    the feedback of a guess encoded as a single integer (see `get_feedback`).
+    """
 
     position: int
     character: str
     in_word: bool
     correct_position: bool
+
+
+def get_feedback(guess: str, target: str) -> int:
+    """Get the feedback for the given guess and target, encoded as in `encode_feedback`."""
+    feedback = 0
+    weight = 1
+    for index, character in enumerate(guess):
+        if character == target[index]:
+            feedback += 2 * weight
+        elif character in target:
+            feedback += weight
+        weight *= 3
+    return feedback
+
+
+def get_distinct_guesses(guesses: list[str], targets: set[str]) -> list[str]:
+    """Returns the first guess of each class of guesses that get the same feedback from every target.
+
+    Since the feedback of each position only depends on the character of the guess in that position, two guesses are
+    equivalent if, for every position, their characters get the same feedback from every target. Guesses that are
+    targets themselves are never grouped with guesses that are not, so that they keep their preference.
+
+    Args:
+        guesses:
+            The guesses to group, in the order in which the first guess of each class is chosen.
+        targets:
+            The possible targets.
+
+    Returns:
+        The first guess of each class, in the same order as `guesses`.
+    """
+    sorted_targets = sorted(targets)
+    column_ids: dict[tuple[int, str], int] = dict()
+    columns: dict[tuple[int, ...], int] = dict()
+    distinct_guesses = []
+    signatures = set()
+    for guess in guesses:
+        signature = [guess in targets]
+        for position, character in enumerate(guess):
+            column_id = column_ids.get((position, character))
+            if column_id is None:
+                column = tuple(
+                    2 if target[position] == character else 1 if character in target else 0 for target in sorted_targets
+                )
+                column_id = columns.setdefault((position, *column), len(columns))
+                column_ids[(position, character)] = column_id
+            signature.append(column_id)
+        signature = tuple(signature)
+        if signature not in signatures:
+            signatures.add(signature)
+            distinct_guesses.append(guess)
+    return distinct_guesses
+
+
+def decode_feedback(guess: str, feedback: int) -> list[Clue]:
+    """Decodes the feedback of a guess, encoded as in `encode_feedback`, into its list of clues."""
+    clues = []
+    for index, character in enumerate(guess):
+        feedback, digit = divmod(feedback, 3)
+        clues.append(Clue(position=index, character=character, in_word=digit > 0, correct_position=digit == 2))
+    return clues
+
+
+def get_clues(guess: str, target: str) -> list[Clue]:
+    """Get the clues for the given guess and target."""
+    return decode_feedback(guess, get_feedback(guess, target))
+
+
+def encode_feedback(clues: list[Clue]) -> int:
+    """Encodes the clues of a guess into a single integer in base 3, in the same way as `compute_patterns`.
+
+    The digit for position `i` is weighted by `3**i`, and it is `0` if the character is not in the word, `1` if it is in
+    the word but in another position, and `2` if it is in the correct position.
+    """
+    return sum((2 if clue.correct_position else 1 if clue.in_word else 0) * 3**clue.position for clue in clues)
+
+
+def format_feedback(feedback: int, word_length: int) -> str:
+    """Formats an encoded feedback as a string, using `g` for grey, `y` for yellow and `c` for correct clues."""
+    characters = []
+    for _ in range(word_length):
+        feedback, digit = divmod(feedback, 3)
+        characters.append("gyc"[digit])
+    return "".join(characters)
+
+
+def parse_feedback(feedback: str) -> int:
+    """Parses a feedback string in the format of `format_feedback` into its encoded value."""
+    if any(character not in "gyc" for character in feedback):
+        raise ValueError("The feedback can only contain 'g', 'y' and 'c' characters.")
+    return sum("gyc".index(character) * 3**position for position, character in enumerate(feedback))
@@ -0,0 +1,173 @@
+import copy
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+
+from wordle_solver.clue import Clue, decode_feedback
+from wordle_solver.patterns import encode_letters
+
+
+@dataclass
+class Constraints:
+    """Compact representation of a list of clues that can be checked against all the words at once.
+
+    Attributes:
+        green:
+            The index of the character that is known for each position, or `-1` if the position is unknown.
+        allowed:
+            A `(word_length, alphabet_size)` boolean matrix with the characters that are allowed in each position.
+        min_counts:
+            The minimum number of times each character of the alphabet must appear in a word.
+        max_counts:
+            The maximum number of times each character of the alphabet can appear in a word.
+        impossible:
+            Whether the clues require a character that is not in the alphabet, so that no word is valid.
+    """
+
+    green: np.ndarray
+    allowed: np.ndarray
+    min_counts: np.ndarray
+    max_counts: np.ndarray
+    impossible: bool = False
+
+    def get_mask(self, letters: np.ndarray) -> np.ndarray:
+        """Returns a boolean mask with the words that satisfy the constraints.
+
+        Args:
+            letters:
+                A `(n_words, word_length)` matrix with the encoded words (see `encode_letters`).
+        """
+        if self.impossible:
+            return np.zeros(len(letters), dtype=bool)
+        word_length = letters.shape[1]
+        mask = np.all(self.allowed[np.arange(word_length), letters], axis=1)
+        constrained_characters = (self.min_counts > 0) | (self.max_counts < word_length)
+        for character in np.flatnonzero(constrained_characters):
+            counts = np.count_nonzero(letters == character, axis=1)
+            mask &= (counts >= self.min_counts[character]) & (counts <= self.max_counts[character])
+        return mask
+
+
+def compile_clues(clues: list[Clue], alphabet: list[str], word_length: int) -> Constraints:
+    """Compiles a list of clues into a `Constraints` object.
+
+    The clues are interpreted in the same way as in `WordleIndex`: a correct clue fixes the character of a position, a
+    clue in the word requires the character in any other position (and excludes it from its own), and a clue that is
+    not in the word excludes the character from the whole word. The exception is a character that is observed (correct
+    or in the word) in another clue, in which case the clue only excludes the character from its position. Unlike
+    `WordleIndex`, the result does not depend on the order of the clues.
+
+    Args:
+        clues:
+            The list of clues to compile.
+        alphabet:
+            The list of characters used to encode the words.
+        word_length:
+            The length of the words.
+
+    Returns:
+        The compiled constraints.
+    """
+    character_to_index = {character: index for index, character in enumerate(alphabet)}
+    green = np.full(word_length, -1, dtype=np.int16)
+    allowed = np.ones((word_length, len(alphabet)), dtype=bool)
+    min_counts = np.zeros(len(alphabet), dtype=np.int16)
+    max_counts = np.full(len(alphabet), word_length, dtype=np.int16)
+    observed_characters = {clue.character for clue in clues if clue.in_word or clue.correct_position}
+    if any(character not in character_to_index for character in observed_characters):
+        return Constraints(green, allowed, min_counts, max_counts, impossible=True)
+
+    green_positions = {character: set() for character in observed_characters}
+    for clue in clues:
+        if clue.character not in character_to_index:
+            continue
+        character = character_to_index[clue.character]
+        if clue.correct_position:
+            green[clue.position] = character
+            allowed[clue.position, :character] = False
+            allowed[clue.position, character + 1 :] = False
+            green_positions[clue.character].add(clue.position)
+            min_counts[character] = max(min_counts[character], len(green_positions[clue.character]))
+        elif clue.in_word:
+            allowed[clue.position, character] = False
+            min_counts[character] = max(min_counts[character], 1)
+        elif clue.character in observed_characters:
+            allowed[clue.position, character] = False
+        else:
+            max_counts[character] = 0
+
+    return Constraints(green, allowed, min_counts, max_counts)
+
+
+class ConstraintIndex:
+    """A candidate lister that filters the words by compiling the clues into `Constraints`.
+
+    The words are packed into a `(n_words, word_length)` matrix of letters once, and every time the possible words are
+    requested, the whole list of clues is checked against the matrix in a single vectorized pass. The cost of filtering
+    depends on the number of words, and not on the number of clues.
+
+    Attributes:
+        words:
+            The list of valid words for the game.
+        word_length:
+            The length of the words in the list.
+    """
+
+    def __init__(self, words: list[str], word_length: int):
+        self.words = list(words)
+        self.word_length = word_length
+        self._all_words = set(self.words)
+        self._letters, self._alphabet = encode_letters(self.words, word_length)
+        self._clues = []
+        self._states = []
+        self._possible_words = None
+
+    def query(self, clues: Iterable[Clue] = ()) -> "ConstraintIndex":
+        """Returns a new index with only the given clues, which shares the matrix of letters with this one."""
+        query = copy.copy(self)
+        query.reset_clues()
+        query.add_clues(clues)
+        return query
+
+    def add_clue(self, clue: Clue):
+        """Adds a clue to the list of clues."""
+        self._clues.append(clue)
+        self._possible_words = None
+
+    def add_clues(self, clues: Iterable[Clue]):
+        """Adds a set of clues to the list of clues."""
+        self._clues.extend(clues)
+        self._possible_words = None
+
+    def add_feedback(self, guess: str, feedback: int):
+        """Adds the feedback of a guess, encoded as in `encode_feedback`."""
+        self.add_clues(decode_feedback(guess, feedback))
+
+    def get_possible_words(self) -> set[str]:
+        """Returns the set of possible words given the current set of clues."""
+        if self._possible_words is None:
+            constraints = compile_clues(self._clues, self._alphabet, self.word_length)
+            self._possible_words = {self.words[index] for index in np.flatnonzero(constraints.get_mask(self._letters))}
+        return self._possible_words
+
+    def get_all_words(self) -> set[str]:
+        """Returns the set of all possible words."""
+        return self._all_words
+
+    def reset_clues(self):
+        """Reset the clues that were received by the index."""
+        self._clues = []
+        self._states = []
+        self._possible_words = None
+
+    def push_state(self):
+        """Saves a snapshot of the current clues, so that they can be restored with `pop_state`."""
+        self._states.append((len(self._clues), self._possible_words))
+
+    def pop_state(self):
+        """Restores the clues to the last snapshot saved with `push_state`."""
+        if not self._states:
+            raise ValueError("There is no saved state to restore.")
+        number_of_clues, self._possible_words = self._states.pop()
+        del self._clues[number_of_clues:]
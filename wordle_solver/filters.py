@@ -1,6 +1,7 @@
 import numpy as np
-import torch
-from tqdm import tqdm
+
+# Maximum number of IoU values held in memory at the same time when grouping the words
+BLOCK_ELEMENTS = 1 << 22
 
 
 def filter_repeated_characters(words: set[str]) -> set[str]:
@@ -11,46 +12,95 @@ def filter_repeated_characters(words: set[str]) -> set[str]:
 def _encode_words(words: list[str]) -> np.ndarray:
     """Encodes the words into a numpy array containing its multi-hot encoding."""
     print("Encoding words...")
-    characters = list({character for word in words for character in word})
+    characters = sorted({character for word in words for character in word})
+    character_indices = {character: index for index, character in enumerate(characters)}
     encoding = np.zeros((len(words), len(characters)), dtype=np.float32)
     for index, word in enumerate(words):
         for character in word:
-            encoding[index, characters.index(character)] = 1
+            encoding[index, character_indices[character]] = 1
     return encoding
 
 
-def _compute_iou(multi_hot_encoding: np.ndarray, tolerance: float = 1e-6) -> np.ndarray:
-    """Computes the intersection over union of a multi-hot-encoded array."""
-    print("Computing IOU...")
-    encoding = torch.tensor(multi_hot_encoding).to_sparse()
-    intersection = torch.sparse.mm(encoding, encoding.T)
-    dense_encoding = encoding.to_dense()
-    union = dense_encoding.sum(dim=1)[None, :] + dense_encoding.sum(dim=1)[:, None] - intersection
-    return (intersection.to_dense() / (union + tolerance)).numpy()
+def _compute_iou(
+    encoding: np.ndarray, other_encoding: np.ndarray, sizes: np.ndarray, other_sizes: np.ndarray, tolerance: float
+) -> np.ndarray:
+    """Computes the intersection over union between two sets of multi-hot-encoded words."""
+    intersection = encoding @ other_encoding.T
+    union = sizes[:, None] + other_sizes[None, :] - intersection
+    return intersection / (union + tolerance)
+
+
+def _sum_iou(
+    encoding: np.ndarray,
+    sizes: np.ndarray,
+    row_indices: np.ndarray,
+    column_indices: np.ndarray,
+    tolerance: float,
+) -> np.ndarray:
+    """Computes, for each of the rows, the sum of its intersection over union with all the columns.
+
+    The rows are processed in blocks, so that only a block of at most `BLOCK_ELEMENTS` values of the (rows, columns)
+    matrix is held in memory at the same time.
+    """
+    sums = np.zeros(len(row_indices), dtype=np.float64)
+    if len(row_indices) == 0 or len(column_indices) == 0:
+        return sums
+    column_encoding = encoding[column_indices]
+    column_sizes = sizes[column_indices]
+    block_size = max(1, BLOCK_ELEMENTS // len(column_indices))
+    for start in range(0, len(row_indices), block_size):
+        block = row_indices[start : start + block_size]
+        iou = _compute_iou(encoding[block], column_encoding, sizes[block], column_sizes, tolerance)
+        sums[start : start + block_size] = iou.sum(axis=1, dtype=np.float64)
+    return sums
 
 
 def group_by_overlapping_characters(
-    words: list[str], max_groups: int, iou_threshold: float = 0.7
+    words: list[str], max_groups: int, iou_threshold: float = 0.7, tolerance: float = 1e-6
 ) -> dict[str, set[str]]:
     """Groups words by the characters that overlap with each other.
 
     This function selects `max_groups` number of groups to try out. Each of the groups has a key which is the word
     that is used to group the words. The value is the set of words that overlap with the key word the most.
+
+    The intersection over union (IoU) between every pair of words is never stored: the total IoU of each word with the
+    words that are not grouped yet is computed in blocks, and it is updated by subtracting the IoU with the words that
+    are grouped at each step. This keeps the memory linear in the number of words.
     """
+    if len(words) == 0:
+        return dict()
     word_encodings = _encode_words(words)
-    overlaps = _compute_iou(word_encodings)
+    sizes = word_encodings.sum(axis=1)
+    print("Computing IOU...")
+    remaining = np.ones(len(words), dtype=bool)
+    all_indices = np.arange(len(words))
+    overlaps = _sum_iou(word_encodings, sizes, all_indices, all_indices, tolerance)
+    # Imported here, since `tqdm` is slow to import and the groups are usually loaded from disk
+    from tqdm import tqdm
+
     groups = dict()
     for _ in tqdm(range(max_groups)):
-        if len(overlaps) == 0:
+        remaining_indices = np.flatnonzero(remaining)
+        if len(remaining_indices) == 0:
             break
-        most_overlaps_index = np.sum(overlaps, axis=1).argmax()
-        overlapping_words = np.where(overlaps[most_overlaps_index] >= iou_threshold)
-        groups[words[most_overlaps_index]] = {words[index] for index in overlapping_words[0]}
-        overlaps = np.delete(overlaps, overlapping_words[0], axis=0)
-        overlaps = np.delete(overlaps, overlapping_words[0], axis=1)
-        words = [word for index, word in enumerate(words) if index not in overlapping_words[0]]
-
-    for word in words:
+        most_overlaps_index = remaining_indices[overlaps[remaining_indices].argmax()]
+        iou = _compute_iou(
+            word_encodings[most_overlaps_index][None, :],
+            word_encodings[remaining_indices],
+            sizes[most_overlaps_index][None],
+            sizes[remaining_indices],
+            tolerance,
+        )[0]
+        overlapping_indices = remaining_indices[iou >= iou_threshold]
+        groups[words[most_overlaps_index]] = {words[index] for index in overlapping_indices}
+        remaining[overlapping_indices] = False
+        remaining_indices = np.flatnonzero(remaining)
+        overlaps[remaining_indices] -= _sum_iou(
+            word_encodings, sizes, remaining_indices, overlapping_indices, tolerance
+        )
+
+    for index in np.flatnonzero(remaining):
+        word = words[index]
         best_match = max(groups, key=lambda key: len(set(word) & set(key)))
         groups[best_match].add(word)
 
@@ -0,0 +1,57 @@
+import math
+from collections import Counter
+from typing import Iterable
+
+
+def get_letter_scores(candidates: Iterable[str], possible_words: set[str]) -> dict[str, float]:
+    """Calculates a cheap estimate of how informative each candidate is against the possible words.
+
+    The estimate adds, for each distinct character of the candidate, the binary entropy of the fraction of possible
+    words that contain it (i.e. how evenly a yellow/grey clue splits them), and for each position, the fraction of
+    possible words that have the same character in that position. Higher is better. It only needs the letter counts of
+    the possible words, so it is much cheaper than calculating the entropy of the candidates.
+
+    Args:
+        candidates:
+            The candidates to score.
+        possible_words:
+            The set of possible words that the candidates are evaluated against.
+
+    Returns:
+        A dictionary mapping each candidate to its score.
+    """
+    number_of_words = len(possible_words)
+    if number_of_words == 0:
+        return {candidate: 0.0 for candidate in candidates}
+    words_with_character = Counter(character for word in possible_words for character in set(word))
+    words_with_character_in_position = Counter(
+        (position, character) for word in possible_words for position, character in enumerate(word)
+    )
+
+    character_entropies = dict()
+    for character, count in words_with_character.items():
+        fraction = count / number_of_words
+        character_entropies[character] = (
+            0.0
+            if count == number_of_words
+            else -fraction * math.log2(fraction) - (1 - fraction) * math.log2(1 - fraction)
+        )
+
+    scores = dict()
+    for candidate in candidates:
+        score = sum(character_entropies.get(character, 0.0) for character in set(candidate))
+        score += (
+            sum(words_with_character_in_position[(position, character)] for position, character in enumerate(candidate))
+            / number_of_words
+        )
+        scores[candidate] = score
+    return scores
+
+
+def rank_candidates(candidates: Iterable[str], possible_words: set[str]) -> list[str]:
+    """Sorts the candidates from the most to the least promising, according to `get_letter_scores`.
+
+    Ties are broken alphabetically, so the order is always the same for the same candidates and possible words.
+    """
+    scores = get_letter_scores(candidates, possible_words)
+    return sorted(scores, key=lambda candidate: (-scores[candidate], candidate))
@@ -1,5 +1,7 @@
 from collections import defaultdict
-from typing import Generic, TypeVar
+from typing import Generic, Iterable, Mapping, Optional, TypeVar
+
+import numpy as np
 
 D = TypeVar("D")
 W = TypeVar("W")
@@ -9,14 +11,19 @@ class InvertedIndex(Generic[W, D]):
     """Implementation for a Generic Inverted Index.
 
     We use the terminology of words and documents for the sake of clarity, but the implementation is generic. Words
-    can be of any type (denoted by `W`) and documents can be of any type (denoted by `D`)."""
+    can be of any type (denoted by `W`) and documents can be of any type (denoted by `D`).
+
+    The results of `get_does_not_contain` are memoized until a new word-document pair is added, so that negative
+    lookups cost the same as positive ones after the first time."""
 
     def __init__(self):
         self._index: dict[W, set[D]] = defaultdict(set)
+        self._complements: dict[frozenset[W], set[D]] = dict()
 
     def add(self, word: W, document: D):
         """Adds a word-document pair to the index."""
         self._index[word].add(document)
+        self._complements.clear()
 
     def get(self, word: W) -> set[D]:
         """Returns the set of documents that contain the given word."""
@@ -30,13 +37,156 @@ class InvertedIndex(Generic[W, D]):
 
     def get_does_not_contain(self, words: list[W]) -> set[D]:
         """Returns the set of documents that do not contain the given words."""
-        searchable_words = [word for word in self._index.keys() if word not in words]
-        if len(searchable_words) == 0:
-            return set()
-        filtered_documents = set.union(*[self._index[word] for word in searchable_words])
+        key = frozenset(words)
+        filtered_documents = self._complements.get(key)
+        if filtered_documents is not None:
+            return filtered_documents
 
+        searchable_words = [word for word in self._index.keys() if word not in key]
+        filtered_documents = set.union(*[self._index[word] for word in searchable_words]) if searchable_words else set()
+        self._complements[key] = filtered_documents
         return filtered_documents
 
     def get_possible_words(self) -> set[W]:
         """Returns the set of all words that are in the index."""
         return set(self._index.keys())
+
+
+class DocumentIds(Generic[D]):
+    """Assigns dense integer IDs to documents, so that sets of documents can be represented as bitsets.
+
+    A bitset is a Python integer where the bit `i` is set if the document with ID `i` is in the set. This allows set
+    operations to be computed as word-parallel AND/OR/NOT operations."""
+
+    def __init__(self):
+        self._ids: dict[D, int] = dict()
+        self._documents: list[D] = []
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def get_id(self, document: D) -> int:
+        """Returns the ID of the given document, assigning a new one if the document has not been seen before."""
+        document_id = self._ids.get(document)
+        if document_id is None:
+            document_id = len(self._documents)
+            self._ids[document] = document_id
+            self._documents.append(document)
+        return document_id
+
+    def add_documents(self, documents: Iterable[D]):
+        """Assigns the next IDs to the given documents, in order, which is faster than calling `get_id` for each one.
+
+        Raises:
+            ValueError: If a document is repeated or already has an ID.
+        """
+        start = len(self._documents)
+        self._documents.extend(documents)
+        self._ids.update(zip(self._documents[start:], range(start, len(self._documents))))
+        if len(self._ids) != len(self._documents):
+            raise ValueError("The documents must be distinct and must not have an ID yet.")
+
+    def get_document(self, document_id: int) -> D:
+        """Returns the document with the given ID."""
+        return self._documents[document_id]
+
+    def get_all(self) -> int:
+        """Returns the bitset containing all of the documents."""
+        return (1 << len(self._documents)) - 1
+
+    def encode(self, documents: Iterable[D]) -> int:
+        """Encodes the given documents into a bitset."""
+        bitset = 0
+        for document in documents:
+            bitset |= 1 << self.get_id(document)
+        return bitset
+
+    def get_ids(self, bitset: int) -> np.ndarray:
+        """Returns the sorted IDs of the documents in the bitset."""
+        if bitset == 0:
+            return np.empty(0, dtype=np.int64)
+        packed = np.frombuffer(bitset.to_bytes((bitset.bit_length() + 7) // 8, "little"), dtype=np.uint8)
+        return np.flatnonzero(np.unpackbits(packed, bitorder="little"))
+
+    def decode(self, bitset: int) -> set[D]:
+        """Decodes the bitset into the set of documents it contains."""
+        return {self._documents[document_id] for document_id in self.get_ids(bitset)}
+
+
+class BitsetInvertedIndex(Generic[W, D]):
+    """Implementation for a Generic Inverted Index that stores its postings as bitsets.
+
+    Each document is assigned a dense integer ID (see `DocumentIds`) and each posting is stored as a bitset. The
+    methods that return sets of documents have a `_bitset` variant that returns the bitset instead, which avoids
+    decoding the documents when the results are combined further. As in `InvertedIndex`, the results of
+    `get_does_not_contain` are memoized until a new word-document pair is added.
+
+    Attributes:
+        document_ids:
+            The IDs of the documents. It can be shared between indices so that their bitsets can be combined.
+    """
+
+    def __init__(self, document_ids: Optional[DocumentIds[D]] = None):
+        self.document_ids = document_ids if document_ids is not None else DocumentIds[D]()
+        self._index: dict[W, int] = defaultdict(int)
+        self._complements: dict[frozenset[W], int] = dict()
+
+    @classmethod
+    def from_postings(cls, postings: Mapping[W, int], document_ids: DocumentIds[D]) -> "BitsetInvertedIndex[W, D]":
+        """Creates a read-only index that uses the given bitsets of each word as its postings, without copying them, so
+        that postings that are loaded lazily (e.g. the `BundlePostings` of a bundle) are only read when they are
+        used."""
+        index = cls(document_ids)
+        index._index = postings
+        return index
+
+    def add(self, word: W, document: D):
+        """Adds a word-document pair to the index."""
+        self._index[word] |= 1 << self.document_ids.get_id(document)
+        self._complements.clear()
+
+    def add_bitset(self, word: W, bitset: int):
+        """Adds the documents in the bitset to the posting of the word, e.g. to load a precomputed index."""
+        self._index[word] |= bitset
+        self._complements.clear()
+
+    def get_bitset(self, word: W) -> int:
+        """Returns the bitset of documents that contain the given word."""
+        return self._index.get(word, 0)
+
+    def get_contains_bitset(self, words: list[W]) -> int:
+        """Returns the bitset of documents that contain one of the given words."""
+        bitset = 0
+        for word in words:
+            bitset |= self._index.get(word, 0)
+        return bitset
+
+    def get_does_not_contain_bitset(self, words: list[W]) -> int:
+        """Returns the bitset of documents that do not contain the given words."""
+        key = frozenset(words)
+        bitset = self._complements.get(key)
+        if bitset is not None:
+            return bitset
+
+        bitset = 0
+        for word, documents in self._index.items():
+            if word not in key:
+                bitset |= documents
+        self._complements[key] = bitset
+        return bitset
+
+    def get(self, word: W) -> set[D]:
+        """Returns the set of documents that contain the given word."""
+        return self.document_ids.decode(self.get_bitset(word))
+
+    def get_contains(self, words: list[W]) -> set[D]:
+        """Returns the set of documents that contain one of the given words."""
+        return self.document_ids.decode(self.get_contains_bitset(words))
+
+    def get_does_not_contain(self, words: list[W]) -> set[D]:
+        """Returns the set of documents that do not contain the given words."""
+        return self.document_ids.decode(self.get_does_not_contain_bitset(words))
+
+    def get_possible_words(self) -> set[W]:
+        """Returns the set of all words that are in the index."""
+        return set(self._index.keys())
@@ -0,0 +1,127 @@
+import threading
+import weakref
+from concurrent.futures import Executor, ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Iterator, Optional
+
+import numpy as np
+
+from wordle_solver.pattern_store import StoredPatternMatrix
+from wordle_solver.patterns import PatternMatrix
+
+# Pattern matrix of the current worker process, which is set by `_init_worker`
+_worker_pattern_matrix: Optional[PatternMatrix] = None
+_worker_shared_memory: Optional[SharedMemory] = None
+
+
+def _init_worker(
+    words: list[str],
+    word_length: int,
+    path: Optional[str],
+    shared_memory_name: Optional[str],
+    shape: tuple[int, int],
+    dtype: str,
+):
+    """Attaches the worker to the shared pattern matrix, either memory-mapping its file or its shared memory block."""
+    global _worker_pattern_matrix, _worker_shared_memory
+    if path is not None:
+        patterns = np.load(path, mmap_mode="r")
+    else:
+        _worker_shared_memory = SharedMemory(name=shared_memory_name)
+        patterns = np.ndarray(shape, dtype=dtype, buffer=_worker_shared_memory.buf)
+        patterns.flags.writeable = False
+    _worker_pattern_matrix = PatternMatrix(words, word_length, patterns)
+
+
+def _score_chunk(guess_indices: np.ndarray, target_indices: np.ndarray) -> np.ndarray:
+    """Scores a chunk of guesses in the worker process."""
+    return _worker_pattern_matrix.score_candidates(guess_indices, target_indices)
+
+
+def _release_shared_memory(shared_memory: SharedMemory):
+    shared_memory.close()
+    shared_memory.unlink()
+
+
+class ParallelScorer:
+    """Scores candidates by sharding them across a pool of worker processes.
+
+    The workers share the pattern matrix read-only instead of receiving a copy with every task: a matrix that was
+    loaded from a `PatternStore` is memory-mapped from its file, and any other matrix is copied once into a shared
+    memory block. Only the indices of the guesses and targets are sent with each task.
+
+    Attributes:
+        pattern_matrix:
+            The pattern matrix used to score the candidates.
+        n_workers:
+            The number of worker processes.
+        chunk_size:
+            The number of guesses that are scored by each task.
+    """
+
+    def __init__(self, pattern_matrix: PatternMatrix, n_workers: int, chunk_size: int = 1024):
+        self.pattern_matrix = pattern_matrix
+        self.n_workers = n_workers
+        self.chunk_size = chunk_size
+        self._executor: Optional[Executor] = None
+        self._finalizers = []
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Executor:
+        """Returns the pool of workers, starting it the first time it is needed."""
+        # Solvers created with `WordleSolver.query` share the scorer, so it can be started from several threads at once
+        with self._lock:
+            if self._executor is not None:
+                return self._executor
+
+            patterns = self.pattern_matrix.patterns
+            path = self.pattern_matrix.path if isinstance(self.pattern_matrix, StoredPatternMatrix) else None
+            shared_memory_name = None
+            if path is None:
+                shared_memory = SharedMemory(create=True, size=max(1, patterns.nbytes))
+                np.ndarray(patterns.shape, dtype=patterns.dtype, buffer=shared_memory.buf)[:] = patterns
+                shared_memory_name = shared_memory.name
+                self._finalizers.append(weakref.finalize(self, _release_shared_memory, shared_memory))
+
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.n_workers,
+                initializer=_init_worker,
+                initargs=(
+                    self.pattern_matrix.words,
+                    self.pattern_matrix.word_length,
+                    path,
+                    shared_memory_name,
+                    patterns.shape,
+                    patterns.dtype.str,
+                ),
+            )
+            self._finalizers.append(weakref.finalize(self, self._executor.shutdown))
+            return self._executor
+
+    def iter_scores(self, guess_indices: np.ndarray, target_indices: np.ndarray) -> Iterator[np.ndarray]:
+        """Yields the scores of the guesses chunk by chunk, in the same order as `guess_indices`."""
+        executor = self._get_executor()
+        futures = [
+            executor.submit(_score_chunk, guess_indices[start : start + self.chunk_size], target_indices)
+            for start in range(0, len(guess_indices), self.chunk_size)
+        ]
+        for future in futures:
+            yield future.result()
+
+    def get_number_of_chunks(self, number_of_guesses: int) -> int:
+        """Returns the number of chunks in which the given number of guesses is split."""
+        return -(-number_of_guesses // self.chunk_size)
+
+    def score_candidates(self, guess_indices: np.ndarray, target_indices: np.ndarray) -> np.ndarray:
+        """Calculates the average entropy of every guess against the given possible targets.
+
+        The result is the same as `PatternMatrix.score_candidates`, since each guess is scored independently.
+        """
+        return np.concatenate([np.empty(0, dtype=np.float64), *self.iter_scores(guess_indices, target_indices)])
+
+    def close(self):
+        """Stops the workers and releases the shared memory."""
+        for finalizer in reversed(self._finalizers):
+            finalizer()
+        self._finalizers = []
+        self._executor = None
@@ -0,0 +1,119 @@
+import glob
+import hashlib
+import os
+from typing import Optional
+
+import numpy as np
+
+from wordle_solver.patterns import PatternMatrix, compute_patterns, encode_letters, get_pattern_dtype
+
+
+def get_wordlist_key(words: list[str], word_length: int) -> str:
+    """Returns a short hash that identifies a word list and word length."""
+    digest = hashlib.sha256(f"{word_length}\n".encode())
+    digest.update("\n".join(words).encode())
+    return digest.hexdigest()[:16]
+
+
+def _build_rows(path: str, letters: np.ndarray, alphabet_size: int, start: int, end: int):
+    """Computes the patterns for the guesses in `[start, end)` and writes them to the file at `path`."""
+    patterns = np.load(path, mmap_mode="r+")
+    patterns[start:end] = compute_patterns(letters[start:end], letters, alphabet_size)
+    patterns.flush()
+
+
+class PatternStore:
+    """On-disk store for the pattern matrices of the word lists.
+
+    The matrices are saved as `.npy` files named after the word list, the word length and a hash of the words, so that
+    a matrix is rebuilt automatically whenever the word list changes. The files are opened with `np.memmap`, so that
+    every process that uses the same matrix shares the same read-only pages.
+
+    Attributes:
+        directory:
+            The directory in which the matrices are stored.
+        name:
+            The name of the word list, used as a prefix for the files (e.g. the language).
+        n_workers:
+            The number of processes used to build a matrix. Defaults to the number of cores.
+        chunk_size:
+            The number of guesses computed by each task when building a matrix.
+    """
+
+    def __init__(self, directory: str, name: str, n_workers: Optional[int] = None, chunk_size: int = 512):
+        self.directory = directory
+        self.name = name
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+
+    def get_path(self, words: list[str], word_length: int) -> str:
+        """Returns the path of the file that stores the matrix for the given words."""
+        key = get_wordlist_key(words, word_length)
+        return os.path.join(self.directory, f"patterns_{self.name}_{word_length}_{key}.npy")
+
+    def build(self, words: list[str], word_length: int) -> str:
+        """Builds the matrix for the given words in parallel chunks and saves it to disk.
+
+        Returns:
+            The path of the file containing the matrix.
+        """
+        path = self.get_path(words, word_length)
+        temporary_path = f"{path[: -len('.npy')]}.{os.getpid()}.tmp.npy"
+        letters, alphabet = encode_letters(words, word_length)
+        patterns = np.lib.format.open_memmap(
+            temporary_path, mode="w+", dtype=get_pattern_dtype(word_length), shape=(len(words), len(words))
+        )
+        del patterns
+
+        # Imported here so that `multiprocessing` is only loaded when a matrix has to be built
+        from concurrent.futures import ProcessPoolExecutor
+
+        try:
+            with ProcessPoolExecutor(max_workers=self.n_workers) as executor:
+                futures = [
+                    executor.submit(_build_rows, temporary_path, letters, len(alphabet), start, start + self.chunk_size)
+                    for start in range(0, len(words), self.chunk_size)
+                ]
+                for future in futures:
+                    future.result()
+            os.replace(temporary_path, path)
+        finally:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+
+        self._remove_stale_files(path, word_length)
+        return path
+
+    def _remove_stale_files(self, current_path: str, word_length: int):
+        """Removes the matrices of previous versions of the word list with the same word length, keeping the matrices
+        of the other word lengths."""
+        for path in glob.glob(os.path.join(self.directory, f"patterns_{self.name}_{word_length}_*.npy")):
+            if path != current_path and not path.endswith(".tmp.npy"):
+                os.remove(path)
+
+    def get_pattern_matrix(self, words: list[str], word_length: int) -> "StoredPatternMatrix":
+        """Returns the pattern matrix for the given words.
+
+        The matrix is only read from disk (or built, if it is not stored yet) the first time its patterns are used.
+        """
+        return StoredPatternMatrix(words, word_length, store=self)
+
+    def load(self, words: list[str], word_length: int) -> np.ndarray:
+        """Memory-maps the matrix for the given words read-only, building it if it is not stored yet."""
+        path = self.get_path(words, word_length)
+        if not os.path.exists(path):
+            path = self.build(words, word_length)
+        return np.load(path, mmap_mode="r")
+
+
+class StoredPatternMatrix(PatternMatrix):
+    """Pattern matrix that is lazily memory-mapped from a `PatternStore`."""
+
+    def __init__(self, words: list[str], word_length: int, store: PatternStore):
+        super().__init__(words, word_length)
+        self.store = store
+        self.path = store.get_path(words, word_length)
+
+    def _load_patterns(self) -> np.ndarray:
+        """Loads the matrix of patterns from the store."""
+        return self.store.load(self.words, self.word_length)
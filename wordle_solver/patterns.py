@@ -0,0 +1,322 @@
+import threading
+from typing import Iterable, Optional
+
+import numpy as np
+
+# Maximum number of guess/target pairs that are scored at the same time
+MAX_BLOCK_ELEMENTS = 1 << 18
+# Tolerance used when comparing bounds with scores, so that rounding errors never prune the best guess
+BOUND_TOLERANCE = 1e-9
+
+
+def get_pattern_dtype(word_length: int) -> np.dtype:
+    """Returns the smallest unsigned integer type that can hold every feedback pattern for the given word length."""
+    number_of_patterns = 3**word_length
+    if number_of_patterns <= np.iinfo(np.uint8).max + 1:
+        return np.dtype(np.uint8)
+    if number_of_patterns <= np.iinfo(np.uint16).max + 1:
+        return np.dtype(np.uint16)
+    return np.dtype(np.uint32)
+
+
+def encode_letters(words: list[str], word_length: int) -> tuple[np.ndarray, list[str]]:
+    """Encodes the words into a `(len(words), word_length)` matrix of letter indices.
+
+    Returns:
+        A tuple containing the encoded matrix and the alphabet used, where the value `i` in the matrix represents the
+        character `alphabet[i]`.
+    """
+    alphabet = sorted({character for word in words for character in word})
+    if len(alphabet) > np.iinfo(np.uint8).max + 1:
+        raise ValueError("The alphabet of the words is too large to be encoded.")
+    character_to_index = {character: index for index, character in enumerate(alphabet)}
+    letters = np.zeros((len(words), word_length), dtype=np.uint8)
+    for row, word in enumerate(words):
+        if len(word) != word_length:
+            raise ValueError(f'The word "{word}" must have {word_length} characters.')
+        letters[row] = [character_to_index[character] for character in word]
+    return letters, alphabet
+
+
+def compute_patterns(
+    guess_letters: np.ndarray, target_letters: np.ndarray, alphabet_size: int, block_size: int = 512
+) -> np.ndarray:
+    """Computes the feedback pattern for every guess/target pair.
+
+    The feedback of each position is encoded as a digit in base 3, where `0` denotes that the character is not in the
+    target, `1` that the character is in the target but in another position, and `2` that the character is in the
+    correct position. The digit for position `i` is weighted by `3**i`.
+
+    Args:
+        guess_letters:
+            A `(n_guesses, word_length)` matrix containing the encoded guesses.
+        target_letters:
+            A `(n_targets, word_length)` matrix containing the encoded targets.
+        alphabet_size:
+            The number of distinct characters used in the encoding.
+        block_size:
+            The number of guesses that are processed at the same time. Used to bound the memory usage.
+
+    Returns:
+        A `(n_guesses, n_targets)` matrix with the feedback pattern for each pair.
+    """
+    word_length = guess_letters.shape[1]
+    dtype = get_pattern_dtype(word_length)
+    target_has_character = np.zeros((len(target_letters), alphabet_size), dtype=bool)
+    for position in range(word_length):
+        target_has_character[np.arange(len(target_letters)), target_letters[:, position]] = True
+
+    patterns = np.zeros((len(guess_letters), len(target_letters)), dtype=dtype)
+    for start in range(0, len(guess_letters), block_size):
+        block = guess_letters[start : start + block_size]
+        block_patterns = np.zeros((len(block), len(target_letters)), dtype=dtype)
+        for position in range(word_length):
+            in_word = target_has_character[:, block[:, position]].T
+            correct_position = block[:, position][:, None] == target_letters[None, :, position]
+            digit = in_word.astype(dtype) + correct_position.astype(dtype)
+            block_patterns += digit * dtype.type(3**position)
+        patterns[start : start + block_size] = block_patterns
+    return patterns
+
+
+class PatternMatrix:
+    """Precomputed feedback patterns for every guess/target pair of a word list.
+
+    Each pattern is a single integer in base 3 (see `compute_patterns`), so that the clues of a guess against every
+    possible target can be compared without building `Clue` objects.
+
+    Attributes:
+        words:
+            The list of words, where the position of a word is used as its index in the matrix.
+        word_length:
+            The length of the words in the list.
+        patterns:
+            A `(len(words), len(words))` matrix where `patterns[guess, target]` is the feedback of the pair. If it is
+            not given, it is loaded the first time it is accessed.
+    """
+
+    def __init__(self, words: list[str], word_length: int, patterns: Optional[np.ndarray] = None):
+        self.words = words
+        self.word_length = word_length
+        self._patterns = patterns
+        self._letters = None
+        # Loading the patterns can take seconds, so threads that need them at the same time wait for a single load
+        self._lock = threading.Lock()
+        self.number_of_patterns = 3**word_length
+        self.solved_pattern = self.number_of_patterns - 1
+        self._word_to_index = {word: index for index, word in enumerate(words)}
+
+    @property
+    def patterns(self) -> np.ndarray:
+        """The matrix of patterns, which is loaded the first time it is accessed."""
+        if self._patterns is None:
+            with self._lock:
+                if self._patterns is None:
+                    self._patterns = self._load_patterns()
+        return self._patterns
+
+    def _load_patterns(self) -> np.ndarray:
+        """Loads the matrix of patterns. By default, the patterns are computed from the words."""
+        letters, alphabet = encode_letters(self.words, self.word_length)
+        return compute_patterns(letters, letters, len(alphabet))
+
+    @property
+    def letters(self) -> np.ndarray:
+        """The `(len(words), word_length)` matrix of encoded words, which is computed the first time it is accessed."""
+        if self._letters is None:
+            self._letters, _ = encode_letters(self.words, self.word_length)
+        return self._letters
+
+    @classmethod
+    def from_words(cls, words: list[str], word_length: int) -> "PatternMatrix":
+        """Builds the pattern matrix by computing the feedback for every pair of words."""
+        letters, alphabet = encode_letters(words, word_length)
+        return cls(words, word_length, compute_patterns(letters, letters, len(alphabet)))
+
+    def get_index(self, word: str) -> int:
+        """Returns the index of the given word in the matrix."""
+        return self._word_to_index[word]
+
+    def get_indices(self, words: Iterable[str]) -> np.ndarray:
+        """Returns the indices of the given words in the matrix, in the same order as they are given."""
+        return np.fromiter((self._word_to_index[word] for word in words), dtype=np.int64)
+
+    def get_pattern(self, guess: str, target: str) -> int:
+        """Returns the feedback pattern for the given guess and target."""
+        return int(self.patterns[self.get_index(guess), self.get_index(target)])
+
+    def get_block_size(self, number_of_targets: int) -> int:
+        """Returns the number of guesses to score at once so that each block has roughly `MAX_BLOCK_ELEMENTS`.
+
+        Each guess in a block uses one element per target, and one per pattern to count the size of the buckets.
+        """
+        return max(1, MAX_BLOCK_ELEMENTS // max(number_of_targets, self.number_of_patterns))
+
+    def _get_bucket_entropies(self, number_of_targets: int) -> np.ndarray:
+        """Returns the contribution `c * log2(c)` of a bucket of size `c`, for every possible size."""
+        sizes = np.arange(number_of_targets + 1, dtype=np.float64)
+        bucket_entropies = np.zeros(number_of_targets + 1, dtype=np.float64)
+        bucket_entropies[1:] = sizes[1:] * np.log2(sizes[1:])
+        return bucket_entropies
+
+    def _count_buckets(self, guess_indices: np.ndarray, target_indices: np.ndarray) -> np.ndarray:
+        """Returns a `(len(guess_indices), number_of_patterns)` matrix with the size of the bucket of each pattern."""
+        block_patterns = self.patterns[np.ix_(guess_indices, target_indices)].astype(np.int64)
+        block_patterns += np.arange(len(guess_indices), dtype=np.int64)[:, None] * self.number_of_patterns
+        counts = np.bincount(block_patterns.ravel(), minlength=len(guess_indices) * self.number_of_patterns)
+        return counts.reshape(len(guess_indices), self.number_of_patterns)
+
+    def score_candidates(self, guess_indices: np.ndarray, target_indices: np.ndarray) -> np.ndarray:
+        """Calculates the average entropy of every guess against the given possible targets.
+
+        The targets that share a pattern with a guess form a bucket, and each target contributes the `log2` of the
+        size of its bucket. If the guess is the target itself, it contributes `-0.01` to favor guessing possible words.
+        The buckets of a whole block of guesses are counted at once with a single `np.bincount`.
+
+        Args:
+            guess_indices:
+                The indices of the guesses to score.
+            target_indices:
+                The indices of the possible targets.
+
+        Returns:
+            An array with the average entropy of each guess, in the same order as `guess_indices`.
+        """
+        number_of_targets = len(target_indices)
+        bucket_entropies = self._get_bucket_entropies(number_of_targets)
+        scores = np.empty(len(guess_indices), dtype=np.float64)
+        block_size = self.get_block_size(number_of_targets)
+        for start in range(0, len(guess_indices), block_size):
+            block = guess_indices[start : start + block_size]
+            totals = bucket_entropies[self._count_buckets(block, target_indices)].sum(axis=1)
+            totals -= 0.01 * np.isin(block, target_indices)
+            scores[start : start + block_size] = totals / number_of_targets
+        return scores
+
+    def score_candidates_for_target_sets(
+        self, guess_indices: np.ndarray, target_index_sets: list[np.ndarray]
+    ) -> np.ndarray:
+        """Calculates the average entropy of every guess against each of several sets of possible targets at once.
+
+        The targets of all the sets are concatenated, and each pattern is offset by the position of its set, so that the
+        buckets of a block of guesses against every set are counted with a single `np.bincount`. This saves the
+        per-call overhead of `score_candidates` when there are many small sets, and gives exactly the same scores.
+
+        Args:
+            guess_indices:
+                The indices of the guesses to score.
+            target_index_sets:
+                The indices of the possible targets of each set. Every set must have at least one target.
+
+        Returns:
+            A `(len(target_index_sets), len(guess_indices))` matrix with the average entropy of each guess against each
+            set of targets.
+        """
+        number_of_sets = len(target_index_sets)
+        sizes = np.array([len(target_indices) for target_indices in target_index_sets], dtype=np.int64)
+        target_indices = np.concatenate([np.empty(0, dtype=np.int64), *target_index_sets])
+        set_offsets = np.repeat(np.arange(number_of_sets, dtype=np.int64) * self.number_of_patterns, sizes)
+        bucket_entropies = self._get_bucket_entropies(int(sizes.max(initial=0)))
+        is_target = np.zeros((len(self.words), number_of_sets), dtype=bool)
+        is_target[target_indices, set_offsets // self.number_of_patterns] = True
+
+        scores = np.empty((number_of_sets, len(guess_indices)), dtype=np.float64)
+        number_of_buckets = number_of_sets * self.number_of_patterns
+        block_size = max(1, MAX_BLOCK_ELEMENTS // max(len(target_indices), number_of_buckets))
+        for start in range(0, len(guess_indices), block_size):
+            block = guess_indices[start : start + block_size]
+            block_patterns = self.patterns[np.ix_(block, target_indices)].astype(np.int64)
+            block_patterns += set_offsets[None, :] + np.arange(len(block), dtype=np.int64)[:, None] * number_of_buckets
+            counts = np.bincount(block_patterns.ravel(), minlength=len(block) * number_of_buckets)
+            counts = counts.reshape(len(block), number_of_sets, self.number_of_patterns)
+            # The buckets of each set are summed in the same order as in `score_candidates`, so the scores are equal
+            totals = bucket_entropies[counts].sum(axis=2)
+            totals -= 0.01 * is_target[block]
+            scores[:, start : start + block_size] = (totals / sizes).T
+        return scores
+
+    def score_candidates_with_bound(
+        self, guess_indices: np.ndarray, target_indices: np.ndarray, bound: float, number_of_steps: int = 4
+    ) -> np.ndarray:
+        """Calculates the average entropy of every guess, abandoning the guesses that cannot score below `bound`.
+
+        The buckets are counted over the targets in `number_of_steps` chunks. Since `c * log2(c)` is superadditive, the
+        final contribution of the buckets is at least the contribution of the targets counted so far plus the smallest
+        possible contribution of the remaining `r` targets, which is `r * log2(r / k)` for a guess that splits them in
+        at most `k` buckets. The guesses for which this lower bound is above `bound` are abandoned.
+
+        Returns:
+            An array with the average entropy of each guess, in the same order as `guess_indices`. The abandoned
+            guesses have a score of `np.inf`, and the rest have exactly the same score as in `score_candidates`.
+        """
+        number_of_targets = len(target_indices)
+        bucket_entropies = self._get_bucket_entropies(number_of_targets)
+        target_chunks = np.array_split(target_indices, min(number_of_steps, max(1, number_of_targets)))
+        scores = np.full(len(guess_indices), np.inf, dtype=np.float64)
+        block_size = self.get_block_size(number_of_targets)
+        for start in range(0, len(guess_indices), block_size):
+            block = guess_indices[start : start + block_size]
+            is_target = np.isin(block, target_indices)
+            number_of_buckets = self._get_number_of_buckets(block, target_indices)
+            counts = np.zeros((len(block), self.number_of_patterns), dtype=np.int64)
+            remaining = np.arange(len(block))
+            number_of_remaining_targets = number_of_targets
+            for step, target_chunk in enumerate(target_chunks):
+                counts[remaining] += self._count_buckets(block[remaining], target_chunk)
+                totals = bucket_entropies[counts[remaining]].sum(axis=1)
+                totals -= 0.01 * is_target[remaining]
+                partial_scores = totals / number_of_targets
+                if step == len(target_chunks) - 1:
+                    scores[start + remaining] = partial_scores
+                    break
+
+                number_of_remaining_targets -= len(target_chunk)
+                remaining_buckets = np.minimum(number_of_buckets[remaining], number_of_remaining_targets)
+                remaining_contribution = number_of_remaining_targets * np.maximum(
+                    0.0, np.log2(number_of_remaining_targets / remaining_buckets)
+                )
+                partial_scores += remaining_contribution / number_of_targets
+                remaining = remaining[partial_scores <= bound + BOUND_TOLERANCE]
+                if len(remaining) == 0:
+                    break
+        return scores
+
+    def _get_number_of_buckets(self, guess_indices: np.ndarray, target_indices: np.ndarray) -> np.ndarray:
+        """Returns an upper bound of the number of buckets in which each guess splits the given targets.
+
+        For each position, we check which of the three feedbacks can happen for the character of the guess against
+        any of the targets, and the product of the number of possible feedbacks per position bounds the number of
+        distinct patterns.
+        """
+        number_of_targets = len(target_indices)
+        alphabet_size = int(self.letters.max(initial=0)) + 1
+        targets = self.letters[target_indices]
+        target_has_character = np.zeros((number_of_targets, alphabet_size), dtype=bool)
+        target_has_character[np.arange(number_of_targets)[:, None], targets] = True
+        targets_with_character = target_has_character.sum(axis=0)
+
+        guesses = self.letters[guess_indices]
+        number_of_buckets = np.ones(len(guess_indices), dtype=np.float64)
+        for position in range(self.word_length):
+            characters = guesses[:, position]
+            targets_with_character_in_position = np.bincount(targets[:, position], minlength=alphabet_size)[characters]
+            correct_position = targets_with_character_in_position > 0
+            in_word = targets_with_character[characters] > targets_with_character_in_position
+            not_in_word = targets_with_character[characters] < number_of_targets
+            number_of_buckets *= correct_position.astype(np.float64) + in_word + not_in_word
+        return np.minimum(number_of_buckets, number_of_targets)
+
+    def get_lower_bounds(self, guess_indices: np.ndarray, target_indices: np.ndarray) -> np.ndarray:
+        """Calculates a cheap lower bound of the score of every guess against the given possible targets.
+
+        If a guess splits the targets in at most `k` buckets (see `_get_number_of_buckets`), its score is minimized
+        when the targets are split evenly between the buckets, so it is at least `log2(n_targets / k)`.
+        """
+        number_of_targets = len(target_indices)
+        number_of_buckets = self._get_number_of_buckets(guess_indices, target_indices)
+        bounds = np.maximum(0.0, np.log2(number_of_targets / number_of_buckets))
+        return bounds - 0.01 * np.isin(guess_indices, target_indices) / number_of_targets
+
+    def calculate_entropy(self, guess_index: int, target_indices: np.ndarray) -> float:
+        """Calculates the average entropy of a single guess against the given possible targets."""
+        return float(self.score_candidates(np.array([guess_index], dtype=np.int64), target_indices)[0])
@@ -0,0 +1,121 @@
+import json
+import threading
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+
+from wordle_solver.cache import CacheStatistics
+
+# How the next word of a turn was found
+SOURCE_SOLVED = "solved"
+SOURCE_STRATEGY = "strategy"
+SOURCE_TRANSPOSITION_CACHE = "transposition_cache"
+SOURCE_SEARCH = "search"
+
+
+@dataclass
+class TurnReport:
+    """What a solver did to find the next word of a turn, i.e. in a call to `WordleSolver.search` or for one of the
+    games of a call to `WordleSolver.get_next_words`.
+
+    Attributes:
+        turn:
+            The number of searches since the solver was reset (or created, or given the profiler), including this one.
+        word:
+            The next word that was found.
+        source:
+            How the word was found: `solved` if there was a single possible word, `strategy` if it was looked up in the
+            precomputed strategies, `transposition_cache` if it was found in the transposition cache, and `search`
+            otherwise.
+        number_of_possible_words:
+            The number of possible words given the clues of the turn.
+        number_of_initial_candidates:
+            The number of initial candidates given by the `SearchSpace`.
+        number_of_follow_up_candidates:
+            The number of follow-up candidates given by the `SearchSpace` for the best initial candidate.
+        number_of_entropy_evaluations:
+            The number of candidates whose entropy was calculated, after removing the equivalent candidates.
+        cache_hits:
+            The number of hits of the cache of the candidate lister (e.g. the `WordleCache` of a `WordleIndex`) since
+            the previous turn, which includes the clues added in between. It is `None` if the candidate lister has no
+            cache with statistics. The lookups of other solvers that share the cache at the same time are counted too.
+            For the games of `get_next_words`, only the lookups to filter the clues of the game are counted.
+        cache_misses:
+            The number of misses of the cache of the candidate lister since the previous turn.
+        completed:
+            Whether every candidate was evaluated within the time budget.
+        phase_seconds:
+            The wall time of each phase of the turn: `filter` to add the clues since the previous turn,
+            `possible_words` to list the possible words, `lookup` to check the precomputed strategies and the
+            transposition cache, and `initial_search` and `follow_up_search` to evaluate the candidates.
+        seconds:
+            The wall time of the search, which excludes the `filter` phase.
+        batch_size:
+            The number of positions (i.e. sets of possible words) whose candidates were scored together by
+            `get_next_words`, which share the wall time of the `initial_search` and `follow_up_search` phases. The games
+            with the same possible words share a single search, and report the same entropy evaluations. It is 1 for
+            `search` and for the words that were not searched.
+        session:
+            The session given to the `SolverProfiler`, to tell apart the reports of different runs.
+    """
+
+    turn: int
+    word: str
+    source: str
+    number_of_possible_words: int
+    number_of_initial_candidates: int = 0
+    number_of_follow_up_candidates: int = 0
+    number_of_entropy_evaluations: int = 0
+    cache_hits: Optional[int] = None
+    cache_misses: Optional[int] = None
+    completed: bool = True
+    phase_seconds: dict[str, float] = field(default_factory=dict)
+    seconds: float = 0.0
+    batch_size: int = 1
+    session: Optional[str] = None
+
+
+def get_statistics_difference(
+    before: Optional[CacheStatistics], after: Optional[CacheStatistics]
+) -> tuple[Optional[int], Optional[int]]:
+    """Returns the number of cache hits and misses between two snapshots of the statistics of a cache."""
+    if after is None:
+        return None, None
+    before = before or CacheStatistics()
+    return after.hits - before.hits, after.misses - before.misses
+
+
+class SolverProfiler:
+    """Collects a `TurnReport` for every search of the solvers it is given to (see the `profiler` of `WordleSolver`).
+
+    The reports can be shared by solvers in different threads, and are optionally appended as JSON lines to a file, so
+    that they can be collected and graphed across sessions.
+
+    Attributes:
+        output_path:
+            Optional path of a JSONL file where each report is appended as soon as it is recorded.
+        session:
+            Optional name stored in every report, to tell apart the reports of different runs in the same file.
+        max_reports:
+            The maximum number of reports kept in memory, after which the oldest ones are dropped.
+    """
+
+    def __init__(self, output_path: Optional[str] = None, session: Optional[str] = None, max_reports: int = 1000):
+        self.output_path = output_path
+        self.session = session
+        self.reports: deque[TurnReport] = deque(maxlen=max_reports)
+        self._lock = threading.Lock()
+
+    def record(self, report: TurnReport):
+        """Records the report of a turn."""
+        report.session = self.session
+        with self._lock:
+            self.reports.append(report)
+            if self.output_path is not None:
+                with open(self.output_path, "a") as file:
+                    file.write(json.dumps(asdict(report)) + "\n")
+
+    def clear(self):
+        """Removes the reports kept in memory."""
+        with self._lock:
+            self.reports.clear()
@@ -1,5 +1,8 @@
+import hashlib
 from typing import Optional
 
+from wordle_solver.heuristics import rank_candidates
+
 
 class SearchSpace:
     """Class used to specify the search space for the Wordle game.
@@ -14,28 +17,80 @@ class SearchSpace:
         max_search_size:
             The maximum number of candidates for which the solver can use all words as the search space.
             This value determines when to use the groups instead of all words.
+        cost_target:
+            An optional number of guess/target evaluations that the solver may spend on each search. If it is set, the
+            groups are not used: instead, all of the words are ranked with `rank_candidates` against the possible
+            words, and only the top `cost_target // current_search_size` of them are evaluated (but at least
+            `min_candidates`), so that more candidates are evaluated when fewer words are possible.
+        min_candidates:
+            The minimum number of candidates to evaluate when `cost_target` is set.
     """
 
-    def __init__(self, all_words: set[str], groups: Optional[dict[str, set[str]]], max_search_size: int = 20):
+    def __init__(
+        self,
+        all_words: set[str],
+        groups: Optional[dict[str, set[str]]],
+        max_search_size: int = 20,
+        cost_target: Optional[int] = None,
+        min_candidates: int = 100,
+    ):
         self.all_words = all_words
         self.groups = groups
         self.max_search_size = max_search_size
+        self.cost_target = cost_target
+        self.min_candidates = min_candidates
+        self._key = None
+
+    def get_key(self) -> str:
+        """Returns a short hash that identifies the words, groups and settings of the search space.
+
+        The key is computed the first time it is requested, so the search space must not be modified afterwards."""
+        if self._key is None:
+            digest = hashlib.sha256(
+                f"{self.max_search_size}\n{self.groups is not None}\n"
+                f"{self.cost_target}\n{self.min_candidates}\n".encode()
+            )
+            digest.update("\n".join(sorted(self.all_words)).encode())
+            for key, group in sorted((self.groups or {}).items()):
+                digest.update(f"\n{key}:{','.join(sorted(group))}".encode())
+            self._key = digest.hexdigest()[:16]
+        return self._key
 
     def _use_all_words(self, current_search_size: int) -> bool:
+        if self.cost_target is not None:
+            return self.get_number_of_candidates(current_search_size) >= len(self.all_words)
         return self.groups is None or current_search_size <= self.max_search_size
 
-    def get_initial_candidates(self, current_search_size: int) -> set[str]:
+    def get_number_of_candidates(self, current_search_size: int) -> int:
+        """Returns the number of top ranked words that are evaluated when `cost_target` is set."""
+        if current_search_size <= self.max_search_size:
+            return len(self.all_words)
+        return max(self.min_candidates, self.cost_target // current_search_size)
+
+    def has_follow_up(self, current_search_size: int) -> bool:
+        """Returns whether the follow-up candidates need to be evaluated after the initial candidates, i.e. whether the
+        groups are used for the current search size."""
+        return self.cost_target is None and not self._use_all_words(current_search_size)
+
+    def get_initial_candidates(self, current_search_size: int, possible_words: Optional[set[str]] = None) -> set[str]:
         """Get the set of initial candidates for the current search size.
 
         Args:
             current_search_size:
                 The current number of candidates that are being considered.
+            possible_words:
+                The set of possible words, which is required to rank the words when `cost_target` is set.
 
         Returns:
             A set of strings containing the candidates for the current search size.
         """
         if self._use_all_words(current_search_size):
             return self.all_words
+        if self.cost_target is not None:
+            if possible_words is None:
+                raise ValueError("The possible words are required to rank the candidates.")
+            ranked_words = rank_candidates(self.all_words, possible_words)
+            return set(ranked_words[: self.get_number_of_candidates(current_search_size)])
         return set(self.groups.keys())
 
     def get_follow_up_candidates(self, best_candidate: str, current_search_size: int) -> set[str]:
@@ -50,6 +105,6 @@ class SearchSpace:
         Returns:
             A set of strings containing the follow-up candidates.
         """
-        if self._use_all_words(current_search_size):
+        if self._use_all_words(current_search_size) or self.cost_target is not None:
             return {best_candidate}
         return self.groups[best_candidate]
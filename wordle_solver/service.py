@@ -0,0 +1,345 @@
+import asyncio
+import json
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from wordle_solver.clue import decode_feedback, format_feedback, parse_feedback
+from wordle_solver.solver import WordleSolver
+
+# Maximum number of possible words that are listed in a response, larger sets are only counted
+MAX_LISTED_WORDS = 50
+MAX_REQUEST_BYTES = 1 << 22
+
+_REASONS = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+}
+
+# Solvers of the current worker, which are created once by `_init_worker` in each process of the pool, or shared by all
+# the threads of a `ThreadPoolExecutor`, and are used by every session
+_worker_state = threading.local()
+
+logger = logging.getLogger(__name__)
+
+
+class _HTTPError(Exception):
+    """An error that is returned to the client with the given status code."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class Session:
+    """The state of a game played through the service, which is only the history of guesses and their feedback.
+
+    Attributes:
+        language: The language of the word list used in the game.
+        turns: The guesses made so far, with their encoded feedback (see `get_feedback`).
+        lock: Serializes the requests that change the history of the session.
+    """
+
+    language: str
+    turns: list[tuple[str, int]] = field(default_factory=list)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+def _create_solvers(solver_factories: dict[str, Callable[[], WordleSolver]]) -> dict[str, WordleSolver]:
+    return {language: factory() for language, factory in solver_factories.items()}
+
+
+def _init_worker(solver_factories: dict[str, Callable[[], WordleSolver]]):
+    """Creates the solver of each language in the worker process."""
+    _worker_state.solvers = _create_solvers(solver_factories)
+
+
+def _set_worker_solvers(solvers: dict[str, WordleSolver]):
+    """Shares the solvers created by the server with the worker thread."""
+    _worker_state.solvers = solvers
+
+
+def _evaluate(language: str, turns: list[tuple[str, int]], time_budget: Optional[float]) -> dict[str, Any]:
+    """Replays the history of a session on a query of the solver of the worker (see `WordleSolver.query`), and searches
+    for the next word to guess."""
+    solver = _worker_state.solvers[language].query()
+    for guess, feedback in turns:
+        solver.add_feedback(guess, feedback)
+    possible_words = solver.get_possible_words()
+    response = {"number_of_possible_words": len(possible_words), "next_word": None, "completed": True}
+    if len(possible_words) <= MAX_LISTED_WORDS:
+        response["possible_words"] = sorted(possible_words)
+    if len(possible_words) > 0:
+        result = solver.search(time_budget)
+        response["next_word"] = result.word
+        response["completed"] = result.completed
+    return response
+
+
+def _get_next_words(language: str, histories: list[list[tuple[str, int]]]) -> list[str]:
+    """Searches for the next word of many games at once with the solver of the worker (see `get_next_words`)."""
+    return _worker_state.solvers[language].get_next_words(
+        [[clue for guess, feedback in turns for clue in decode_feedback(guess, feedback)] for turns in histories]
+    )
+
+
+class SolverService:
+    """A local HTTP/JSON server that plays any number of concurrent games with the same solvers.
+
+    The solver of every language is created once in each worker process, or once for all the worker threads, and every
+    session is only a history of guesses and their feedback, which is replayed on a query of the solver (see
+    `WordleSolver.query`) for each request. The searches run in the pool, so the event loop keeps answering other
+    requests while they run.
+
+    The service exposes the following endpoints, which accept and return JSON objects:
+
+    - `POST /sessions` with `{"language": ...}` starts a game, and returns its `session_id` and the first word to guess.
+    - `GET /sessions/<session_id>` returns the language and the history of the game.
+    - `POST /sessions/<session_id>/feedback` with `{"guess": ..., "feedback": ...}` adds a guess with its feedback in
+      the format of `format_feedback` (e.g. `"gycgg"`), and returns the possible words and the next word to guess. An
+      optional `time_budget` in seconds overrides the one of the service for this search.
+    - `DELETE /sessions/<session_id>` ends a game.
+    - `POST /next-words` with `{"language": ..., "histories": [[{"guess": ..., "feedback": ...}, ...], ...]}` returns
+      the `next_words` of many games at once, without creating sessions (see `WordleSolver.get_next_words`).
+
+    Attributes:
+        solver_factories:
+            A mapping from each language to a picklable function that creates its solver.
+        optimal_starts:
+            The precomputed first guess of each language. The first guess of the languages without one is searched.
+        word_length:
+            The length of the words of the game.
+        n_workers:
+            The number of worker processes. If None, the searches run in `n_threads` threads of the server process,
+            which share a single solver for each language.
+        n_threads:
+            The number of worker threads used when `n_workers` is None.
+        time_budget:
+            The default number of seconds given to each search, or None to evaluate every candidate.
+        max_sessions:
+            The maximum number of sessions kept, after which the least recently used sessions are dropped.
+    """
+
+    def __init__(
+        self,
+        solver_factories: dict[str, Callable[[], WordleSolver]],
+        optimal_starts: Optional[dict[str, str]] = None,
+        word_length: int = 5,
+        n_workers: Optional[int] = None,
+        n_threads: int = 1,
+        time_budget: Optional[float] = None,
+        max_sessions: int = 10_000,
+    ):
+        self.solver_factories = solver_factories
+        self.optimal_starts = optimal_starts or dict()
+        self.word_length = word_length
+        self.n_workers = n_workers
+        self.n_threads = n_threads
+        self.time_budget = time_budget
+        self.max_sessions = max_sessions
+        self._sessions: OrderedDict[str, Session] = OrderedDict()
+        self._executor: Optional[Executor] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Starts the workers and listens for requests.
+
+        Returns:
+            The port the server listens on, which is chosen by the operating system if `port` is 0.
+        """
+        if self.n_workers is None:
+            solvers = await asyncio.get_running_loop().run_in_executor(None, _create_solvers, self.solver_factories)
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.n_threads, initializer=_set_worker_solvers, initargs=(solvers,)
+            )
+        else:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.n_workers, initializer=_init_worker, initargs=(self.solver_factories,)
+            )
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def close(self):
+        """Stops listening for requests and shuts the workers down."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    async def __aenter__(self) -> "SolverService":
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def _evaluate(self, session: Session, turns: list[tuple[str, int]], time_budget: Optional[float]) -> dict:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, _evaluate, session.language, turns, time_budget)
+
+    def _get_session(self, session_id: str) -> Session:
+        session = self._sessions.get(session_id)
+        if session is None:
+            raise _HTTPError(404, f"The session {session_id} does not exist.")
+        self._sessions.move_to_end(session_id)
+        return session
+
+    async def _create_session(self, payload: dict) -> tuple[int, dict]:
+        language = payload.get("language")
+        if language not in self.solver_factories:
+            raise _HTTPError(400, f"The language must be one of {sorted(self.solver_factories)}.")
+        session_id = uuid.uuid4().hex
+        session = Session(language=language)
+        self._sessions[session_id] = session
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+
+        next_word = self.optimal_starts.get(language)
+        if next_word is None:
+            next_word = (await self._evaluate(session, [], self.time_budget))["next_word"]
+        return 201, {"session_id": session_id, "language": language, "next_word": next_word}
+
+    def _parse_turn(self, turn: Any) -> tuple[str, int]:
+        """Validates a `{"guess": ..., "feedback": ...}` object, and returns the guess with its encoded feedback."""
+        if not isinstance(turn, dict):
+            raise _HTTPError(400, "Each turn must be an object with a guess and a feedback.")
+        guess, feedback = turn.get("guess"), turn.get("feedback")
+        if not isinstance(guess, str) or len(guess) != self.word_length:
+            raise _HTTPError(400, f"The guess must be a word with {self.word_length} characters.")
+        if not isinstance(feedback, str) or len(feedback) != self.word_length:
+            raise _HTTPError(400, f"The feedback must have {self.word_length} characters.")
+        try:
+            return guess, parse_feedback(feedback)
+        except ValueError as error:
+            raise _HTTPError(400, str(error))
+
+    async def _add_feedback(self, session_id: str, payload: dict) -> tuple[int, dict]:
+        session = self._get_session(session_id)
+        guess, encoded_feedback = self._parse_turn(payload)
+        time_budget = payload.get("time_budget", self.time_budget)
+        # `bool` is a subclass of `int`, so `true` and `false` have to be rejected explicitly
+        if time_budget is not None and (
+            isinstance(time_budget, bool) or not isinstance(time_budget, (int, float)) or time_budget <= 0
+        ):
+            raise _HTTPError(400, "The time budget must be a positive number of seconds.")
+
+        # The history is only extended once the search succeeds, and concurrent requests for the same session are
+        # handled one after the other so that none of their guesses is lost
+        async with session.lock:
+            turns = session.turns + [(guess, encoded_feedback)]
+            response = await self._evaluate(session, turns, time_budget)
+            session.turns = turns
+        return 200, {"session_id": session_id, "turn": len(turns), **response}
+
+    async def _get_next_words(self, payload: dict) -> tuple[int, dict]:
+        language, histories = payload.get("language"), payload.get("histories")
+        if language not in self.solver_factories:
+            raise _HTTPError(400, f"The language must be one of {sorted(self.solver_factories)}.")
+        if not isinstance(histories, list) or not all(isinstance(turns, list) for turns in histories):
+            raise _HTTPError(400, "The histories must be a list with the list of turns of each game.")
+        histories = [[self._parse_turn(turn) for turn in turns] for turns in histories]
+        loop = asyncio.get_running_loop()
+        next_words = await loop.run_in_executor(self._executor, _get_next_words, language, histories)
+        return 200, {"next_words": next_words}
+
+    def _describe_session(self, session_id: str) -> tuple[int, dict]:
+        session = self._get_session(session_id)
+        history = [
+            {"guess": guess, "feedback": format_feedback(feedback, self.word_length)}
+            for guess, feedback in session.turns
+        ]
+        return 200, {"session_id": session_id, "language": session.language, "history": history}
+
+    def _delete_session(self, session_id: str) -> tuple[int, dict]:
+        self._get_session(session_id)
+        del self._sessions[session_id]
+        return 200, {"session_id": session_id, "deleted": True}
+
+    async def _route(self, method: str, path: str, payload: dict) -> tuple[int, dict]:
+        parts = [part for part in path.split("?", 1)[0].split("/") if part]
+        if parts == ["sessions"]:
+            if method == "POST":
+                return await self._create_session(payload)
+        elif parts == ["next-words"]:
+            if method == "POST":
+                return await self._get_next_words(payload)
+        elif len(parts) == 2 and parts[0] == "sessions":
+            if method == "GET":
+                return self._describe_session(parts[1])
+            if method == "DELETE":
+                return self._delete_session(parts[1])
+        elif len(parts) == 3 and parts[0] == "sessions" and parts[2] == "feedback":
+            if method == "POST":
+                return await self._add_feedback(parts[1], payload)
+        else:
+            raise _HTTPError(404, f"The path {path} does not exist.")
+        raise _HTTPError(405, f"The method {method} is not allowed for {path}.")
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            try:
+                method, path, payload = await _read_request(reader)
+                status, response = await self._route(method, path, payload)
+            except _HTTPError as error:
+                status, response = error.status, {"error": str(error)}
+            except ValueError as error:
+                status, response = 400, {"error": str(error)}
+            except Exception:
+                logger.exception("Failed to handle a request.")
+                status, response = 500, {"error": "Internal server error."}
+            body = json.dumps(response).encode()
+            reason = _REASONS.get(status, "Error")
+            writer.write(
+                f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+                + body
+            )
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def _read_request(reader: asyncio.StreamReader) -> tuple[str, str, dict]:
+    """Reads the method, path and JSON body of an HTTP request."""
+    request_line = (await reader.readline()).decode("latin-1").split()
+    if len(request_line) != 3:
+        raise _HTTPError(400, "Malformed request line.")
+    method, path, _ = request_line
+    content_length = 0
+    while True:
+        line = (await reader.readline()).decode("latin-1").strip()
+        if not line:
+            break
+        name, _, value = line.partition(":")
+        if name.strip().lower() == "content-length":
+            if not value.strip().isdigit():
+                raise _HTTPError(400, "Malformed Content-Length header.")
+            content_length = int(value)
+    if content_length > MAX_REQUEST_BYTES:
+        raise _HTTPError(400, "The request body is too large.")
+
+    payload = dict()
+    if content_length > 0:
+        try:
+            payload = json.loads(await reader.readexactly(content_length))
+        except json.JSONDecodeError:
+            raise _HTTPError(400, "The request body must be a JSON object.")
+        if not isinstance(payload, dict):
+            raise _HTTPError(400, "The request body must be a JSON object.")
+    return method.upper(), path, payload
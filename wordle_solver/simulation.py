@@ -0,0 +1,338 @@
+import hashlib
+import json
+import os
+import pickle as pkl
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Iterator, Optional
+
+from wordle_solver.cache import POSITION_KEY_VERSION, WordleCache
+from wordle_solver.clue import get_feedback
+from wordle_solver.constraints import ConstraintIndex
+from wordle_solver.pattern_store import PatternStore
+from wordle_solver.search_space import SearchSpace
+from wordle_solver.solver import WordleSolver
+from wordle_solver.strategy_tree import load_precomputed_strategies
+from wordle_solver.wordle_index import WordleIndex
+
+# Solver of the current worker process, which is set by `_init_worker`
+_worker_solver: Optional[WordleSolver] = None
+
+
+@dataclass
+class GameResult:
+    """The result of playing a single game against a hidden target word.
+
+    Attributes:
+        stalled:
+            Whether the game was stopped because the solver repeated a guess, or a guess did not narrow down the
+            possible words, which means that it would never find the target.
+    """
+
+    target: str
+    guesses: list[str]
+    solved: bool
+    seconds: float
+    stalled: bool = False
+
+    @property
+    def number_of_guesses(self) -> int:
+        return len(self.guesses)
+
+
+@dataclass
+class SimulationReport:
+    """Summary of a batch of games.
+
+    Attributes:
+        number_of_games:
+            The number of games that were played.
+        guess_distribution:
+            A mapping from the number of guesses to the number of games that were solved with that many guesses.
+        failures:
+            The targets that were not solved within the maximum number of guesses.
+        stalled:
+            The targets of the games where the solver stopped making progress (see `GameResult.stalled`), which are
+            also failures.
+        seconds:
+            The wall time of the simulation, only counting the games played in this run.
+        games_played:
+            The number of games played in this run, which excludes the games resumed from a previous run.
+    """
+
+    number_of_games: int = 0
+    guess_distribution: dict[int, int] = field(default_factory=dict)
+    failures: list[str] = field(default_factory=list)
+    stalled: list[str] = field(default_factory=list)
+    seconds: float = 0.0
+    games_played: int = 0
+
+    @property
+    def games_per_second(self) -> float:
+        return self.games_played / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def average_guesses(self) -> float:
+        total = sum(guesses * games for guesses, games in self.guess_distribution.items())
+        return total / max(1, sum(self.guess_distribution.values()))
+
+    def __str__(self) -> str:
+        lines = [f"Games: {self.number_of_games}"]
+        lines += [f"  {guesses} guesses: {games}" for guesses, games in sorted(self.guess_distribution.items())]
+        lines.append(f"Average guesses: {self.average_guesses:.4f}")
+        lines.append(f"Failures: {len(self.failures)}")
+        if self.stalled:
+            lines.append(f"Stalled games: {len(self.stalled)} ({', '.join(self.stalled[:10])})")
+        lines.append(
+            f"Games per second: {self.games_per_second:.2f} ({self.games_played} games in {self.seconds:.1f}s)"
+        )
+        return "\n".join(lines)
+
+
+def load_optimal_start(language: str, static_directory: str = "static") -> str:
+    """Loads the precomputed optimal first guess for a language."""
+    with open(os.path.join(static_directory, "optimal_starts.json"), "r") as file:
+        return json.load(file)[language]
+
+
+def load_solver(
+    language: str,
+    static_directory: str = "static",
+    word_length: int = 5,
+    cost_target: Optional[int] = None,
+    precomputed: bool = True,
+    constraint_filter: bool = False,
+    **solver_kwargs,
+) -> tuple[WordleSolver, str]:
+    """Loads the solver for a language from the word list, the groups and the pattern matrix in `static_directory`.
+
+    Unlike `main.py`, the words are not loaded from the memory-mapped bundle. The `cost_target` is passed to the
+    `SearchSpace`, and the rest of the keyword arguments to the `WordleSolver`.
+
+    Args:
+        precomputed:
+            Whether the solver uses the precomputed strategies of `load_precomputed_strategies`, as `main.py` does.
+            Simulations, benchmarks and `build_tree.py` turn it off, so that every next word is searched.
+        constraint_filter:
+            Whether the words are filtered with a `ConstraintIndex`, which checks the whole clue history against the
+            words at once, instead of a `WordleIndex`.
+
+    Returns:
+        A tuple containing the solver and the optimal start for the language.
+    """
+    optimal_start = load_optimal_start(language, static_directory)
+    with open(os.path.join(static_directory, f"wordlist_{language}.txt"), "r") as file:
+        words = file.read().splitlines()
+    groups_path = os.path.join(static_directory, f"groups_{language}.pickle")
+    groups = None
+    if os.path.exists(groups_path):
+        with open(groups_path, "rb") as file:
+            groups = pkl.load(file)
+
+    search_space = SearchSpace(all_words=set(words), groups=groups, cost_target=cost_target)
+    if constraint_filter:
+        candidate_lister = ConstraintIndex(words=words, word_length=word_length)
+    else:
+        candidate_lister = WordleIndex(words=words, word_length=word_length, cache=WordleCache())
+    pattern_matrix = PatternStore(directory=static_directory, name=language).get_pattern_matrix(words, word_length)
+    solver_kwargs.setdefault("verbose", False)
+    if precomputed:
+        solver_kwargs = {
+            **load_precomputed_strategies(language, words, search_space, word_length, static_directory),
+            **solver_kwargs,
+        }
+    solver = WordleSolver(
+        candidate_lister=candidate_lister, search_space=search_space, pattern_matrix=pattern_matrix, **solver_kwargs
+    )
+    return solver, optimal_start
+
+
+def play_game(solver: WordleSolver, target: str, first_guess: str, max_guesses: int = 6, guess_limit: int = 20):
+    """Plays a game against the given target, starting with `first_guess` and following the solver afterwards.
+
+    The game is played until the target is guessed or `guess_limit` guesses are made, so that the number of guesses is
+    also known for the games that take more than `max_guesses`. The game is stopped, and flagged as stalled, as soon as
+    the solver repeats a guess or a guess does not narrow down the possible words, since the solver would then never
+    find the target.
+    """
+    start_time = time.perf_counter()
+    solver.reset()
+    guesses = []
+    guess = first_guess
+    number_of_possible_words = len(solver.get_possible_words())
+    stalled = False
+    while len(guesses) < guess_limit:
+        guesses.append(guess)
+        if guess == target:
+            break
+        solver.add_feedback(guess, get_feedback(guess, target))
+        previous_number_of_possible_words = number_of_possible_words
+        number_of_possible_words = len(solver.get_possible_words())
+        guess = solver.get_next_word()
+        if number_of_possible_words >= previous_number_of_possible_words or guess in guesses:
+            stalled = True
+            break
+
+    solved = guesses[-1] == target and len(guesses) <= max_guesses
+    return GameResult(
+        target=target, guesses=guesses, solved=solved, seconds=time.perf_counter() - start_time, stalled=stalled
+    )
+
+
+def _init_worker(solver_factory: Callable[[], WordleSolver]):
+    """Creates the solver of the worker process."""
+    global _worker_solver
+    _worker_solver = solver_factory()
+
+
+def _play_games(targets: list[str], first_guess: str, max_guesses: int) -> list[GameResult]:
+    """Plays a chunk of games in the worker process."""
+    return [play_game(_worker_solver, target, first_guess, max_guesses) for target in targets]
+
+
+def read_results(path: str) -> list[GameResult]:
+    """Reads the results of the games that were already played from a JSONL file."""
+    if not os.path.exists(path):
+        return []
+    with open(path, "r") as file:
+        return [GameResult(**json.loads(line)) for line in file if line.strip()]
+
+
+def get_run_path(output_path: str) -> str:
+    """Returns the path of the file that describes the run whose results are in `output_path`."""
+    return f"{output_path}.run.json"
+
+
+def _get_run(targets: list[str], first_guess: str, max_guesses: int, config: Optional[dict]) -> dict:
+    """Describes a run of the simulation, so that its results are only resumed by an identical run."""
+    run = {
+        "targets_key": hashlib.sha256("\n".join(targets).encode()).hexdigest()[:16],
+        "first_guess": first_guess,
+        "max_guesses": max_guesses,
+        "position_key_version": POSITION_KEY_VERSION,
+        "config": config or dict(),
+    }
+    # The run is compared with the one read from its file, where e.g. the tuples are lists
+    return json.loads(json.dumps(run))
+
+
+def _iter_results(
+    targets: list[str],
+    solver_factory: Callable[[], WordleSolver],
+    first_guess: str,
+    max_guesses: int,
+    n_workers: int,
+    chunk_size: int,
+) -> Iterator[list[GameResult]]:
+    """Plays the games and yields their results chunk by chunk, as soon as each chunk is done."""
+    chunks = [targets[start : start + chunk_size] for start in range(0, len(targets), chunk_size)]
+    if n_workers == 1:
+        _init_worker(solver_factory)
+        for chunk in chunks:
+            yield _play_games(chunk, first_guess, max_guesses)
+        return
+
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker, initargs=(solver_factory,)) as executor:
+        futures = [executor.submit(_play_games, chunk, first_guess, max_guesses) for chunk in chunks]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def run_simulation(
+    targets: list[str],
+    output_path: str,
+    solver_factory: Callable[[], WordleSolver],
+    first_guess: str,
+    max_guesses: int = 6,
+    n_workers: Optional[int] = None,
+    chunk_size: int = 16,
+    progress: Optional[Callable[[int], None]] = None,
+    config: Optional[dict] = None,
+) -> SimulationReport:
+    """Plays a game for every target and streams the results to a JSONL file.
+
+    The targets that already have a result in `output_path` are skipped, so that an interrupted run can be resumed. The
+    run is described next to the results (see `get_run_path`) by the targets, the first guess, the maximum number of
+    guesses, the version of the solver and `config`, and the results are only resumed by a run with the same
+    description, so that the results of different configurations are never mixed.
+
+    Args:
+        targets:
+            The hidden words to play against.
+        output_path:
+            The path of the JSONL file where the result of each game is appended.
+        solver_factory:
+            A picklable function that creates the solver, which is called once in each worker process.
+        first_guess:
+            The first word guessed in every game.
+        max_guesses:
+            The maximum number of guesses for a game to count as solved.
+        n_workers:
+            The number of worker processes. Defaults to the number of cores.
+        chunk_size:
+            The number of games played by each task.
+        progress:
+            An optional callback that receives the number of games finished after each chunk, and the number of games
+            resumed from `output_path` at the start.
+        config:
+            A JSON-serializable description of the configuration of the solvers created by `solver_factory` (e.g. the
+            language and the search space settings).
+
+    Returns:
+        The report of all of the games in `output_path`, including the resumed ones.
+
+    Raises:
+        ValueError: If `output_path` has results of a run with a different description.
+    """
+    run = _get_run(targets, first_guess, max_guesses, config)
+    run_path = get_run_path(output_path)
+    results = read_results(output_path)
+    if results:
+        previous_run = None
+        if os.path.exists(run_path):
+            with open(run_path, "r") as file:
+                previous_run = json.load(file)
+        if previous_run != run:
+            raise ValueError(
+                f"The results in {output_path} were played by a different run, so they cannot be resumed. Remove them "
+                "or choose another output path."
+            )
+    with open(run_path, "w") as file:
+        json.dump(run, file, indent=2)
+    finished_targets = {result.target for result in results}
+    pending_targets = [target for target in targets if target not in finished_targets]
+    n_workers = n_workers or os.cpu_count() or 1
+    if progress is not None and len(pending_targets) < len(targets):
+        progress(len(targets) - len(pending_targets))
+
+    start_time = time.perf_counter()
+    games_played = 0
+    with open(output_path, "a") as file:
+        for chunk_results in _iter_results(
+            pending_targets, solver_factory, first_guess, max_guesses, n_workers, chunk_size
+        ):
+            for result in chunk_results:
+                file.write(json.dumps(asdict(result)) + "\n")
+            file.flush()
+            results.extend(chunk_results)
+            games_played += len(chunk_results)
+            if progress is not None:
+                progress(len(chunk_results))
+
+    report = summarize(results)
+    report.seconds = time.perf_counter() - start_time
+    report.games_played = games_played
+    return report
+
+
+def summarize(results: list[GameResult]) -> SimulationReport:
+    """Summarizes the results of a batch of games."""
+    distribution = Counter(result.number_of_guesses for result in results if result.guesses[-1] == result.target)
+    return SimulationReport(
+        number_of_games=len(results),
+        guess_distribution=dict(sorted(distribution.items())),
+        failures=[result.target for result in results if not result.solved],
+        stalled=[result.target for result in results if result.stalled],
+    )
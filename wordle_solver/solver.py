@@ -1,36 +1,151 @@
+import copy
+import hashlib
+import itertools
 import math
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Iterable, Optional
 
-from tqdm import tqdm
+import numpy as np
 
+from wordle_solver.cache import POSITION_KEY_VERSION, Cache, CacheStatistics
 from wordle_solver.candidates import CandidateLister
-from wordle_solver.clue import Clue
+from wordle_solver.clue import Clue, decode_feedback, format_feedback, get_distinct_guesses, get_feedback
+from wordle_solver.heuristics import rank_candidates
+from wordle_solver.patterns import BOUND_TOLERANCE, PatternMatrix
+from wordle_solver.profiling import (
+    SOURCE_SEARCH,
+    SOURCE_SOLVED,
+    SOURCE_STRATEGY,
+    SOURCE_TRANSPOSITION_CACHE,
+    SolverProfiler,
+    TurnReport,
+    get_statistics_difference,
+)
 from wordle_solver.search_space import SearchSpace
+from wordle_solver.strategy_tree import StrategyTree, split_guesses
+
+# Maximum number of possible words for which the candidates are deduplicated when scoring with a pattern matrix. Above
+# it, there are few equivalent candidates and grouping them costs about as much as scoring them.
+MAX_DEDUPLICATION_TARGETS = 64
+# Maximum number of sets of possible words that are scored at once by `get_next_words`, which bounds the size of the
+# matrix of scores to this many rows
+BATCH_SIZE = 64
+# The phases of a search that are timed in the reports of the profiler, in the order in which they run
+PHASES = ["possible_words", "lookup", "initial_search", "follow_up_search"]
+
+
+def _track_progress(iterable: Iterable, verbose: bool, **kwargs) -> Iterable:
+    """Wraps the iterable in a progress bar if `verbose` is set. `tqdm` is only imported then, since it is slow to
+    import."""
+    if not verbose:
+        return iterable
+    from tqdm import tqdm
+
+    return tqdm(iterable, **kwargs)
+
+
+@dataclass
+class SearchResult:
+    """The result of a search for the next word.
+
+    Attributes:
+        word: The best word found.
+        completed: Whether every candidate was scored, in which case the word is the same as without a time budget.
+        number_of_scored_candidates: The number of candidates whose entropy was calculated, after leaving out the
+            candidates that are equivalent to another one.
+        seconds: The time spent in the search.
+    """
+
+    word: str
+    completed: bool
+    number_of_scored_candidates: int
+    seconds: float
 
 
 class WordleSolver:
     """A class that uses Entropy to solve Wordle.
 
     The algorithm works by calculating the expected entropy of each guess, and then selecting the guess that minimizes
-    the expected entropy. This assumes that each valid word is equally likely to be the target word."""
+    the expected entropy. This assumes that each valid word is equally likely to be the target word.
+
+    If a `PatternMatrix` is given, the entropy of each candidate is computed from the precomputed feedback patterns
+    instead of replaying the clues through the candidate lister for every possible target. In that case, `n_workers`
+    can be set to score the candidates in parallel across a pool of processes, which returns the same best word as
+    scoring them serially. Call `close` to stop the workers when the solver is no longer needed.
+
+    Setting `prune` enables a branch-and-bound search (in the main process) that evaluates the most promising candidates
+    first and abandons a candidate as soon as a bound shows that it cannot beat the best one found so far. The result is
+    the same as evaluating every candidate.
+
+    If a `StrategyTree` is given, the next word is looked up on the tree whenever the clues follow one of its branches,
+    and the search is only done for the clues that are not on the tree. Similarly, `second_guesses` maps a first guess
+    to the precomputed second guess for each feedback (formatted with `format_feedback`), and is consulted right after
+    the first guess.
+
+    If a `transposition_cache` is given, the result of each search is stored under a key of the set of possible words
+    and the search space (see `get_position_key`), so that any clue history that leads to the same possible words is
+    answered from the cache. A `SQLiteCache` (or a `LayeredCache` in front of one) shares the results across
+    processes.
+
+    If a `SolverProfiler` is given, every search (and every game of `get_next_words`) records a `TurnReport` with the
+    number of possible words and candidates, the cache hits and misses and the wall time of each phase of the turn.
+    Without one, the solver only keeps the timestamps that it already takes for the time budget.
 
-    def __init__(self, candidate_lister: CandidateLister, search_space: SearchSpace, verbose: bool = True):
+    The clues of a game are kept in the candidate lister and in the solver itself, so a solver plays one game at a
+    time. To play several games at the same time (e.g. one per thread), `query` returns a lightweight solver for each
+    game that shares the word list, the search space, the pattern matrix and the caches with this one."""
+
+    def __init__(
+        self,
+        candidate_lister: CandidateLister,
+        search_space: SearchSpace,
+        verbose: bool = True,
+        pattern_matrix: Optional[PatternMatrix] = None,
+        n_workers: Optional[int] = None,
+        prune: bool = False,
+        strategy_tree: Optional[StrategyTree] = None,
+        second_guesses: Optional[dict[str, dict[str, str]]] = None,
+        transposition_cache: Optional[Cache[str, str]] = None,
+        profiler: Optional[SolverProfiler] = None,
+    ):
+        if n_workers is not None and pattern_matrix is None:
+            raise ValueError("A pattern matrix is required to score the candidates in parallel.")
+        if prune and pattern_matrix is None:
+            raise ValueError("A pattern matrix is required to prune the candidates.")
         self.candidate_lister = candidate_lister
         self.search_space = search_space
         self.verbose = verbose
+        self.pattern_matrix = pattern_matrix
+        self.prune = prune
+        self.strategy_tree = strategy_tree
+        self.second_guesses = second_guesses
+        self.transposition_cache = transposition_cache
+        self.profiler = profiler
+        self._parallel_scorer = None
+        if n_workers is not None:
+            # Imported here so that `multiprocessing` is only loaded when the candidates are scored in parallel
+            from wordle_solver.parallel import ParallelScorer
+
+            self._parallel_scorer = ParallelScorer(pattern_matrix, n_workers)
         self._clues = []
+        self._number_of_scored_candidates = 0
 
-    def _get_clues(self, guess: str, target: str) -> list[Clue]:
-        """Get the clues for the given guess and target."""
-        clues = []
-        for index, character in enumerate(guess):
-            if character == target[index]:
-                clues.append(Clue(character=character, position=index, correct_position=True, in_word=True))
-            elif character in target:
-                clues.append(Clue(character=character, position=index, correct_position=False, in_word=True))
-            else:
-                clues.append(Clue(character=character, position=index, correct_position=False, in_word=False))
+    @property
+    def profiler(self) -> Optional[SolverProfiler]:
+        """The profiler that records the report of each search, if any. Attaching one starts the turn count and the
+        cache statistics of its reports from the current state."""
+        return self._profiler
 
-        return clues
+    @profiler.setter
+    def profiler(self, profiler: Optional[SolverProfiler]):
+        self._profiler = profiler
+        self._reset_profile()
+
+    def _get_feedback(self, guess: str, target: str) -> int:
+        """Get the feedback for the given guess and target, encoded as an integer."""
+        return get_feedback(guess, target)
 
     def _calculate_entropy(self, candidate_guess: str, all_possible_words: set[str]) -> float:
         """Calculates the average entropy of a candidate guess.
@@ -49,10 +164,11 @@ class WordleSolver:
         """
         entropies = []
         for possible_word in all_possible_words:
-            self.candidate_lister.reset_clues()
-            self.candidate_lister.add_clues(self._clues)
-            self.candidate_lister.add_clues(self._get_clues(candidate_guess, possible_word))
+            # The candidate lister always holds the committed clues, so the hypothetical clues are rolled back after
+            # each evaluation instead of replaying the history.
+            self.candidate_lister.push_state()
             try:
+                self.candidate_lister.add_feedback(candidate_guess, self._get_feedback(candidate_guess, possible_word))
                 possible_words = self.candidate_lister.get_possible_words()
                 # If there's only one possible word, favor guessing that word by setting it to a smaller value
                 if len(possible_words) == 1 and list(possible_words)[0] == candidate_guess:
@@ -62,13 +178,145 @@ class WordleSolver:
                 entropies.append(entropy)
             except ValueError:
                 print("Error in entropy calculation.")
+            finally:
+                self.candidate_lister.pop_state()
 
         return sum(entropies) / len(entropies)
 
+    def _calculate_entropies(self, candidates: list[str], possible_words: set[str]) -> np.ndarray:
+        """Calculates the average entropy of every candidate at once using the pattern matrix.
+
+        Args:
+            candidates:
+                The list of candidates for which we want to calculate the entropy.
+            possible_words:
+                The set of all possible words that we are considering.
+
+        Returns:
+            An array with the average entropy of each candidate, in the same order as `candidates`.
+        """
+        candidate_indices = self.pattern_matrix.get_indices(candidates)
+        possible_indices = self.pattern_matrix.get_indices(possible_words)
+        if self._parallel_scorer is not None:
+            chunks = _track_progress(
+                self._parallel_scorer.iter_scores(candidate_indices, possible_indices),
+                self.verbose,
+                total=self._parallel_scorer.get_number_of_chunks(len(candidate_indices)),
+            )
+            return np.concatenate([np.empty(0, dtype=np.float64), *chunks])
+
+        block_size = self.pattern_matrix.get_block_size(len(possible_indices))
+        starts = range(0, len(candidate_indices), block_size)
+        return np.concatenate(
+            [
+                self.pattern_matrix.score_candidates(candidate_indices[start : start + block_size], possible_indices)
+                for start in _track_progress(starts, self.verbose)
+            ]
+        )
+
+    def _get_best_candidate_with_pruning(self, candidates: list[str], possible_words: set[str]) -> str:
+        """Finds the candidate with the lowest entropy using branch-and-bound.
+
+        The candidates are evaluated in blocks, sorted by a cheap lower bound of their entropy (see
+        `PatternMatrix.get_lower_bounds`). Blocks whose bounds are above the best entropy found so far are skipped, and
+        within a block, the candidates are abandoned as soon as their partial bucket counts exceed it.
+
+        Args:
+            candidates:
+                A sorted list of candidates to evaluate.
+            possible_words:
+                The set of possible words to still remaining, which we evaluate the candidates against.
+
+        Returns:
+            The best candidate, which is the same as the one found by evaluating every candidate.
+        """
+        candidate_indices = self.pattern_matrix.get_indices(candidates)
+        possible_indices = self.pattern_matrix.get_indices(possible_words)
+        lower_bounds = self.pattern_matrix.get_lower_bounds(candidate_indices, possible_indices)
+        order = np.argsort(lower_bounds, kind="stable")
+
+        entropies = np.full(len(candidates), np.inf)
+        min_entropy = np.inf
+        block_size = self.pattern_matrix.get_block_size(len(possible_indices))
+        for start in range(0, len(order), block_size):
+            block = order[start : start + block_size]
+            block = block[lower_bounds[block] <= min_entropy + BOUND_TOLERANCE]
+            if len(block) == 0:
+                # The candidates are sorted by their bounds, so none of the remaining ones can be better
+                break
+            entropies[block] = self.pattern_matrix.score_candidates_with_bound(
+                candidate_indices[block], possible_indices, min_entropy
+            )
+            min_entropy = min(min_entropy, float(entropies[block].min()))
+
+        return candidates[int(np.argmin(entropies))]
+
+    def close(self):
+        """Stops the worker processes used to score the candidates in parallel, if any."""
+        if self._parallel_scorer is not None:
+            self._parallel_scorer.close()
+
+    def reset(self):
+        """Removes all of the clues from the solver, so that it can be used for a new game."""
+        self._clues = []
+        self.candidate_lister.reset_clues()
+        self._reset_profile()
+
+    def query(self, clues: Iterable[Clue] = ()) -> "WordleSolver":
+        """Returns a solver for a new game with the given clues, which shares everything but the clues with this one.
+
+        The candidate lister of the new solver is a query on the same words (see `CandidateLister.query`), so neither
+        solver sees the clues of the other and both can search at the same time from different threads. The solvers
+        also share the workers of `n_workers`, which are stopped by `close` on any of them.
+        """
+        clues = list(clues)
+        solver = copy.copy(self)
+        # The profile starts before the clues are filtered, so that the first report includes them
+        solver._reset_profile()
+        start_time = time.perf_counter() if self.profiler is not None else None
+        solver.candidate_lister = self.candidate_lister.query(clues)
+        if start_time is not None:
+            solver._filter_seconds = time.perf_counter() - start_time
+        solver._clues = clues
+        solver._number_of_scored_candidates = 0
+        return solver
+
+    def _reset_profile(self):
+        """Starts the turn count and the cache statistics of the reports of the profiler from the current state."""
+        self._turn = 0
+        self._filter_seconds = 0.0
+        self._cache_statistics = self._get_cache_statistics() if self.profiler is not None else None
+
+    def _get_cache_statistics(self) -> Optional[CacheStatistics]:
+        """Returns the statistics of the cache of the candidate lister, or `None` if it does not keep any."""
+        get_statistics = getattr(getattr(self.candidate_lister, "cache", None), "get_statistics", None)
+        return get_statistics() if get_statistics is not None else None
+
     def add_clues(self, clues: list[Clue]):
         """Adds a set of clues to the solver."""
+        start_time = time.perf_counter() if self.profiler is not None else None
         self._clues.extend(clues)
         self.candidate_lister.add_clues(clues)
+        if start_time is not None:
+            self._filter_seconds += time.perf_counter() - start_time
+
+    def add_feedback(self, guess: str, feedback: int):
+        """Adds the feedback of a guess, encoded as in `encode_feedback`, to the solver."""
+        start_time = time.perf_counter() if self.profiler is not None else None
+        self._clues.extend(decode_feedback(guess, feedback))
+        self.candidate_lister.add_feedback(guess, feedback)
+        if start_time is not None:
+            self._filter_seconds += time.perf_counter() - start_time
+
+    def _get_distinct_candidates(self, sorted_candidates: list[str], possible_words: set[str]) -> list[str]:
+        """Keeps the first candidate of each class of candidates that get the same feedback from every possible word
+        (see `get_distinct_guesses`). Equivalent candidates have the same entropy, so the best candidate is the same.
+
+        With a pattern matrix, the candidates are only deduplicated for up to `MAX_DEDUPLICATION_TARGETS` possible
+        words, while the (much slower) candidate lister is always given the distinct candidates only."""
+        if self.pattern_matrix is not None and len(possible_words) > MAX_DEDUPLICATION_TARGETS:
+            return sorted_candidates
+        return get_distinct_guesses(sorted_candidates, possible_words)
 
     def _get_best_candidate(self, candidates: set[str], possible_words: set[str]) -> str:
         """Evaluate the candidates against the possible words to get the best candidate.
@@ -82,42 +330,402 @@ class WordleSolver:
         Returns:
             A tuple containing the best candidate and the entropy of that candidate.
         """
+        # Candidates are sorted so that ties are always broken in the same way
+        sorted_candidates = self._get_distinct_candidates(sorted(candidates), possible_words)
+        self._number_of_scored_candidates += len(sorted_candidates)
+        if self.prune:
+            return self._get_best_candidate_with_pruning(sorted_candidates, possible_words)
+        if self.pattern_matrix is not None:
+            entropies = self._calculate_entropies(sorted_candidates, possible_words)
+            return sorted_candidates[int(np.argmin(entropies))]
+
         best_candidate = ""
         min_entropy = float("inf")
-        iterable = tqdm(candidates) if self.verbose else candidates
-        for candidate in iterable:
+        for candidate in _track_progress(sorted_candidates, self.verbose):
             entropy = self._calculate_entropy(candidate, possible_words)
             if entropy < min_entropy:
                 min_entropy = entropy
                 best_candidate = candidate
         return best_candidate
 
-    def get_next_word(self) -> str:
-        """Returns the next word that should be guessed. This is the word that minimizes the expected entropy of the
-        possible words."""
+    def _get_best_candidates(self, searches: list[tuple["WordleSolver", set[str], set[str]]]) -> list[str]:
+        """Batch version of `_get_best_candidate`, which returns the best candidate of each `(solver, candidates,
+        possible words)` search, where the solver is a `query` with the clues that lead to the possible words.
+
+        With a pattern matrix, the searches with the same candidates are scored together against all of their sets of
+        possible words (see `PatternMatrix.score_candidates_for_target_sets`). The candidates are not deduplicated,
+        since the first of the equivalent candidates is the one that `_get_best_candidate` keeps, so the best candidate
+        is the same. Otherwise, and when pruning or scoring in parallel, each search is done separately by its solver.
+        """
+        if self.pattern_matrix is None or self.prune or self._parallel_scorer is not None:
+            return [
+                solver._get_best_candidate(candidates, possible_words)
+                for solver, candidates, possible_words in searches
+            ]
+
+        best_candidates = [""] * len(searches)
+        searches_by_candidates = defaultdict(list)
+        for search_index, (_, candidates, _) in enumerate(searches):
+            if len(candidates) == 1:
+                (best_candidates[search_index],) = candidates
+            else:
+                searches_by_candidates[frozenset(candidates)].append(search_index)
+
+        for candidates, search_indices in searches_by_candidates.items():
+            # Candidates are sorted so that ties are always broken in the same way
+            sorted_candidates = sorted(candidates)
+            candidate_indices = self.pattern_matrix.get_indices(sorted_candidates)
+            for start in range(0, len(search_indices), BATCH_SIZE):
+                batch = search_indices[start : start + BATCH_SIZE]
+                target_index_sets = [self.pattern_matrix.get_indices(searches[index][2]) for index in batch]
+                scores = self.pattern_matrix.score_candidates_for_target_sets(candidate_indices, target_index_sets)
+                for search_index, best_index in zip(batch, np.argmin(scores, axis=1).tolist()):
+                    best_candidates[search_index] = sorted_candidates[best_index]
+                    searches[search_index][0]._number_of_scored_candidates += len(sorted_candidates)
+        return best_candidates
+
+    def _get_best_candidate_before(
+        self, candidates: set[str], possible_words: set[str], deadline: float
+    ) -> tuple[str, bool, int]:
+        """Evaluate the candidates from the most to the least promising one (see `rank_candidates`) until the deadline.
+
+        At least one candidate is always evaluated. Ties are broken alphabetically, as in `_get_best_candidate`, so if
+        every candidate is evaluated before the deadline the result is the same. The candidates are scored in the main
+        process, by blocks if there is a pattern matrix, and the deadline is checked after each block.
+
+        Args:
+            candidates:
+                A set of candidates to evaluate.
+            possible_words:
+                The set of possible words to still remaining, which we evaluate the candidates against.
+            deadline:
+                The time, as given by `time.perf_counter`, at which the search must stop.
+
+        Returns:
+            A tuple containing the best candidate, whether every candidate was evaluated, and the number of evaluated
+            candidates.
+        """
+        ranked_candidates = rank_candidates(
+            self._get_distinct_candidates(sorted(candidates), possible_words), possible_words
+        )
+        best_candidate = ""
+        min_entropy = float("inf")
+        number_of_scored_candidates = 0
+        if self.pattern_matrix is not None:
+            candidate_indices = self.pattern_matrix.get_indices(ranked_candidates)
+            possible_indices = self.pattern_matrix.get_indices(possible_words)
+            block_size = self.pattern_matrix.get_block_size(len(possible_indices))
+            for start in range(0, len(ranked_candidates), block_size):
+                if number_of_scored_candidates > 0 and time.perf_counter() >= deadline:
+                    break
+                entropies = self.pattern_matrix.score_candidates(
+                    candidate_indices[start : start + block_size], possible_indices
+                )
+                for candidate, entropy in zip(ranked_candidates[start : start + block_size], entropies.tolist()):
+                    if (entropy, candidate) < (min_entropy, best_candidate):
+                        min_entropy, best_candidate = entropy, candidate
+                number_of_scored_candidates += len(entropies)
+        else:
+            for candidate in ranked_candidates:
+                if number_of_scored_candidates > 0 and time.perf_counter() >= deadline:
+                    break
+                entropy = self._calculate_entropy(candidate, possible_words)
+                if (entropy, candidate) < (min_entropy, best_candidate):
+                    min_entropy, best_candidate = entropy, candidate
+                number_of_scored_candidates += 1
+        return best_candidate, number_of_scored_candidates == len(ranked_candidates), number_of_scored_candidates
+
+    def _lookup_next_word(self) -> Optional[str]:
+        """Looks up the next word in the precomputed strategies, returning `None` if the clues are not in them."""
+        if self.strategy_tree is not None:
+            word = self.strategy_tree.get_next_word(self._clues)
+            if word is not None:
+                return word
+        if self.second_guesses is not None and self._clues:
+            turns = split_guesses(self._clues, len(self._clues))
+            if turns is not None:
+                ((guess, feedback),) = turns
+                return self.second_guesses.get(guess, {}).get(format_feedback(feedback, len(guess)))
+        return None
+
+    def get_position_key(self, possible_words: set[str]) -> str:
+        """Returns a key that identifies the position of the game by the possible words and the search space.
+
+        Two clue histories with the same key have the same next word, regardless of the clues that led to them. The
+        key also contains `POSITION_KEY_VERSION`, and the search space key contains the word list."""
+        digest = hashlib.sha256(f"{POSITION_KEY_VERSION}\n{self.search_space.get_key()}".encode())
+        digest.update("\n".join(sorted(possible_words)).encode())
+        return digest.hexdigest()[:32]
+
+    def search(self, time_budget: Optional[float] = None) -> SearchResult:
+        """Searches for the next word that should be guessed. This is the word that minimizes the expected entropy of
+        the possible words.
+
+        Args:
+            time_budget:
+                Optional number of seconds after which the search stops and returns the best word found so far. The
+                candidates are then evaluated from the most to the least promising one, and, when the search space uses
+                groups, the initial candidates get at most half of the budget so that there is time left for the
+                follow-up candidates. Without a budget, every candidate is evaluated.
+
+        Returns:
+            The result of the search. Words looked up in the precomputed strategies or in the transposition cache count
+            as completed searches without scored candidates, and only completed searches are stored in the cache.
+        """
+        start_time = time.perf_counter()
         possible_words = self.get_possible_words()
         if len(possible_words) == 0:
             raise ValueError("No possible words given the current clues.")
-        elif len(possible_words) == 1:
+        timestamps = [start_time, time.perf_counter()]
+        if len(possible_words) == 1:
             (word,) = possible_words
-            return word
-        self.candidate_lister.reset_clues()
-        self.candidate_lister.add_clues(self._clues)
+            return self._finish(
+                SearchResult(word, True, 0, timestamps[-1] - start_time), SOURCE_SOLVED, possible_words, timestamps
+            )
+        word = self._lookup_next_word()
+        if word is not None:
+            timestamps.append(time.perf_counter())
+            return self._finish(
+                SearchResult(word, True, 0, timestamps[-1] - start_time), SOURCE_STRATEGY, possible_words, timestamps
+            )
+        position_key = None
+        if self.transposition_cache is not None:
+            position_key = self.get_position_key(possible_words)
+            word = self.transposition_cache.get(position_key)
+            if word is not None:
+                timestamps.append(time.perf_counter())
+                return self._finish(
+                    SearchResult(word, True, 0, timestamps[-1] - start_time),
+                    SOURCE_TRANSPOSITION_CACHE,
+                    possible_words,
+                    timestamps,
+                )
+        timestamps.append(time.perf_counter())
 
-        # Possible words are those that are valid given the current clues
-        possible_words = self.candidate_lister.get_possible_words()
         current_search_size = len(possible_words)
-        candidates = self.search_space.get_initial_candidates(current_search_size)
+        candidates = self.search_space.get_initial_candidates(current_search_size, possible_words)
 
         # Do two loops of evaluation to get the best candidate. The first loop uses a smaller search space to narrow
         # down the candidates.
-        best_candidate = self._get_best_candidate(candidates, possible_words)
-        follow_up_candidates = self.search_space.get_follow_up_candidates(best_candidate, current_search_size)
+        if time_budget is None:
+            self._number_of_scored_candidates = 0
+            best_candidate = self._get_best_candidate(candidates, possible_words)
+            timestamps.append(time.perf_counter())
+            follow_up_candidates = self.search_space.get_follow_up_candidates(best_candidate, current_search_size)
+            word = self._get_best_candidate(follow_up_candidates, possible_words)
+            completed = True
+            number_of_scored_candidates = self._number_of_scored_candidates
+        else:
+            deadline = start_time + time_budget
+            initial_deadline = deadline
+            if self.search_space.has_follow_up(current_search_size):
+                initial_deadline = start_time + time_budget / 2
+            best_candidate, initial_completed, number_of_initial_candidates = self._get_best_candidate_before(
+                candidates, possible_words, initial_deadline
+            )
+            timestamps.append(time.perf_counter())
+            follow_up_candidates = self.search_space.get_follow_up_candidates(best_candidate, current_search_size)
+            word, follow_up_completed, number_of_follow_up_candidates = self._get_best_candidate_before(
+                follow_up_candidates, possible_words, deadline
+            )
+            completed = initial_completed and follow_up_completed
+            number_of_scored_candidates = number_of_initial_candidates + number_of_follow_up_candidates
+
+        if position_key is not None and completed:
+            self.transposition_cache.set(position_key, word)
+        timestamps.append(time.perf_counter())
+        result = SearchResult(word, completed, number_of_scored_candidates, timestamps[-1] - start_time)
+        return self._finish(
+            result, SOURCE_SEARCH, possible_words, timestamps, len(candidates), len(follow_up_candidates)
+        )
+
+    def _finish(
+        self,
+        result: SearchResult,
+        source: str,
+        possible_words: set[str],
+        timestamps: list[float],
+        number_of_initial_candidates: int = 0,
+        number_of_follow_up_candidates: int = 0,
+        cache_statistics: Optional[CacheStatistics] = None,
+        batch_size: int = 1,
+    ) -> SearchResult:
+        """Returns the result of a search, after recording the report of the turn if there is a profiler.
+
+        Args:
+            source:
+                How the word was found (see `TurnReport`).
+            timestamps:
+                The times, as given by `time.perf_counter`, at which the search started and each of its phases ended,
+                in the order of `PHASES`.
+            number_of_initial_candidates:
+                The number of initial candidates given by the search space.
+            number_of_follow_up_candidates:
+                The number of follow-up candidates given by the search space.
+            cache_statistics:
+                The statistics of the cache at the end of the turn. Defaults to the current ones.
+            batch_size:
+                The number of positions that were searched together (see `TurnReport`).
+        """
+        if self.profiler is None:
+            return result
+        self._turn += 1
+        phase_seconds = {"filter": self._filter_seconds}
+        for phase, phase_start, phase_end in zip(PHASES, timestamps, timestamps[1:]):
+            phase_seconds[phase] = phase_end - phase_start
+        cache_statistics = cache_statistics or self._get_cache_statistics()
+        cache_hits, cache_misses = get_statistics_difference(self._cache_statistics, cache_statistics)
+        self._cache_statistics = cache_statistics
+        self._filter_seconds = 0.0
+        self.profiler.record(
+            TurnReport(
+                turn=self._turn,
+                word=result.word,
+                source=source,
+                number_of_possible_words=len(possible_words),
+                number_of_initial_candidates=number_of_initial_candidates,
+                number_of_follow_up_candidates=number_of_follow_up_candidates,
+                number_of_entropy_evaluations=result.number_of_scored_candidates,
+                cache_hits=cache_hits,
+                cache_misses=cache_misses,
+                completed=result.completed,
+                phase_seconds=phase_seconds,
+                seconds=result.seconds,
+                batch_size=batch_size,
+            )
+        )
+        return result
+
+    def get_next_word(self, time_budget: Optional[float] = None) -> str:
+        """Returns the next word that should be guessed. This is the word that minimizes the expected entropy of the
+        possible words, or the best word found within `time_budget` seconds if it is given (see `search`)."""
+        return self.search(time_budget).word
 
-        return self._get_best_candidate(follow_up_candidates, possible_words)
+    def get_next_words(self, histories: Iterable[Iterable[Clue]]) -> list[str]:
+        """Returns the next word that should be guessed in each of many games, given the clues of each game.
+
+        The result is the same as calling `get_next_word` on a `query` of the solver for each game, but the games that
+        have the same possible words are searched only once, and the searches of the remaining games are scored
+        together at each of the two stages (see `_get_best_candidates`). The clues of the solver itself are not used
+        nor changed.
+
+        Args:
+            histories:
+                The clues received so far in each game.
+
+        Returns:
+            The next word to guess in each game, in the same order as `histories`.
+        """
+        next_words = []
+        # The solver, the possible words, the source and the wall time of each phase of every game, and the statistics
+        # of the cache after its lookup, which are only kept for the reports of the profiler. The source of the games
+        # that are not solved nor looked up in the precomputed strategies is the one of their position.
+        games = []
+        games_by_position = defaultdict(list)
+        solvers = dict()
+        for game_index, clues in enumerate(histories):
+            solver = self.query(clues)
+            start_time = time.perf_counter()
+            possible_words = solver.get_possible_words()
+            if len(possible_words) == 0:
+                raise ValueError(f"No possible words given the clues of game {game_index}.")
+            phase_seconds = [time.perf_counter() - start_time]
+            if len(possible_words) == 1:
+                (word,) = possible_words
+                source = SOURCE_SOLVED
+            else:
+                word = solver._lookup_next_word()
+                source = SOURCE_STRATEGY if word is not None else None
+                phase_seconds.append(time.perf_counter() - start_time - phase_seconds[0])
+            next_words.append(word)
+            if word is None:
+                position = frozenset(possible_words)
+                games_by_position[position].append(game_index)
+                solvers.setdefault(position, solver)
+            if self.profiler is not None:
+                games.append((solver, possible_words, source, phase_seconds, solver._get_cache_statistics()))
+
+        # The source and the wall time of the lookup in the transposition cache of each position
+        position_lookups = dict()
+        positions = []
+        for possible_words, game_indices in games_by_position.items():
+            start_time = time.perf_counter()
+            position_key = None
+            if self.transposition_cache is not None:
+                position_key = self.get_position_key(possible_words)
+                word = self.transposition_cache.get(position_key)
+                if word is not None:
+                    for game_index in game_indices:
+                        next_words[game_index] = word
+                    position_lookups[possible_words] = (SOURCE_TRANSPOSITION_CACHE, time.perf_counter() - start_time)
+                    continue
+            position_lookups[possible_words] = (SOURCE_SEARCH, time.perf_counter() - start_time)
+            positions.append((solvers[possible_words], set(possible_words), game_indices, position_key))
+
+        start_time = time.perf_counter()
+        initial_searches = [
+            (solver, self.search_space.get_initial_candidates(len(possible_words), possible_words), possible_words)
+            for solver, possible_words, _, _ in positions
+        ]
+        best_candidates = self._get_best_candidates(initial_searches)
+        initial_search_time = time.perf_counter()
+        follow_up_searches = [
+            (solver, self.search_space.get_follow_up_candidates(best_candidate, len(possible_words)), possible_words)
+            for best_candidate, (solver, possible_words, _, _) in zip(best_candidates, positions)
+        ]
+        words = self._get_best_candidates(follow_up_searches)
+        search_seconds = [initial_search_time - start_time, time.perf_counter() - initial_search_time]
+        for word, (_, _, game_indices, position_key) in zip(words, positions):
+            if position_key is not None:
+                self.transposition_cache.set(position_key, word)
+            for game_index in game_indices:
+                next_words[game_index] = word
+
+        if self.profiler is not None:
+            self._record_batch(
+                next_words, games, position_lookups, initial_searches, follow_up_searches, search_seconds
+            )
+        return next_words
+
+    def _record_batch(
+        self,
+        next_words: list[str],
+        games: list[tuple["WordleSolver", set[str], Optional[str], list[float], Optional[CacheStatistics]]],
+        position_lookups: dict[frozenset[str], tuple[str, float]],
+        initial_searches: list[tuple["WordleSolver", set[str], set[str]]],
+        follow_up_searches: list[tuple["WordleSolver", set[str], set[str]]],
+        search_seconds: list[float],
+    ):
+        """Records the report of every game of a call to `get_next_words`, where the games with the same possible words
+        share the lookup in the transposition cache and the search of their position, and the searches of all of the
+        positions share the wall time of each stage."""
+        searches = {
+            frozenset(possible_words): (solver, len(initial_candidates), len(follow_up_candidates))
+            for (solver, initial_candidates, possible_words), (_, follow_up_candidates, _) in zip(
+                initial_searches, follow_up_searches
+            )
+        }
+        for word, (solver, possible_words, source, phase_seconds, cache_statistics) in zip(next_words, games):
+            number_of_candidates = (0, 0)
+            number_of_scored_candidates = 0
+            if source is None:
+                source, lookup_seconds = position_lookups[frozenset(possible_words)]
+                phase_seconds = [phase_seconds[0], phase_seconds[1] + lookup_seconds]
+                if source == SOURCE_SEARCH:
+                    position_solver, *number_of_candidates = searches[frozenset(possible_words)]
+                    number_of_scored_candidates = position_solver._number_of_scored_candidates
+                    phase_seconds += search_seconds
+            timestamps = list(itertools.accumulate(phase_seconds, initial=0.0))
+            solver._finish(
+                SearchResult(word, True, number_of_scored_candidates, timestamps[-1]),
+                source,
+                possible_words,
+                timestamps,
+                *number_of_candidates,
+                cache_statistics=cache_statistics,
+                batch_size=len(searches) if source == SOURCE_SEARCH else 1,
+            )
 
     def get_possible_words(self) -> set[str]:
         """Get the set of all possible words given the current set of clues."""
-        self.candidate_lister.reset_clues()
-        self.candidate_lister.add_clues(self._clues)
         return self.candidate_lister.get_possible_words()
@@ -0,0 +1,350 @@
+import gzip
+import json
+import os
+import warnings
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Optional
+
+from wordle_solver.cache import POSITION_KEY_VERSION, LayeredCache, SQLiteCache, TranspositionCache
+from wordle_solver.clue import Clue, encode_feedback, format_feedback, get_clues, get_feedback
+from wordle_solver.pattern_store import get_wordlist_key
+
+if TYPE_CHECKING:
+    from wordle_solver.search_space import SearchSpace
+    from wordle_solver.solver import WordleSolver
+
+# Version of the format of the tree files. The files also store the `POSITION_KEY_VERSION` they were built with, since
+# the decisions of the solver change with it.
+TREE_VERSION = 2
+# Maximum number of searched positions kept in memory in front of the persistent transposition cache
+MAX_CACHED_POSITIONS = 10_000
+
+# Solver of the current worker process, which is set by `_init_worker`
+_worker_solver: Optional["WordleSolver"] = None
+
+
+@dataclass
+class StrategyNode:
+    """A node of the strategy tree, containing the word to guess and the next node for each feedback to the guess."""
+
+    guess: str
+    children: dict[int, "StrategyNode"] = field(default_factory=dict)
+
+    def to_list(self) -> list:
+        """Converts the node to a compact list representation that can be serialized as JSON."""
+        return [self.guess, [[feedback, child.to_list()] for feedback, child in sorted(self.children.items())]]
+
+    @classmethod
+    def from_list(cls, node: list) -> "StrategyNode":
+        """Creates the node from the representation returned by `to_list`."""
+        guess, children = node
+        return cls(guess, {feedback: cls.from_list(child) for feedback, child in children})
+
+    def __len__(self) -> int:
+        return 1 + sum(len(child) for child in self.children.values())
+
+
+def split_guesses(clues: list[Clue], word_length: int) -> Optional[list[tuple[str, int]]]:
+    """Splits a clue history into the guessed words and their encoded feedback.
+
+    Returns:
+        A list with the guess and feedback of each turn, or `None` if the clues are not a sequence of complete guesses
+        (i.e. `word_length` clues per guess, sorted by position).
+    """
+    if len(clues) % word_length != 0:
+        return None
+    turns = []
+    for start in range(0, len(clues), word_length):
+        turn = clues[start : start + word_length]
+        if any(clue.position != position for position, clue in enumerate(turn)):
+            return None
+        turns.append(("".join(clue.character for clue in turn), encode_feedback(turn)))
+    return turns
+
+
+class StrategyTree:
+    """Precomputed decisions of the solver for every game that starts with the same guess.
+
+    Since the solver is deterministic, every game that starts with the same guess follows a finite tree, where each node
+    contains the guess, and each edge is a feedback to that guess. Looking up the next word for a clue history on the
+    tree only walks down one edge per turn.
+
+    Attributes:
+        root:
+            The root node of the tree, which contains the first guess.
+        word_length:
+            The length of the words.
+        wordlist_key:
+            The hash of the word list used to build the tree (see `get_wordlist_key`).
+        search_space_key:
+            The key of the search space of the solver that built the tree (see `SearchSpace.get_key`), since a solver
+            with a different search space makes different decisions.
+    """
+
+    def __init__(self, root: StrategyNode, word_length: int, wordlist_key: str, search_space_key: str):
+        self.root = root
+        self.word_length = word_length
+        self.wordlist_key = wordlist_key
+        self.search_space_key = search_space_key
+
+    def __len__(self) -> int:
+        return len(self.root)
+
+    def get_next_word(self, clues: list[Clue]) -> Optional[str]:
+        """Returns the next word to guess for the given clues, or `None` if the clues are not on the tree."""
+        turns = split_guesses(clues, self.word_length)
+        if turns is None:
+            return None
+        node = self.root
+        for guess, feedback in turns:
+            if guess != node.guess or feedback not in node.children:
+                return None
+            node = node.children[feedback]
+        return node.guess
+
+    def get_second_guesses(self) -> dict[str, str]:
+        """Returns the second guess for each feedback to the first guess, keyed by the formatted feedback."""
+        return {
+            format_feedback(feedback, self.word_length): child.guess for feedback, child in self.root.children.items()
+        }
+
+    def save(self, path: str):
+        """Saves the tree to a gzipped JSON file."""
+        data = {
+            "version": TREE_VERSION,
+            "position_key_version": POSITION_KEY_VERSION,
+            "word_length": self.word_length,
+            "wordlist_key": self.wordlist_key,
+            "search_space_key": self.search_space_key,
+            "root": self.root.to_list(),
+        }
+        with gzip.open(path, "wt") as file:
+            json.dump(data, file, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path: str, words: list[str], search_space_key: str) -> "StrategyTree":
+        """Loads the tree from a file, checking that it was built by the current version of the solver, for the given
+        words and the search space with the given key."""
+        with gzip.open(path, "rt") as file:
+            data = json.load(file)
+        if data["version"] != TREE_VERSION:
+            raise ValueError(f"The strategy tree has version {data['version']}, but {TREE_VERSION} is required.")
+        if data["position_key_version"] != POSITION_KEY_VERSION:
+            raise ValueError("The strategy tree was built by a previous version of the solver.")
+        if data["wordlist_key"] != get_wordlist_key(words, data["word_length"]):
+            raise ValueError("The strategy tree was built for a different word list.")
+        if data["search_space_key"] != search_space_key:
+            raise ValueError("The strategy tree was built for a different search space.")
+        return cls(
+            StrategyNode.from_list(data["root"]), data["word_length"], data["wordlist_key"], data["search_space_key"]
+        )
+
+
+def _get_feedback_buckets(guess: str, targets: set[str]) -> dict[int, list[str]]:
+    """Groups the targets (other than the guess itself) by the feedback they give to the guess."""
+    buckets = defaultdict(list)
+    for target in sorted(targets):
+        if target != guess:
+            buckets[get_feedback(guess, target)].append(target)
+    return buckets
+
+
+def _expand_child(
+    solver: "WordleSolver", history: list[list[Clue]], targets: list[str], max_depth: int
+) -> StrategyNode:
+    """Expands the node reached with the given history, whose last clues are the feedback of the given targets.
+
+    Raises:
+        ValueError: If the possible words given the history are not the targets, since the solver would then score
+            feedback buckets that its filter never produces, and could repeat its guesses forever.
+    """
+    solver.reset()
+    for clues in history:
+        solver.add_clues(clues)
+    possible_words = solver.get_possible_words()
+    if possible_words != set(targets):
+        guesses = ["".join(clue.character for clue in clues) for clues in history]
+        raise ValueError(
+            f"After {guesses}, the solver has {len(possible_words)} possible words instead of the {len(targets)} "
+            "targets with that feedback."
+        )
+    return expand_node(solver, history, solver.get_next_word(), max_depth)
+
+
+def expand_node(solver: "WordleSolver", history: list[list[Clue]], guess: str, max_depth: int) -> StrategyNode:
+    """Expands the subtree of the solver's decisions after the given history, where `guess` is the next guess.
+
+    Args:
+        solver:
+            The solver used to make the decisions. Its clues are replaced while the tree is expanded.
+        history:
+            The clues of each of the previous guesses.
+        guess:
+            The guess made after the history.
+        max_depth:
+            The maximum number of guesses in a game. The nodes at this depth are not expanded.
+
+    Returns:
+        The root of the expanded subtree.
+    """
+    node = StrategyNode(guess)
+    if len(history) + 1 >= max_depth:
+        return node
+    solver.reset()
+    for clues in history:
+        solver.add_clues(clues)
+    possible_words = solver.get_possible_words()
+    for feedback, targets in _get_feedback_buckets(guess, possible_words).items():
+        node.children[feedback] = _expand_child(solver, history + [get_clues(guess, targets[0])], targets, max_depth)
+    return node
+
+
+def _init_worker(solver_factory: Callable[[], "WordleSolver"]):
+    """Creates the solver of the worker process."""
+    global _worker_solver
+    _worker_solver = solver_factory()
+
+
+def _expand_in_worker(history: list[list[Clue]], targets: list[str], max_depth: int) -> StrategyNode:
+    return _expand_child(_worker_solver, history, targets, max_depth)
+
+
+def build_strategy_tree(
+    solver_factory: Callable[[], "WordleSolver"],
+    words: list[str],
+    word_length: int,
+    first_guess: str,
+    max_depth: int = 20,
+    n_workers: int = 1,
+) -> StrategyTree:
+    """Builds the strategy tree of the solver for every game that starts with `first_guess`.
+
+    The subtrees of each feedback to the first guess are expanded in parallel across `n_workers` processes.
+
+    Args:
+        solver_factory:
+            A picklable function that creates the solver, which is called once in each worker process.
+        words:
+            The word list of the solver, used to identify the tree.
+        word_length:
+            The length of the words.
+        first_guess:
+            The first guess of every game.
+        max_depth:
+            The maximum number of guesses in a game. Deeper clue histories are answered by the live search.
+        n_workers:
+            The number of worker processes.
+
+    Returns:
+        The strategy tree.
+    """
+    solver = solver_factory()
+    solver.reset()
+    possible_words = solver.get_possible_words()
+    root = StrategyNode(first_guess)
+    buckets = _get_feedback_buckets(first_guess, possible_words)
+    histories = [[get_clues(first_guess, targets[0])] for targets in buckets.values()]
+
+    if n_workers == 1:
+        children = [
+            _expand_child(solver, history, targets, max_depth) for history, targets in zip(histories, buckets.values())
+        ]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(
+            max_workers=n_workers, initializer=_init_worker, initargs=(solver_factory,)
+        ) as executor:
+            futures = [
+                executor.submit(_expand_in_worker, history, targets, max_depth)
+                for history, targets in zip(histories, buckets.values())
+            ]
+            children = [future.result() for future in futures]
+
+    for feedback, child in zip(buckets, children):
+        root.children[feedback] = child
+    return StrategyTree(root, word_length, get_wordlist_key(words, word_length), solver.search_space.get_key())
+
+
+def save_second_guesses(path: str, language: str, tree: StrategyTree):
+    """Saves the second guesses of a tree (see `StrategyTree.get_second_guesses`) for a language to a JSON file, keeping
+    the other languages.
+
+    The second guesses are stored with the same header as the tree, so that `load_second_guesses` only uses them for
+    the words, the search space and the version of the solver they were computed for.
+    """
+    all_second_guesses = dict()
+    if os.path.exists(path):
+        with open(path, "r") as file:
+            all_second_guesses = json.load(file)
+    all_second_guesses[language] = {
+        "position_key_version": POSITION_KEY_VERSION,
+        "word_length": tree.word_length,
+        "wordlist_key": tree.wordlist_key,
+        "search_space_key": tree.search_space_key,
+        "second_guesses": {tree.root.guess: dict(sorted(tree.get_second_guesses().items()))},
+    }
+    with open(path, "w") as file:
+        json.dump(all_second_guesses, file, indent="\t", sort_keys=True)
+        file.write("\n")
+
+
+def load_second_guesses(
+    path: str, language: str, words: list[str], search_space_key: str
+) -> Optional[dict[str, dict[str, str]]]:
+    """Loads the second guesses of a language saved with `save_second_guesses`.
+
+    Returns:
+        The second guess for each feedback to each first guess, or `None` if there are none for the language, or they
+        were computed by another version of the solver, or for other words or another search space. In the latter
+        case, a warning is shown, since the second guesses must be computed again.
+    """
+    with open(path, "r") as file:
+        data = json.load(file).get(language)
+    if data is None:
+        return None
+    if data.get("position_key_version") != POSITION_KEY_VERSION:
+        reason = "a previous version of the solver"
+    elif data["wordlist_key"] != get_wordlist_key(words, data["word_length"]):
+        reason = "a different word list"
+    elif data["search_space_key"] != search_space_key:
+        reason = "a different search space"
+    else:
+        return data["second_guesses"]
+    warnings.warn(f"The second guesses of {language!r} in {path} are skipped, since they were computed for {reason}.")
+    return None
+
+
+def load_precomputed_strategies(
+    language: str,
+    words: list[str],
+    search_space: "SearchSpace",
+    word_length: int = 5,
+    static_directory: str = "static",
+    max_cached_positions: int = MAX_CACHED_POSITIONS,
+) -> dict:
+    """Loads the precomputed strategies of a language from `static_directory`, as keyword arguments of `WordleSolver`.
+
+    - `strategy_tree` is loaded from `tree_{language}.json.gz`, if it was built with `build_tree.py`. It must have been
+      built for the same words and search space.
+    - `second_guesses` is loaded from `second_guesses.json`, if it has an entry for the language that matches the words
+      and the search space (see `load_second_guesses`).
+    - `transposition_cache` keeps up to `max_cached_positions` searched positions in memory, in front of
+      `positions_{language}_v{POSITION_KEY_VERSION}.sqlite`, which remembers them across sessions and processes. The
+      database of a previous version is left unused, since none of its positions can be reused.
+    """
+    strategies = dict()
+    tree_path = os.path.join(static_directory, f"tree_{language}.json.gz")
+    if os.path.exists(tree_path):
+        strategies["strategy_tree"] = StrategyTree.load(tree_path, words, search_space.get_key())
+    second_guesses_path = os.path.join(static_directory, "second_guesses.json")
+    if os.path.exists(second_guesses_path):
+        strategies["second_guesses"] = load_second_guesses(second_guesses_path, language, words, search_space.get_key())
+    strategies["transposition_cache"] = LayeredCache(
+        [
+            TranspositionCache(max_entries=max_cached_positions),
+            SQLiteCache(os.path.join(static_directory, f"positions_{language}_v{POSITION_KEY_VERSION}.sqlite")),
+        ]
+    )
+    return strategies
@@ -1,31 +1,55 @@
+from typing import Iterable, Mapping, Optional, Union
+
 from wordle_solver.clue import Clue
-from wordle_solver.inverted_index import InvertedIndex
-from wordle_solver.cache import Cache
+from wordle_solver.inverted_index import BitsetInvertedIndex, DocumentIds
+from wordle_solver.cache import Cache, ClueKey
 
 
 class WordleIndex:
     """A class for indexing the words in the Wordle word list and get the list of currently valid words.
 
+    The words are assigned dense integer IDs, and every set of words is stored as a bitset over these IDs (see
+    `BitsetInvertedIndex`), so that the clues are applied with word-parallel AND/OR operations.
+
+    The words and the postings are not changed after the index is created, and the clues are kept in `WordleQuery`
+    objects created with `query`, so a single index can be shared by any number of threads, each one filtering the
+    words with its own clues. The methods of the index that add clues apply them to a default query, for the code that
+    only plays one game at a time.
+
     Attributes:
         words:
             The list of valid words for the game.
         word_length:
             The length of the words in the list.
         cache:
-            The cache to store the results of the clues.
+            The cache to store the results of the clues, as bitsets of valid words. The clues are given to the cache
+            as `ClueKey` tuples. When the index is shared between threads, the cache must be thread-safe (as the
+            `InMemoryCache` subclasses are).
+        postings:
+            Optional precomputed bitsets of the words with each character at each position (e.g. from a
+            `WordlistBundle`), where the bit `i` represents `words[i]`. If given, the words are not indexed one by one,
+            and the postings are used as they are, so they must not be changed afterwards.
     """
 
-    def __init__(self, words: list[str], word_length: int, cache: Cache[Clue, set[str]]):
+    def __init__(
+        self,
+        words: list[str],
+        word_length: int,
+        cache: Cache[Union[Clue, ClueKey], int],
+        postings: Optional[list[Mapping[str, int]]] = None,
+    ):
         # We create an inverted index for each of the characters in the word
         self.words = set(words)
         self.word_length = word_length
         self.cache = cache
-        self._indices = [InvertedIndex[str, str]() for _ in range(word_length)]
-        self._init_indices(words)
-        self._clues = []
-        self._solved_characters = set()
-        self._candidate_characters = set()
-        self._currently_valid_words = self.words
+        self._document_ids = DocumentIds[str]()
+        self._indices = [BitsetInvertedIndex[str, str](self._document_ids) for _ in range(word_length)]
+        if postings is None:
+            self._init_indices(words)
+        else:
+            self._init_postings(words, postings)
+        self._all_words = self._document_ids.get_all()
+        self._query = WordleQuery(self)
 
     def _add_word(self, word: str):
         """Adds the given word to the Inverted Indices."""
@@ -37,66 +61,168 @@ class WordleIndex:
         for word in words:
             self._add_word(word)
 
+    def _init_postings(self, words: list[str], postings: list[Mapping[str, int]]):
+        """Initializes the indices from precomputed bitsets of the words with each character at each position."""
+        if len(postings) != self.word_length:
+            raise ValueError(f"There must be one posting for each of the {self.word_length} positions.")
+        # Repeated words only get a document ID the first time they are seen, as when they are indexed one by one
+        self._document_ids.add_documents(dict.fromkeys(words))
+        self._indices = [
+            BitsetInvertedIndex[str, str].from_postings(position_postings, self._document_ids)
+            for position_postings in postings
+        ]
+
+    def query(self, clues: Iterable[Clue] = ()) -> "WordleQuery":
+        """Returns a new query on the words of the index with the given clues, which does not change the index."""
+        query = WordleQuery(self)
+        query.add_clues(clues)
+        return query
+
+    def reset_clues(self):
+        """Resets the clues."""
+        self._query.reset_clues()
+
+    def push_state(self):
+        """Saves a snapshot of the current clues, so that they can be restored with `pop_state`."""
+        self._query.push_state()
+
+    def pop_state(self):
+        """Restores the clues to the last snapshot saved with `push_state`."""
+        self._query.pop_state()
+
+    def add_clue(self, clue: Clue):
+        """Adds a clue to the index and updates the set of currently valid words."""
+        self._query.add_clue(clue)
+
+    def add_feedback(self, guess: str, feedback: int):
+        """Adds the feedback of a guess, encoded as in `encode_feedback`, without building its `Clue` objects."""
+        self._query.add_feedback(guess, feedback)
+
+    def add_clues(self, clues: Iterable[Clue]):
+        """Adds a set of clues to the index."""
+        self._query.add_clues(clues)
+
+    def get_possible_words(self) -> set[str]:
+        """Returns the set of possible words given the current set of clues."""
+        return self._query.get_possible_words()
+
+    def get_all_words(self) -> set[str]:
+        """Returns the set of all possible words."""
+        return self.words
+
+
+class WordleQuery:
+    """The clues of a single game on a `WordleIndex`, and the words that are still valid given them.
+
+    A query only holds the bitset of the valid words and the (small) sets of observed characters, so it is cheap to
+    create one for each game or request. It implements the same `CandidateLister` interface as the index.
+
+    Attributes:
+        index:
+            The index with the words that are filtered, which is shared and never changed by the query.
+    """
+
+    def __init__(self, index: WordleIndex):
+        self.index = index
+        self.reset_clues()
+
+    def query(self, clues: Iterable[Clue] = ()) -> "WordleQuery":
+        """Returns a new query on the same index with the given clues."""
+        return self.index.query(clues)
+
+    @property
+    def cache(self) -> Cache[Union[Clue, ClueKey], int]:
+        """The cache of the index, which is shared by every query."""
+        return self.index.cache
+
     def reset_clues(self):
         """Resets the clues."""
-        self._clues = []
         self._solved_characters = set()
         self._candidate_characters = set()
-        self._currently_valid_words = self.words
+        self._currently_valid_words = self.index._all_words
+        self._states = []
+
+    def push_state(self):
+        """Saves a snapshot of the current clues, so that they can be restored with `pop_state`.
+
+        Since the valid words are stored as an immutable bitset, the snapshot only copies the (small) sets of observed
+        characters."""
+        self._states.append(
+            (set(self._solved_characters), set(self._candidate_characters), self._currently_valid_words)
+        )
+
+    def pop_state(self):
+        """Restores the clues to the last snapshot saved with `push_state`."""
+        if not self._states:
+            raise ValueError("There is no saved state to restore.")
+        self._solved_characters, self._candidate_characters, self._currently_valid_words = self._states.pop()
 
     def add_clue(self, clue: Clue):
-        """Adds a clue to the index and updates the set of currently valid words."""
+        """Adds a clue to the query and updates the set of currently valid words."""
+        digit = 2 if clue.correct_position else 1 if clue.in_word else 0
+        self._add_clue(clue.position, clue.character, digit)
+
+    def add_feedback(self, guess: str, feedback: int):
+        """Adds the feedback of a guess, encoded as in `encode_feedback`, without building its `Clue` objects."""
+        for position, character in enumerate(guess):
+            feedback, digit = divmod(feedback, 3)
+            self._add_clue(position, character, digit)
+
+    def _add_clue(self, position: int, character: str, digit: int):
+        """Adds a clue, given as its position, character and feedback digit, and updates the currently valid words."""
+        index = self.index
 
         # Check if the clue is unknown and the character is already solved or a candidate. If this is the case, custom
         # logic needs to be implemented to handle the case since the valid words are no longer the intersection of
         # the possible words for each character.
         unknown_clue_with_observed_character = (
-            clue.character in self._solved_characters or clue.character in self._candidate_characters
+            character in self._solved_characters or character in self._candidate_characters
         )
 
         # First check that the value is in the cache
-        cache_hit = self.cache.get(clue)
+        key = (position, character, digit)
+        cache_hit = index.cache.get(key)
         if cache_hit is not None and not unknown_clue_with_observed_character:
-            self._currently_valid_words = set.intersection(self._currently_valid_words, cache_hit)
-            if clue.correct_position:
-                self._solved_characters.add(clue.character)
-            elif clue.in_word:
-                self._candidate_characters.add(clue.character)
+            self._currently_valid_words &= cache_hit
+            if digit == 2:
+                self._solved_characters.add(character)
+            elif digit == 1:
+                self._candidate_characters.add(character)
             return
 
         # If the value is not in the cache, we need to calculate its possible words
-        if clue.correct_position:
-            valid_words = self._indices[clue.position].get(clue.character)
-            self._solved_characters.add(clue.character)
-        elif clue.in_word:
-            valid_words = set()
-            self._candidate_characters.add(clue.character)
-            possible_indices = [index for index in range(self.word_length) if index != clue.position]
-            for index in possible_indices:
-                valid_words.update(self._indices[index].get(clue.character))
+        if digit == 2:
+            valid_words = index._indices[position].get_bitset(character)
+            self._solved_characters.add(character)
+        elif digit == 1:
+            valid_words = 0
+            self._candidate_characters.add(character)
+            possible_indices = [other for other in range(index.word_length) if other != position]
+            for other in possible_indices:
+                valid_words |= index._indices[other].get_bitset(character)
+            # The character is not in the position of the clue, as in the feedback of `get_feedback`
+            valid_words &= index._indices[position].get_does_not_contain_bitset([character])
         else:
-            valid_words = self.words
+            valid_words = index._all_words
             if unknown_clue_with_observed_character:
-                valid_words = set.intersection(
-                    valid_words, self._indices[clue.position].get_does_not_contain([clue.character])
-                )
+                valid_words &= index._indices[position].get_does_not_contain_bitset([character])
             else:
-                for index in self._indices:
-                    valid_words = set.intersection(valid_words, index.get_does_not_contain([clue.character]))
+                for position_index in index._indices:
+                    valid_words &= position_index.get_does_not_contain_bitset([character])
 
         if not unknown_clue_with_observed_character:
-            self.cache.set(clue, valid_words)
-        self._currently_valid_words = set.intersection(self._currently_valid_words, valid_words)
+            index.cache.set(key, valid_words)
+        self._currently_valid_words &= valid_words
 
-    def add_clues(self, clues: list[Clue]):
-        """Adds a set of clues to the index."""
+    def add_clues(self, clues: Iterable[Clue]):
+        """Adds a set of clues to the query."""
         for clue in clues:
             self.add_clue(clue)
 
     def get_possible_words(self) -> set[str]:
         """Returns the set of possible words given the current set of clues."""
-        return self._currently_valid_words
+        return self.index._document_ids.decode(self._currently_valid_words)
 
     def get_all_words(self) -> set[str]:
         """Returns the set of all possible words."""
-        return self.words
+        return self.index.words